@@ -0,0 +1,47 @@
+"""Add lower() expression indexes on users email and username
+
+Revision ID: 75905e600e56
+Revises: 75042fb02c73
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '75905e600e56'
+down_revision: str | None = '75042fb02c73'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_email_lower',
+            'users',
+            [sa.text('lower(email)')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_users_username_lower',
+            'users',
+            [sa.text('lower(username)')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_username_lower', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_email_lower', table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,42 @@
+"""Add partial indexes on unused reset and verification tokens
+
+Revision ID: 6eb5473d50cc
+Revises: 75905e600e56
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '6eb5473d50cc'
+down_revision: str | None = '75905e600e56'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_password_reset_tokens_active_user',
+        'password_reset_tokens',
+        ['user_id'],
+        unique=False,
+        postgresql_where=sa.text('is_used = false')
+    )
+    op.create_index(
+        'ix_email_verification_tokens_active_user',
+        'email_verification_tokens',
+        ['user_id'],
+        unique=False,
+        postgresql_where=sa.text('is_used = false')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_email_verification_tokens_active_user', table_name='email_verification_tokens')
+    op.drop_index('ix_password_reset_tokens_active_user', table_name='password_reset_tokens')
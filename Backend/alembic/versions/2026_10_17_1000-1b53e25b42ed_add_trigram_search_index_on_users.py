@@ -0,0 +1,39 @@
+"""Add trigram GIN index for user search
+
+Revision ID: 1b53e25b42ed
+Revises: 6eb5473d50cc
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '1b53e25b42ed'
+down_revision: str | None = '6eb5473d50cc'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Must stay in sync with USER_SEARCH_DOCUMENT in the user service
+SEARCH_DOCUMENT = (
+    "lower(username) || ' ' || lower(email) || ' ' || "
+    "coalesce(lower(first_name), '') || ' ' || coalesce(lower(last_name), '')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_search_trgm "
+            f"ON users USING gin (({SEARCH_DOCUMENT}) gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_search_trgm")
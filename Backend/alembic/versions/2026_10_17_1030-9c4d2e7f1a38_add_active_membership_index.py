@@ -0,0 +1,44 @@
+"""Add partial index on active user household memberships
+
+Revision ID: 9c4d2e7f1a38
+Revises: 1b53e25b42ed
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4d2e7f1a38'
+down_revision: str | None = '1b53e25b42ed'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_households_active_user_household',
+            'user_households',
+            ['user_id', 'household_id'],
+            unique=False,
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_user_households_active_user_household',
+            table_name='user_households',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
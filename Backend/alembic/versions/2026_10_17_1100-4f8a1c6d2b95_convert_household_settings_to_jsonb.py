@@ -0,0 +1,43 @@
+"""Convert household settings to JSONB
+
+Revision ID: 4f8a1c6d2b95
+Revises: 9c4d2e7f1a38
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8a1c6d2b95'
+down_revision: str | None = '9c4d2e7f1a38'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        'households',
+        'settings',
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using='settings::jsonb'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'households',
+        'settings',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='settings::json'
+    )
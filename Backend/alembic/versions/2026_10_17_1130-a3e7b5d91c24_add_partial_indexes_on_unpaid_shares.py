@@ -0,0 +1,106 @@
+"""Add partial indexes on unpaid expense shares
+
+Revision ID: a3e7b5d91c24
+Revises: 4f8a1c6d2b95
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e7b5d91c24'
+down_revision: str | None = '4f8a1c6d2b95'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+UNPAID_ACTIVE = sa.text('NOT is_paid AND is_active')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_expense_shares_unpaid_user_household',
+            'expense_shares',
+            ['user_household_id'],
+            unique=False,
+            postgresql_where=UNPAID_ACTIVE,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_expense_shares_unpaid_expense',
+            'expense_shares',
+            ['expense_id'],
+            unique=False,
+            postgresql_where=UNPAID_ACTIVE,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        # Replace the full indexes: a boolean index is never selective, and
+        # paid_at is NULL for every unpaid share
+        op.drop_index(
+            'ix_expense_shares_is_paid',
+            table_name='expense_shares',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+        op.drop_index(
+            'ix_expense_shares_paid_at',
+            table_name='expense_shares',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+        op.create_index(
+            'ix_expense_shares_paid_at',
+            'expense_shares',
+            ['paid_at'],
+            unique=False,
+            postgresql_where=sa.text('paid_at IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_expense_shares_paid_at',
+            table_name='expense_shares',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+        op.create_index(
+            'ix_expense_shares_paid_at',
+            'expense_shares',
+            ['paid_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_expense_shares_is_paid',
+            'expense_shares',
+            ['is_paid'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_expense_shares_unpaid_expense',
+            table_name='expense_shares',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+        op.drop_index(
+            'ix_expense_shares_unpaid_user_household',
+            table_name='expense_shares',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,64 @@
+"""Store payment type and method as VARCHAR instead of native enums
+
+Revision ID: c81f4d2a7e63
+Revises: a3e7b5d91c24
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f4d2a7e63'
+down_revision: str | None = 'a3e7b5d91c24'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+PAYMENT_TYPES = ('REIMBURSEMENT', 'EXPENSE_PAYMENT', 'ADJUSTMENT')
+PAYMENT_METHODS = ('CASH', 'BANK_TRANSFER', 'CREDIT_CARD', 'DIGITAL_WALLET', 'CHECK', 'OTHER')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        'payments',
+        'payment_type',
+        type_=sa.String(length=20),
+        existing_nullable=False,
+        postgresql_using='payment_type::text'
+    )
+    op.alter_column(
+        'payments',
+        'payment_method',
+        type_=sa.String(length=20),
+        existing_nullable=True,
+        postgresql_using='payment_method::text'
+    )
+    op.execute('DROP TYPE IF EXISTS paymentmethod')
+    op.execute('DROP TYPE IF EXISTS paymenttype')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    payment_type = sa.Enum(*PAYMENT_TYPES, name='paymenttype')
+    payment_method = sa.Enum(*PAYMENT_METHODS, name='paymentmethod')
+    payment_type.create(op.get_bind(), checkfirst=True)
+    payment_method.create(op.get_bind(), checkfirst=True)
+
+    op.alter_column(
+        'payments',
+        'payment_method',
+        type_=payment_method,
+        existing_nullable=True,
+        postgresql_using='payment_method::paymentmethod'
+    )
+    op.alter_column(
+        'payments',
+        'payment_type',
+        type_=payment_type,
+        existing_nullable=False,
+        postgresql_using='payment_type::paymenttype'
+    )
@@ -0,0 +1,84 @@
+"""Add compound indexes on payments and payment allocations
+
+Revision ID: 5d2b9e6f4c17
+Revises: c81f4d2a7e63
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b9e6f4c17'
+down_revision: str | None = 'c81f4d2a7e63'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_payments_household_date',
+            'payments',
+            ['household_id', 'payment_date'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_expense_share_payments_payment_active',
+            'expense_share_payments',
+            ['payment_id', 'is_active'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        # The leading columns of the compound indexes serve the foreign key lookups
+        op.drop_index(
+            'ix_payments_household_id',
+            table_name='payments',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+        op.drop_index(
+            'ix_expense_share_payments_payment_id',
+            table_name='expense_share_payments',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_expense_share_payments_payment_id',
+            'expense_share_payments',
+            ['payment_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_payments_household_id',
+            'payments',
+            ['household_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_expense_share_payments_payment_active',
+            table_name='expense_share_payments',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+        op.drop_index(
+            'ix_payments_household_date',
+            table_name='payments',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
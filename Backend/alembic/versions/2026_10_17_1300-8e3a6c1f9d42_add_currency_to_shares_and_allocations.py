@@ -0,0 +1,42 @@
+"""Copy expense currency onto expense shares and payment allocations
+
+Revision ID: 8e3a6c1f9d42
+Revises: 5d2b9e6f4c17
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3a6c1f9d42'
+down_revision: str | None = '5d2b9e6f4c17'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('expense_shares', sa.Column('currency', sa.String(length=3), nullable=True))
+    op.add_column('expense_share_payments', sa.Column('currency', sa.String(length=3), nullable=True))
+
+    op.execute(
+        "UPDATE expense_shares SET currency = expenses.currency "
+        "FROM expenses WHERE expenses.id = expense_shares.expense_id"
+    )
+    op.execute(
+        "UPDATE expense_share_payments SET currency = expense_shares.currency "
+        "FROM expense_shares WHERE expense_shares.id = expense_share_payments.expense_share_id"
+    )
+
+    op.alter_column('expense_shares', 'currency', existing_type=sa.String(length=3), nullable=False)
+    op.alter_column('expense_share_payments', 'currency', existing_type=sa.String(length=3), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('expense_share_payments', 'currency')
+    op.drop_column('expense_shares', 'currency')
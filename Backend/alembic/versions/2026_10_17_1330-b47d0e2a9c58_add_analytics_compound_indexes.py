@@ -0,0 +1,84 @@
+"""Add compound indexes for analytics queries
+
+Revision ID: b47d0e2a9c58
+Revises: 8e3a6c1f9d42
+Create Date: 2026-10-17 13:30:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b47d0e2a9c58'
+down_revision: str | None = '8e3a6c1f9d42'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_expenses_household_active_date',
+            'expenses',
+            ['household_id', 'is_active', 'expense_date', 'category_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_expense_shares_user_household_expense',
+            'expense_shares',
+            ['user_household_id', 'expense_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        # The leading columns of the compound indexes serve the foreign key lookups
+        op.drop_index(
+            'ix_expenses_household_id',
+            table_name='expenses',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+        op.drop_index(
+            'ix_expense_shares_user_household_id',
+            table_name='expense_shares',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_expense_shares_user_household_id',
+            'expense_shares',
+            ['user_household_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_expenses_household_id',
+            'expenses',
+            ['household_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_expense_shares_user_household_expense',
+            table_name='expense_shares',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+        op.drop_index(
+            'ix_expenses_household_active_date',
+            table_name='expenses',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
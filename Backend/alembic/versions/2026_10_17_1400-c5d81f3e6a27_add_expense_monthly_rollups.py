@@ -0,0 +1,58 @@
+"""Add expense monthly rollups table
+
+Revision ID: c5d81f3e6a27
+Revises: b47d0e2a9c58
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d81f3e6a27'
+down_revision: str | None = 'b47d0e2a9c58'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'expense_monthly_rollups',
+        sa.Column('household_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('category_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('total_amount', sa.DECIMAL(precision=12, scale=2), nullable=False),
+        sa.Column('expense_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['household_id'], ['households.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('household_id', 'month', 'category_id', 'user_id')
+    )
+
+    # Backfill from existing active expenses; the nil UUID stands in for a
+    # missing category or creator
+    op.execute(
+        """
+        INSERT INTO expense_monthly_rollups
+            (household_id, month, category_id, user_id, total_amount, expense_count)
+        SELECT
+            household_id,
+            date_trunc('month', expense_date)::date,
+            coalesce(category_id, '00000000-0000-0000-0000-000000000000'::uuid),
+            coalesce(created_by, '00000000-0000-0000-0000-000000000000'::uuid),
+            sum(amount),
+            count(*)
+        FROM expenses
+        WHERE is_active AND household_id IS NOT NULL AND expense_date IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('expense_monthly_rollups')
@@ -0,0 +1,55 @@
+"""Add household updated_at indexes for analytics revalidation
+
+Revision ID: d2e94b7c1f08
+Revises: c5d81f3e6a27
+Create Date: 2026-10-17 14:30:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e94b7c1f08'
+down_revision: str | None = 'c5d81f3e6a27'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_expenses_household_updated',
+            'expenses',
+            ['household_id', 'updated_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_payments_household_updated',
+            'payments',
+            ['household_id', 'updated_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_payments_household_updated',
+            table_name='payments',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+        op.drop_index(
+            'ix_expenses_household_updated',
+            table_name='expenses',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -31,11 +31,18 @@ class Settings(BaseSettings):
     database_name: str = "couples_management"
     database_user: str = "couples_user"
     database_password: str
+    database_pool_size: int = 20
+    database_max_overflow: int = 40
+    database_pool_timeout: int = 5  # seconds to wait for a pooled connection
+    database_pool_recycle: int = 1800
+    database_statement_timeout_ms: int = 3000
+    database_query_cache_size: int = 1200  # compiled statements kept per engine
 
     # Security Configuration
     secret_key: str
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
+    jwt_public_key: str | None = None  # PEM public key for RS*/ES* algorithms
     jwt_access_token_expire_minutes: int = 30
     jwt_refresh_token_expire_days: int = 7
 
@@ -85,12 +92,17 @@ class Settings(BaseSettings):
     auth_password_require_special: bool = True
     auth_max_login_attempts: int = 5
     auth_lockout_duration_minutes: int = 15
+    auth_login_rate_limit_per_minute: int = 20  # per client IP
+    auth_unknown_login_cache_seconds: int = 30
+    auth_password_hash_target_ms: int = 300  # bcrypt cost is calibrated to this at startup
 
     # Expenses Module Configuration
     expenses_default_currency: str = "USD"
     expenses_max_amount: float = 999999.99
     expenses_categories_limit: int = 50
     expenses_receipt_max_size: int = 5242880  # 5MB
+    analytics_cache_ttl_seconds: int = 300  # cached analytics responses, Redis only
+    household_permission_cache_ttl_seconds: int = 60  # cached access checks, Redis only
 
     # Household Module Configuration
     household_max_members: int = 20
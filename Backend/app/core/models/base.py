@@ -2,7 +2,6 @@
 Base model classes and mixins for the application.
 """
 
-import uuid
 from datetime import datetime
 from typing import Any
 
@@ -11,18 +10,19 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import Session
 
+from app.core.utils.helpers import uuid7
 from app.database import Base
 
 
 class UUIDMixin:
-    """Mixin for UUID primary key."""
+    """Mixin for time-ordered UUID primary key."""
 
     @declared_attr
     def id(cls):
         return Column(
             UUID(as_uuid=True),
             primary_key=True,
-            default=uuid.uuid4,
+            default=uuid7,
             index=True
         )
 
@@ -76,6 +76,11 @@ class BaseModel(Base, UUIDMixin, TimestampMixin):
 
     __abstract__ = True
 
+    def __repr__(self) -> str:
+        # Read the id straight from the instance dict so logging an expired
+        # or detached row never triggers a refresh query
+        return f"<{type(self).__name__}(id={self.__dict__.get('id')})>"
+
     def to_dict(self) -> dict[str, Any]:
         """Convert model instance to dictionary."""
         return {
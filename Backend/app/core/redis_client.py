@@ -0,0 +1,41 @@
+"""
+Redis client management.
+
+Redis is optional: when ``REDIS_URL`` is not configured, ``get_redis`` returns
+None and callers fall back to their database-backed behaviour.
+"""
+
+import logging
+
+from redis.asyncio import Redis
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis: Redis | None = None
+
+
+def get_redis() -> Redis | None:
+    """
+    Get the shared Redis client.
+
+    Returns:
+        Redis client or None if Redis is not configured
+    """
+    global _redis
+
+    if _redis is None and settings.redis_url:
+        _redis = Redis.from_url(settings.redis_url, decode_responses=True)
+        logger.info("Redis client initialized")
+
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client if it was created."""
+    global _redis
+
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
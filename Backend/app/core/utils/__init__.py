@@ -5,17 +5,30 @@ Core utilities module.
 from .helpers import (
     calculate_percentage,
     clean_dict,
+    decode_cursor,
+    divide_amount,
+    encode_cursor,
+    format_amount,
     format_currency,
     generate_uuid,
     get_initials,
     mask_email,
     parse_name,
+    percentage_of,
+    request_now,
+    reset_request_now,
+    set_request_now,
     slugify,
     split_amount_equally,
+    to_cents,
+    to_decimal,
+    to_uuid,
     truncate_text,
     utc_now,
+    uuid7,
 )
 from .security import (
+    calibrate_bcrypt_rounds,
     create_access_token,
     create_refresh_token,
     generate_invite_code,
@@ -42,6 +55,7 @@ __all__ = [
     "create_refresh_token",
     "verify_token",
     "get_password_hash",
+    "calibrate_bcrypt_rounds",
     "verify_password",
     "generate_password_reset_token",
     "verify_password_reset_token",
@@ -57,13 +71,25 @@ __all__ = [
     "sanitize_filename",
     # Helper utilities
     "generate_uuid",
+    "uuid7",
     "utc_now",
+    "request_now",
+    "set_request_now",
+    "reset_request_now",
+    "encode_cursor",
+    "decode_cursor",
     "format_currency",
+    "format_amount",
     "slugify",
     "truncate_text",
     "parse_name",
     "calculate_percentage",
     "split_amount_equally",
+    "divide_amount",
+    "percentage_of",
+    "to_decimal",
+    "to_cents",
+    "to_uuid",
     "mask_email",
     "clean_dict",
     "get_initials",
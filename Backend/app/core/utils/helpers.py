@@ -2,12 +2,29 @@
 Helper utilities for date/time, string manipulation, and other common tasks.
 """
 
+import base64
+import binascii
+import os
 import re
+import time
 import uuid
+from contextvars import ContextVar, Token
 from datetime import UTC, datetime
 from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 
+# Read-only so the shared table cannot be altered by callers
+CURRENCY_SYMBOLS = MappingProxyType({
+    "USD": "$",
+    "EUR": "€",
+    "GBP": "£",
+    "JPY": "¥",
+    "CAD": "C$",
+    "AUD": "A$",
+})
+
 
 def generate_uuid() -> str:
     """
@@ -19,6 +36,23 @@ def generate_uuid() -> str:
     return str(uuid.uuid4())
 
 
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID (RFC 9562 version 7).
+
+    The leading 48 bits are the Unix timestamp in milliseconds, so new keys
+    land at the right edge of B-tree indexes instead of at random pages.
+
+    Returns:
+        UUID with version 7
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10))
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
+
 def utc_now() -> datetime:
     """
     Get current UTC datetime.
@@ -29,6 +63,71 @@ def utc_now() -> datetime:
     return datetime.now(UTC)
 
 
+# Naive UTC timestamp shared by everything that runs within one request
+_request_now: ContextVar[datetime | None] = ContextVar("request_now", default=None)
+
+
+def set_request_now(now: datetime | None = None) -> Token:
+    """
+    Pin the current time for the rest of the request.
+
+    Args:
+        now: Naive UTC datetime to pin, defaults to the current time
+
+    Returns:
+        Token to pass to ``reset_request_now`` when the request ends
+    """
+    return _request_now.set(now or datetime.utcnow())
+
+
+def reset_request_now(token: Token) -> None:
+    """Drop the time pinned by ``set_request_now``."""
+    _request_now.reset(token)
+
+
+def request_now() -> datetime:
+    """
+    Get the naive UTC time pinned for the current request.
+
+    Returns:
+        Pinned request time, or the current time outside a request
+    """
+    return _request_now.get() or datetime.utcnow()
+
+
+def encode_cursor(created_at: datetime, record_id: uuid.UUID) -> str:
+    """
+    Encode a keyset pagination cursor.
+
+    Args:
+        created_at: Creation timestamp of the last row on the page
+        record_id: ID of the last row on the page
+
+    Returns:
+        Opaque URL-safe cursor string
+    """
+    raw = f"{created_at.isoformat()}|{record_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID] | None:
+    """
+    Decode a keyset pagination cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string
+
+    Returns:
+        Tuple of (created_at, record_id) or None if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, record_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(record_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
 def format_currency(amount: float | Decimal, currency: str = "USD") -> str:
     """
     Format amount as currency string.
@@ -46,15 +145,25 @@ def format_currency(amount: float | Decimal, currency: str = "USD") -> str:
     # Round to 2 decimal places
     amount = amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
 
-    currency_symbols = {
-        "USD": "$",
-        "EUR": "€",
-        "GBP": "£",
-        "JPY": "¥",
-    }
+    return f"{CURRENCY_SYMBOLS.get(currency, currency)}{amount:,.2f}"
+
+
+@lru_cache(maxsize=4096)
+def format_amount(amount: float | Decimal, currency: str = "USD") -> str:
+    """
+    Format amount with its currency symbol and no thousands separators.
+
+    Results are cached: list views render the same amounts repeatedly, and
+    equal amounts format identically whatever their numeric type.
+
+    Args:
+        amount: Amount to format
+        currency: Currency code
 
-    symbol = currency_symbols.get(currency, currency)
-    return f"{symbol}{amount:,.2f}"
+    Returns:
+        Formatted amount string
+    """
+    return f"{CURRENCY_SYMBOLS.get(currency, currency)}{amount:.2f}"
 
 
 def slugify(text: str) -> str:
@@ -112,6 +221,58 @@ def parse_name(full_name: str) -> dict[str, str]:
         return {"first_name": parts[0], "last_name": " ".join(parts[1:])}
 
 
+def to_decimal(value: int | float | str | Decimal) -> Decimal:
+    """
+    Convert a value to Decimal, passing Decimals through unchanged.
+
+    Numeric columns already load as Decimal, so only values assigned in
+    Python (floats, ints, strings) pay for the string round-trip.
+
+    Args:
+        value: Value to convert
+
+    Returns:
+        Decimal value
+    """
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def to_cents(value: int | float | str | Decimal) -> int:
+    """
+    Convert a monetary amount to whole cents.
+
+    Comparing cents as ints avoids Decimal arithmetic when checking
+    whether two amounts match to the cent.
+
+    Args:
+        value: Amount to convert
+
+    Returns:
+        Amount in cents, rounded half up
+    """
+    return int(to_decimal(value).scaleb(2).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def to_uuid(value: uuid.UUID | str) -> uuid.UUID:
+    """
+    Convert a value to UUID, passing UUIDs through unchanged.
+
+    Args:
+        value: UUID or its string form
+
+    Returns:
+        UUID value
+
+    Raises:
+        ValueError: If the value is not a valid UUID
+    """
+    if isinstance(value, uuid.UUID):
+        return value
+    return uuid.UUID(str(value))
+
+
 def calculate_percentage(part: float | Decimal, total: float | Decimal) -> float:
     """
     Calculate percentage of part from total.
@@ -129,10 +290,24 @@ def calculate_percentage(part: float | Decimal, total: float | Decimal) -> float
     return float((part / total) * 100)
 
 
+def _from_cents(cents: int) -> Decimal:
+    """Convert whole cents back to a two-place Decimal."""
+    return Decimal(cents).scaleb(-2)
+
+
+def _divide_half_up(numerator: int, denominator: int) -> int:
+    """Divide integers, rounding halves away from zero."""
+    quotient = (2 * abs(numerator) + denominator) // (2 * denominator)
+    return quotient if numerator >= 0 else -quotient
+
+
 def split_amount_equally(total_amount: float | Decimal, num_people: int) -> list[Decimal]:
     """
     Split amount equally among people, handling rounding.
 
+    The split is done in whole cents: the first ``remainder`` people get
+    one extra cent, so the amounts always add up to the total.
+
     Args:
         total_amount: Total amount to split
         num_people: Number of people to split among
@@ -143,29 +318,43 @@ def split_amount_equally(total_amount: float | Decimal, num_people: int) -> list
     if num_people <= 0:
         return []
 
-    if isinstance(total_amount, float):
-        total_amount = Decimal(str(total_amount))
+    base_cents, remainder = divmod(to_cents(total_amount), num_people)
+    return [_from_cents(base_cents + (i < remainder)) for i in range(num_people)]
+
+
+def divide_amount(amount: float | Decimal, parts: int) -> Decimal:
+    """
+    Divide an amount into equal parts, rounded half up to the cent.
+
+    Args:
+        amount: Amount to divide
+        parts: Number of parts
+
+    Returns:
+        Amount of a single part
+    """
+    return _from_cents(_divide_half_up(to_cents(amount), parts))
 
-    # Calculate base amount per person
-    base_amount = total_amount / num_people
-    base_amount = base_amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
 
-    # Create list with base amounts
-    amounts = [base_amount] * num_people
+def percentage_of(amount: float | Decimal, percentage: float | Decimal) -> Decimal:
+    """
+    Get a percentage of an amount, rounded half up to the cent.
+
+    Args:
+        amount: Amount
+        percentage: Percentage (0-100)
 
-    # Calculate remainder and distribute
-    total_distributed = base_amount * num_people
-    remainder = total_amount - total_distributed
+    Returns:
+        Part of the amount
+    """
+    # Percentages may carry more than two places, so only the result is rounded
+    part = to_decimal(amount) * to_decimal(percentage) / 100
+    return part.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
 
-    # Distribute remainder cents
-    remainder_cents = int(remainder * 100)
-    for i in range(abs(remainder_cents)):
-        if remainder_cents > 0:
-            amounts[i % num_people] += Decimal('0.01')
-        else:
-            amounts[i % num_people] -= Decimal('0.01')
 
-    return amounts
+# Local parts are at most 64 characters (RFC 5321), so every valid address
+# reuses one of these masks instead of allocating a new one
+_EMAIL_MASKS = tuple('*' * n for n in range(63))
 
 
 def mask_email(email: str) -> str:
@@ -184,11 +373,11 @@ def mask_email(email: str) -> str:
     local, domain = email.split('@', 1)
 
     if len(local) <= 2:
-        masked_local = local[0] + '*'
-    else:
-        masked_local = local[0] + '*' * (len(local) - 2) + local[-1]
+        return f"{local[0]}*@{domain}"
 
-    return f"{masked_local}@{domain}"
+    stars = len(local) - 2
+    mask = _EMAIL_MASKS[stars] if stars < len(_EMAIL_MASKS) else '*' * stars
+    return f"{local[0]}{mask}{local[-1]}@{domain}"
 
 
 def clean_dict(data: dict[str, Any], remove_none: bool = True, remove_empty: bool = False) -> dict[str, Any]:
@@ -2,8 +2,11 @@
 Security utilities for password hashing, JWT tokens, and other security functions.
 """
 
+import logging
+import math
 import secrets
 import string
+import time
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -12,6 +15,15 @@ import bcrypt
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+# bcrypt cost factor used for new hashes; tuned by calibrate_bcrypt_rounds(),
+# which may raise it above the gensalt() default but never lower it
+DEFAULT_BCRYPT_ROUNDS = 12
+BCRYPT_MIN_ROUNDS = DEFAULT_BCRYPT_ROUNDS
+BCRYPT_MAX_ROUNDS = 16
+_bcrypt_rounds = DEFAULT_BCRYPT_ROUNDS
+
 
 def create_access_token(
     subject: str | Any, expires_delta: timedelta | None = None
@@ -90,14 +102,61 @@ def get_password_hash(password: str) -> str:
     # Convert password to bytes
     password_bytes = password.encode('utf-8')
     
-    # Generate salt and hash the password
-    salt = bcrypt.gensalt()
+    # Generate salt with the calibrated cost and hash the password
+    salt = bcrypt.gensalt(rounds=_bcrypt_rounds)
     hashed = bcrypt.hashpw(password_bytes, salt)
     
     # Return as string
     return hashed.decode('utf-8')
 
 
+def calibrate_bcrypt_rounds(
+    target_ms: float,
+    min_rounds: int = BCRYPT_MIN_ROUNDS,
+    max_rounds: int = BCRYPT_MAX_ROUNDS
+) -> int:
+    """
+    Pick the bcrypt cost factor that hashes closest to a target time.
+
+    Each extra round doubles the work, so one timed hash at ``min_rounds``
+    is enough to estimate every other cost on this host. The chosen cost is
+    used for all subsequent hashes; existing hashes keep verifying since
+    their cost is stored in the hash itself.
+
+    Args:
+        target_ms: Target hashing time in milliseconds
+        min_rounds: Lowest acceptable cost factor
+        max_rounds: Highest acceptable cost factor
+
+    Returns:
+        Selected cost factor
+    """
+    global _bcrypt_rounds
+
+    start = time.perf_counter()
+    bcrypt.hashpw(b"calibration-password", bcrypt.gensalt(rounds=min_rounds))
+    elapsed_ms = max((time.perf_counter() - start) * 1000, 0.001)
+
+    extra_rounds = math.floor(math.log2(target_ms / elapsed_ms)) if target_ms > elapsed_ms else 0
+    _bcrypt_rounds = max(min_rounds, min(max_rounds, min_rounds + extra_rounds))
+
+    logger.info(
+        f"bcrypt calibrated: rounds={_bcrypt_rounds} "
+        f"(~{elapsed_ms * 2 ** (_bcrypt_rounds - min_rounds):.0f} ms, target {target_ms:.0f} ms)"
+    )
+    return _bcrypt_rounds
+
+
+def get_bcrypt_rounds() -> int:
+    """
+    Get the bcrypt cost factor used for new hashes.
+
+    Returns:
+        Current cost factor
+    """
+    return _bcrypt_rounds
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash using bcrypt from the cryptography library.
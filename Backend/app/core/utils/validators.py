@@ -3,17 +3,32 @@ Validation utilities for common validation tasks.
 """
 
 import re
+from functools import lru_cache
 from typing import Any
 
 from email_validator import EmailNotValidError, validate_email
 
 from app.config import settings
 
+# Compiled once at import instead of looked up in re's cache on every call
+_UPPERCASE_RE = re.compile(r'[A-Z]')
+_LOWERCASE_RE = re.compile(r'[a-z]')
+_DIGIT_RE = re.compile(r'\d')
+_SPECIAL_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>\-_=\[\]\\\/~`+]')
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+_NON_DIGIT_RE = re.compile(r'\D')
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w\-_\.]')
+_UNDERSCORE_RUN_RE = re.compile(r'_+')
 
+
+@lru_cache(maxsize=1024)
 def validate_email_address(email: str) -> bool:
     """
     Validate an email address.
 
+    Only the syntax is checked (no DNS deliverability lookup), which keeps
+    the check pure and cacheable.
+
     Args:
         email: Email address to validate
 
@@ -21,7 +36,7 @@ def validate_email_address(email: str) -> bool:
         True if valid, False otherwise
     """
     try:
-        validate_email(email)
+        validate_email(email, check_deliverability=False)
         return True
     except EmailNotValidError:
         return False
@@ -44,19 +59,19 @@ def validate_password_strength(password: str) -> tuple[bool, list[str]]:
         errors.append(f"Password must be at least {settings.auth_password_min_length} characters long")
 
     # Check for uppercase letter
-    if settings.auth_password_require_uppercase and not re.search(r'[A-Z]', password):
+    if settings.auth_password_require_uppercase and not _UPPERCASE_RE.search(password):
         errors.append("Password must contain at least one uppercase letter")
 
     # Check for lowercase letter
-    if settings.auth_password_require_lowercase and not re.search(r'[a-z]', password):
+    if settings.auth_password_require_lowercase and not _LOWERCASE_RE.search(password):
         errors.append("Password must contain at least one lowercase letter")
 
     # Check for numbers
-    if settings.auth_password_require_numbers and not re.search(r'\d', password):
+    if settings.auth_password_require_numbers and not _DIGIT_RE.search(password):
         errors.append("Password must contain at least one number")
 
     # Check for special characters
-    if settings.auth_password_require_special and not re.search(r'[!@#$%^&*(),.?":{}|<>\-_=\[\]\\\/~`+]', password):
+    if settings.auth_password_require_special and not _SPECIAL_RE.search(password):
         errors.append("Password must contain at least one special character")
 
     return len(errors) == 0, errors
@@ -82,7 +97,7 @@ def validate_username(username: str) -> tuple[bool, str | None]:
         return False, "Username must be less than 50 characters long"
 
     # Allow letters, numbers, underscores, and hyphens
-    if not re.match(r'^[a-zA-Z0-9_-]+$', username):
+    if not _USERNAME_RE.match(username):
         return False, "Username can only contain letters, numbers, underscores, and hyphens"
 
     return True, None
@@ -99,7 +114,7 @@ def validate_phone_number(phone: str) -> bool:
         True if valid, False otherwise
     """
     # Remove all non-digit characters
-    digits_only = re.sub(r'\D', '', phone)
+    digits_only = _NON_DIGIT_RE.sub('', phone)
 
     # Check if it's a valid length (10-15 digits)
     return 10 <= len(digits_only) <= 15
@@ -165,10 +180,10 @@ def sanitize_filename(filename: str) -> str:
         Sanitized filename
     """
     # Remove or replace dangerous characters
-    sanitized = re.sub(r'[^\w\-_\.]', '_', filename)
+    sanitized = _UNSAFE_FILENAME_CHARS_RE.sub('_', filename)
 
     # Remove multiple consecutive underscores
-    sanitized = re.sub(r'_+', '_', sanitized)
+    sanitized = _UNDERSCORE_RUN_RE.sub('_', sanitized)
 
     # Remove leading/trailing underscores and dots
     sanitized = sanitized.strip('_.')
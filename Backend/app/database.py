@@ -2,23 +2,100 @@
 Database configuration and session management.
 """
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.config import settings
 
+
+def get_engine_options(database_url: str, async_driver: bool = False) -> dict:
+    """
+    Get connection pool and session options for a database URL.
+
+    Args:
+        database_url: Database URL
+        async_driver: Whether the options are for the asyncpg engine
+
+    Returns:
+        Keyword arguments for create_engine/create_async_engine
+    """
+    options = {
+        "pool_pre_ping": True,
+        "pool_recycle": settings.database_pool_recycle,
+        "echo": settings.debug,
+        # The default of 500 compiled statements is too small for the number
+        # of distinct filter/loader combinations the services issue
+        "query_cache_size": settings.database_query_cache_size,
+    }
+
+    if make_url(database_url).get_backend_name() != "postgresql":
+        return options
+
+    options.update(
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        isolation_level="READ COMMITTED",
+    )
+
+    # Cap how long a single statement can hold a connection
+    statement_timeout = str(settings.database_statement_timeout_ms)
+    if async_driver:
+        options["connect_args"] = {"server_settings": {"statement_timeout": statement_timeout}}
+    else:
+        options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+
+    return options
+
+
 # Create database engine
 engine = create_engine(
     settings.database_url,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.debug,
+    **get_engine_options(settings.database_url),
+)
+
+# Create session factory. Sessions live for a single request, so objects
+# are kept loaded after commit instead of being re-selected on next access
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine,
+)
+
+
+def get_async_database_url(database_url: str) -> URL:
+    """
+    Get the async driver URL for a database URL.
+
+    Args:
+        database_url: Synchronous database URL
+
+    Returns:
+        URL using the asyncpg driver for PostgreSQL databases
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "postgresql":
+        return url.set(drivername="postgresql+asyncpg")
+    return url
+
+
+# Create async database engine
+async_engine = create_async_engine(
+    get_async_database_url(settings.database_url),
+    **get_engine_options(settings.database_url, async_driver=True),
 )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create async session factory; objects stay usable after commit
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 # Create declarative base for models
 Base = declarative_base()
@@ -38,6 +115,30 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get async database session.
+
+    Yields:
+        AsyncSession: Async database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    Dependency to get the async session factory.
+
+    For work that outlives the request, such as a streamed response body,
+    which must open its own session after dependency sessions are closed.
+
+    Returns:
+        async_sessionmaker: Async session factory
+    """
+    return AsyncSessionLocal
+
+
 def create_tables():
     """Create all database tables."""
     Base.metadata.create_all(bind=engine)
@@ -2,6 +2,7 @@
 Main FastAPI application entry point.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from uuid import UUID
@@ -13,6 +14,9 @@ from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse, JSON
 from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.core.redis_client import close_redis, get_redis
+from app.core.utils.helpers import reset_request_now, set_request_now
+from app.core.utils.security import calibrate_bcrypt_rounds
 from app.database import get_db
 from app.core.logging import setup_logging
 from app.core.routers import health
@@ -20,7 +24,10 @@ from app.modules.auth.routers import auth_router, users_router, auth_frontend_ro
 from app.modules.auth.routers.admin import router as admin_router
 from app.modules.admin.routers import admin_ui_router
 from app.modules.auth.dependencies import require_authentication, get_current_user_optional, get_current_user_from_cookie_or_header, get_current_user
+from app.modules.auth.utils.profile_cache import profile_cache
+from app.modules.auth.utils.security import shutdown_hash_pool
 from app.modules.auth.utils.startup import initialize_auth_system
+from app.modules.auth.utils.token_denylist import token_denylist
 from app.modules.expenses.routers import (
     households_router,
     expenses_router,
@@ -39,6 +46,7 @@ from app.modules.frontend import (
 )
 from app.modules.expenses.services import HouseholdService
 from app.modules.expenses.models.user_household import UserHousehold
+from app.modules.expenses.utils.permission_cache import permission_cache
 from app.modules.auth.models.user import User
 
 # Setup logging first
@@ -68,6 +76,16 @@ async def lifespan(app: FastAPI):
         print(f"❌ Auth system initialization failed: {e}")
     finally:
         db.close()
+
+    # Tune the bcrypt cost factor to this host
+    await asyncio.to_thread(calibrate_bcrypt_rounds, settings.auth_password_hash_target_ms)
+
+    # Keep the revoked token filter in sync with Redis
+    # and drop cached profiles invalidated by other workers
+    background_tasks = []
+    if get_redis() is not None:
+        background_tasks.append(asyncio.create_task(token_denylist.run_refresher()))
+        background_tasks.append(asyncio.create_task(profile_cache.run_listener()))
     
     logger.info("Application startup complete")
     yield
@@ -75,6 +93,10 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Shutting down Household Management App...")
     print("🛑 Shutting down Household Management App...")
+    for task in background_tasks:
+        task.cancel()
+    await close_redis()
+    shutdown_hash_pool()
 
 
 # Create FastAPI application
@@ -94,6 +116,17 @@ app.add_middleware(
     allow_headers=settings.cors_allow_headers,
 )
 
+
+@app.middleware("http")
+async def pin_request_time(request: Request, call_next):
+    """Share a single timestamp across everything computed for a request."""
+    token = set_request_now()
+    try:
+        return await call_next(request)
+    finally:
+        reset_request_now(token)
+
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -286,6 +319,7 @@ async def join_household_api(
         )
         db.add(new_membership)
         db.commit()
+        await permission_cache.invalidate(current_user.id, household.id)
         db.refresh(new_membership)
         
         return {
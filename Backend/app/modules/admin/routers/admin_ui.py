@@ -545,7 +545,7 @@ async def admin_households(
                 "id": str(household.id),
                 "name": household.name,
                 "description": household.description or "",
-                "member_count": len([m for m in household.members if m.is_active]),
+                "member_count": household.member_count,
                 "total_expenses": float(household_expenses),
                 "created_at": household.created_at.strftime('%Y-%m-%d') if household.created_at else "",
                 "created_at_display": household.created_at.strftime('%b %d, %Y') if household.created_at else "",
@@ -560,7 +560,7 @@ async def admin_households(
                         "nickname": member.nickname,
                         "joined_at": member.joined_at.strftime('%Y-%m-%d') if member.joined_at else ""
                     }
-                    for member in household.members if member.is_active and member.user
+                    for member in household.iter_active_members() if member.user
                 ]
             }
             formatted_households.append(formatted_household)
@@ -640,7 +640,7 @@ async def admin_expenses(
     from app.modules.expenses.models.category import Category
     from app.modules.expenses.models.expense_share import ExpenseShare
     from app.modules.expenses.models.user_household import UserHousehold
-    from sqlalchemy.orm import joinedload
+    from sqlalchemy.orm import joinedload, selectinload
     from sqlalchemy import desc, or_, and_, func
     from datetime import datetime, date
     from decimal import Decimal
@@ -656,7 +656,7 @@ async def admin_expenses(
                 joinedload(Expense.category),
                 joinedload(Expense.creator),
                 joinedload(Expense.household),
-                joinedload(Expense.shares).joinedload(ExpenseShare.user_household).joinedload(UserHousehold.user)
+                selectinload(Expense.shares).joinedload(ExpenseShare.user_household).joinedload(UserHousehold.user)
             )
             .filter(Expense.is_active == True)
         )
@@ -736,8 +736,9 @@ async def admin_expenses(
         for expense in expenses:
             # Calculate payment status
             if expense.shares:
-                paid_shares = sum(1 for share in expense.shares if share.is_paid and share.is_active)
-                total_shares = sum(1 for share in expense.shares if share.is_active)
+                share_stats = expense.share_stats()
+                paid_shares = share_stats.paid
+                total_shares = share_stats.paid + share_stats.unpaid
                 if paid_shares == total_shares and total_shares > 0:
                     payment_status = "paid"
                 elif paid_shares > 0:
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import desc, asc, func, and_, or_
 
 from app.modules.auth.models.user import User
+from app.modules.auth.utils.profile_cache import profile_cache
 from app.modules.admin.schemas.admin_ui import AdminUserResponse, AdminUserListResponse
 
 logger = logging.getLogger(__name__)
@@ -158,6 +159,7 @@ class AdminUsersService:
             # Toggle status
             user.is_active = not user.is_active
             self.db.commit()
+            await profile_cache.invalidate(user.id)
             
             action = "activated" if user.is_active else "deactivated"
             logger.info(f"User {user.email} has been {action} by admin {admin_user_id}")
@@ -251,6 +253,7 @@ class AdminUsersService:
             user.updated_at = datetime.utcnow()
             
             self.db.commit()
+            await profile_cache.invalidate(user.id)
             
             # Log the changes
             changed_fields = []
@@ -284,14 +287,14 @@ class AdminUsersService:
         Change a user's password. Admin can set any password.
         """
         try:
-            from app.modules.auth.utils.security import hash_password
+            from app.modules.auth.utils.security import hash_password, run_in_hash_pool
             
             user = self.db.query(User).filter(User.id == user_id).first()
             if not user:
                 return {"success": False, "message": "User not found"}
             
-            # Hash the new password
-            hashed_password = hash_password(new_password)
+            # Hash the new password in the bounded hashing pool
+            hashed_password = await run_in_hash_pool(hash_password, new_password)
             
             # Update user password
             user.hashed_password = hashed_password
@@ -299,6 +302,7 @@ class AdminUsersService:
             user.updated_at = datetime.utcnow()
             
             self.db.commit()
+            await profile_cache.invalidate(user.id)
             
             logger.info(f"Password changed for user {user.email} by admin {admin_user_id}")
             
@@ -318,9 +322,13 @@ class AdminUsersService:
         admin_user_id: str
     ) -> Dict[str, Any]:
         """
-        Generate and send a password reset link to the user.
+        Issue a password reset token for the user.
+
+        The token is never returned or logged, so an admin cannot use it to
+        take over the account; it is only for delivery to the user.
         """
         try:
+            from app.database import AsyncSessionLocal
             from app.modules.auth.services.auth_service import AuthService
             
             user = self.db.query(User).filter(User.id == user_id).first()
@@ -328,22 +336,18 @@ class AdminUsersService:
                 return {"success": False, "message": "User not found"}
             
             # Generate reset token using the correct method
-            auth_service = AuthService(self.db)
-            success, message, masked_email = await auth_service.request_password_reset(user.email)
+            async with AsyncSessionLocal() as async_db:
+                auth_service = AuthService(async_db)
+                success, message, masked_email, _ = await auth_service.request_password_reset(user.email)
             
             if success:
-                # In a real application, you would send an email here
-                # For now, we'll just log it and return a temporary link
-                # Since we don't have access to the actual token, we'll generate a placeholder
-                reset_link = f"http://localhost:8000/auth/reset-password?email={user.email}"
-                
-                logger.info(f"Password reset link generated for user {user.email} by admin {admin_user_id}")
-                logger.info(f"Reset link placeholder: {reset_link}")
+                # The token is left for the mail sender to deliver once one
+                # exists; it is deliberately kept out of the response and logs
+                logger.info(f"Password reset token issued for user {user.email} by admin {admin_user_id}")
                 
                 return {
                     "success": True,
-                    "message": "Password reset link has been sent to the user's email",
-                    "reset_link": reset_link  # In production, remove this and send via email
+                    "message": f"A password reset has been requested for {masked_email}"
                 }
             else:
                 return {"success": False, "message": f"Failed to generate reset token: {message}"}
@@ -50,7 +50,7 @@ async def get_current_user_from_cookie_or_header(
     if not token:
         return None
 
-    payload = verify_access_token(token, db)
+    payload = await verify_access_token(token, db)
     if not payload:
         return None
 
@@ -81,7 +81,7 @@ async def get_current_user_optional(
         return None
 
     token = credentials.credentials
-    payload = verify_access_token(token, db)
+    payload = await verify_access_token(token, db)
 
     if not payload:
         return None
@@ -120,7 +120,7 @@ async def get_current_user(
         )
 
     token = credentials.credentials
-    payload = verify_access_token(token, db)
+    payload = await verify_access_token(token, db)
 
     if not payload:
         raise HTTPException(
@@ -330,7 +330,7 @@ async def get_current_user_or_default(
     # Try normal authentication first
     if credentials:
         token = credentials.credentials
-        payload = verify_access_token(token, db)
+        payload = await verify_access_token(token, db)
         
         if payload:
             try:
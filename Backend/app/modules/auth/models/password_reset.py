@@ -4,7 +4,7 @@ Password reset token model for authentication module.
 
 from datetime import datetime, timedelta
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -45,6 +45,11 @@ class PasswordResetToken(BaseModel):
     # Relationship to user
     user = relationship("User", back_populates="password_reset_tokens")
 
+    # Partial index covering only unused tokens
+    __table_args__ = (
+        Index('ix_password_reset_tokens_active_user', 'user_id', postgresql_where=is_used.is_(False)),
+    )
+
     def __repr__(self) -> str:
         return f"<PasswordResetToken(id={self.id}, user_id={self.user_id}, is_used={self.is_used})>"
 
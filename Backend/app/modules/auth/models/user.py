@@ -6,7 +6,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import Boolean, Column, DateTime, String, Enum as SQLEnum
+from sqlalchemy import Boolean, Column, DateTime, Index, String, Enum as SQLEnum, func
 from sqlalchemy.orm import relationship
 
 from app.core.models.base import BaseModel
@@ -95,6 +95,12 @@ class User(BaseModel, ActiveMixin):
         cascade="all, delete-orphan",
         order_by="PasswordHistory.changed_at.desc()"
     )
+
+    # Case-insensitive lookup indexes
+    __table_args__ = (
+        Index('ix_users_email_lower', func.lower(email)),
+        Index('ix_users_username_lower', func.lower(username)),
+    )
     
     def __repr__(self) -> str:
         return f"<User(id={self.id}, username='{self.username}', email='{self.email}')>"
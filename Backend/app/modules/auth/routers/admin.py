@@ -6,9 +6,12 @@ from uuid import UUID
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.core.utils.helpers import decode_cursor, encode_cursor
+from app.database import get_async_db, get_db
 from app.modules.auth.dependencies import get_current_admin_user
 from app.modules.auth.models.user import User, UserRole
 from app.modules.auth.schemas.user import UserResponse, UserCreate, UserUpdate
@@ -25,23 +28,44 @@ from app.modules.auth.schemas.admin import (
 from app.modules.auth.services.user_service import UserService
 from app.modules.auth.services.auth_service import AuthService
 
-router = APIRouter(prefix="/admin", tags=["Admin User Management"])
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin User Management"],
+    default_response_class=ORJSONResponse
+)
+
+# Columns exposed in user payloads; orjson encodes UUID/datetime natively
+USER_RESPONSE_FIELDS = tuple(UserResponse.model_fields)
+
+
+def _serialize_user(user: User) -> dict:
+    """Build a UserResponse-shaped dict from a trusted ORM user without validation."""
+    return {field: getattr(user, field) for field in USER_RESPONSE_FIELDS}
+
+
+def get_user_service(db: AsyncSession = Depends(get_async_db)) -> UserService:
+    """Get user service instance."""
+    return UserService(db)
+
+
+def get_auth_service(db: AsyncSession = Depends(get_async_db)) -> AuthService:
+    """Get auth service instance."""
+    return AuthService(db)
 
 
 @router.post("/users", response_model=AdminUserCreateResponse, status_code=status.HTTP_201_CREATED)
 async def create_user_by_admin(
     user_data: AdminUserCreateRequest,
     current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    auth_service: AuthService = Depends(get_auth_service),
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Create a new user account (admin only).
     
     Only admin users can create new user accounts.
     """
-    user_service = UserService(db)
-    auth_service = AuthService(db)
-    
     # Check if email or username already exists
     existing_user = await user_service.get_by_email(user_data.email)
     if existing_user:
@@ -87,7 +111,7 @@ async def create_user_by_admin(
     user.verify_email()
     user.activate()
     
-    db.commit()
+    await db.commit()
     
     return AdminUserCreateResponse(
         message="User created successfully",
@@ -97,21 +121,36 @@ async def create_user_by_admin(
     )
 
 
-@router.get("/users", response_model=AdminUserListResponse)
+@router.get(
+    "/users",
+    response_model=None,
+    responses={200: {"model": AdminUserListResponse}}
+)
 async def list_users(
     current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db),
+    user_service: UserService = Depends(get_user_service),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page (preferred over skip)"),
     search: Optional[str] = Query(None),
     role: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None)
 ):
     """
     List all users with filtering and pagination (admin only).
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next page;
+    ``skip`` is still accepted for backwards compatibility.
     """
-    user_service = UserService(db)
-    
+    decoded_cursor = None
+    if cursor:
+        decoded_cursor = decode_cursor(cursor)
+        if decoded_cursor is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+
     # Build filters
     filters = {}
     if role:
@@ -123,27 +162,38 @@ async def list_users(
         skip=skip,
         limit=limit,
         search=search,
+        cursor=decoded_cursor,
         **filters
     )
-    
-    return AdminUserListResponse(
-        users=[UserResponse.model_validate(user) for user in users],
-        total=total,
-        skip=skip,
-        limit=limit
-    )
 
+    next_cursor = None
+    if len(users) == limit:
+        next_cursor = encode_cursor(users[-1].created_at, users[-1].id)
+
+    # Rows come straight from the ORM, so skip pydantic validation and let
+    # orjson encode the plain dicts.
+    return ORJSONResponse({
+        "users": [_serialize_user(user) for user in users],
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor
+    })
 
-@router.get("/users/{user_id}", response_model=UserResponse)
+
+@router.get(
+    "/users/{user_id}",
+    response_model=None,
+    responses={200: {"model": UserResponse}}
+)
 async def get_user_by_admin(
     user_id: UUID,
     current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Get user details by ID (admin only).
     """
-    user_service = UserService(db)
     user = await user_service.get_by_id(user_id)
     
     if not user:
@@ -152,41 +202,49 @@ async def get_user_by_admin(
             detail="User not found"
         )
     
-    return UserResponse.model_validate(user)
+    return ORJSONResponse(_serialize_user(user))
 
 
-@router.put("/users/{user_id}", response_model=UserResponse)
+@router.put(
+    "/users/{user_id}",
+    response_model=None,
+    responses={200: {"model": UserResponse}}
+)
 async def update_user_by_admin(
     user_id: UUID,
     user_data: UserUpdate,
     current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Update user by ID (admin only).
     """
-    user_service = UserService(db)
-    user = await user_service.update(user_id, user_data)
+    success, message, user = await user_service.update_user_profile(
+        user_id=user_id,
+        first_name=user_data.first_name,
+        last_name=user_data.last_name,
+        email=user_data.email,
+        username=user_data.username
+    )
     
-    if not user:
+    if not success:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
+            status_code=status.HTTP_404_NOT_FOUND if message == "User not found" else status.HTTP_400_BAD_REQUEST,
+            detail=message
         )
     
-    return UserResponse.model_validate(user)
+    return ORJSONResponse(_serialize_user(user))
 
 
 @router.put("/users/{user_id}/activate")
 async def activate_user(
     user_id: UUID,
     current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Activate user account (admin only).
     """
-    user_service = UserService(db)
     success = await user_service.activate_user(user_id)
     
     if not success:
@@ -202,12 +260,11 @@ async def activate_user(
 async def deactivate_user(
     user_id: UUID,
     current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Deactivate user account (admin only).
     """
-    user_service = UserService(db)
     success = await user_service.deactivate_user(user_id)
     
     if not success:
@@ -223,7 +280,7 @@ async def deactivate_user(
 async def delete_user(
     user_id: UUID,
     current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Delete user account (admin only).
@@ -235,8 +292,7 @@ async def delete_user(
             detail="Cannot delete your own account"
         )
     
-    user_service = UserService(db)
-    success = await user_service.delete(user_id)
+    success, message = await user_service.delete_user(user_id)
     
     if not success:
         raise HTTPException(
@@ -289,12 +345,11 @@ async def bulk_import_users(
 @router.get("/stats", response_model=AdminUserStatsResponse)
 async def get_user_stats(
     current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Get user statistics (admin only).
     """
-    user_service = UserService(db)
     stats = await user_service.get_user_statistics()
     
     return AdminUserStatsResponse(**stats) 
\ No newline at end of file
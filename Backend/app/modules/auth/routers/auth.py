@@ -3,9 +3,10 @@ Authentication API endpoints.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status, Response, Form
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.modules.auth.dependencies import get_current_user
 from app.modules.auth.models.user import User
 from app.modules.auth.schemas.auth import (
@@ -27,16 +28,27 @@ from app.modules.auth.schemas.auth import (
 )
 from app.modules.auth.schemas.user import UserResponse, EmailAvailability, UsernameAvailability, AvailabilityResponse
 from app.modules.auth.services.auth_service import AuthService
+from app.modules.auth.utils.login_guard import LOGIN_RATE_LIMITED_MESSAGE
 from app.modules.auth.utils.password import validate_password_strength_detailed
 from app.modules.auth.services.user_service import UserService
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def get_auth_service(db: AsyncSession = Depends(get_async_db)) -> AuthService:
+    """Get auth service instance."""
+    return AuthService(db)
+
+
+def get_user_service(db: AsyncSession = Depends(get_async_db)) -> UserService:
+    """Get user service instance."""
+    return UserService(db)
+
+
 @router.post("/register", response_model=RegisterResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     register_data: RegisterRequest,
-    db: Session = Depends(get_db)
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """
     Register a new user account.
@@ -53,8 +65,6 @@ async def register(
     - first_name: User's first name (max 100 characters)
     - last_name: User's last name (max 100 characters)
     """
-    auth_service = AuthService(db)
-
     success, message, user_data = await auth_service.register_user(
         email=register_data.email,
         username=register_data.username,
@@ -81,7 +91,7 @@ async def login(
     login_data: LoginRequest,
     request: Request,
     response: Response,
-    db: Session = Depends(get_db)
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """
     Authenticate user and return access tokens.
@@ -89,8 +99,6 @@ async def login(
     Validates credentials and returns JWT tokens for API access.
     Also sets secure cookies for browser-based navigation.
     """
-    auth_service = AuthService(db)
-
     # Get client info for session tracking
     user_agent = request.headers.get("user-agent")
     ip_address = request.client.host if request.client else None
@@ -103,6 +111,11 @@ async def login(
     )
 
     if not success:
+        if message == LOGIN_RATE_LIMITED_MESSAGE:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=message
+            )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=message,
@@ -143,7 +156,7 @@ async def logout(
     current_user: User = Depends(get_current_user),
     request: Request = None,
     response: Response = None,
-    db: Session = Depends(get_db)
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """
     Logout user and invalidate tokens.
@@ -151,8 +164,6 @@ async def logout(
     Blacklists the current access token and optionally deactivates session.
     Also clears authentication cookies.
     """
-    auth_service = AuthService(db)
-
     # Extract access token from Authorization header
     auth_header = request.headers.get("authorization", "")
     if not auth_header.startswith("Bearer "):
@@ -198,7 +209,7 @@ async def refresh_token(
     """
     from app.modules.auth.utils.jwt import refresh_access_token
 
-    token_data = refresh_access_token(
+    token_data = await refresh_access_token(
         refresh_token=refresh_data.refresh_token,
         db=db
     )
@@ -221,16 +232,14 @@ async def refresh_token(
 @router.post("/forgot-password", response_model=PasswordResetResponse)
 async def forgot_password(
     reset_data: PasswordResetRequest,
-    db: Session = Depends(get_db)
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """
     Request password reset token.
 
     Sends a password reset link to the user's email address.
     """
-    auth_service = AuthService(db)
-
-    success, message, masked_email = await auth_service.request_password_reset(
+    success, message, masked_email, _ = await auth_service.request_password_reset(
         email=reset_data.email
     )
 
@@ -249,15 +258,13 @@ async def forgot_password(
 @router.post("/reset-password", response_model=AuthResponse)
 async def reset_password(
     reset_data: PasswordResetConfirm,
-    db: Session = Depends(get_db)
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """
     Reset password using reset token.
 
     Changes the user's password using a valid reset token.
     """
-    auth_service = AuthService(db)
-
     success, message = await auth_service.reset_password(
         token=reset_data.token,
         new_password=reset_data.new_password
@@ -278,15 +285,13 @@ async def reset_password(
 @router.post("/verify-email", response_model=AuthResponse)
 async def verify_email(
     verification_data: EmailVerificationRequest,
-    db: Session = Depends(get_db)
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """
     Verify user email address.
 
     Confirms email verification using a verification token.
     """
-    auth_service = AuthService(db)
-
     success, message = await auth_service.verify_email(
         token=verification_data.token
     )
@@ -306,15 +311,13 @@ async def verify_email(
 @router.post("/resend-verification", response_model=AuthResponse)
 async def resend_verification(
     resend_data: EmailVerificationResend,
-    db: Session = Depends(get_db)
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """
     Resend email verification token.
 
     Sends a new verification email to the user.
     """
-    auth_service = AuthService(db)
-
     success, message = await auth_service.resend_verification_email(
         email=resend_data.email
     )
@@ -367,7 +370,7 @@ async def get_current_user_info(
 @router.post("/check-email", response_model=AvailabilityResponse)
 async def check_email_availability(
     email: str = Form(...),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Check if email address is available.
@@ -375,8 +378,6 @@ async def check_email_availability(
     Public endpoint for registration to validate email availability.
     Accepts form data from HTMX requests.
     """
-    user_service = UserService(db)
-
     is_available = await user_service.check_email_availability(
         email=email,
         exclude_user_id=None
@@ -391,7 +392,7 @@ async def check_email_availability(
 @router.post("/check-username", response_model=AvailabilityResponse)
 async def check_username_availability(
     username: str = Form(...),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Check if username is available.
@@ -399,8 +400,6 @@ async def check_username_availability(
     Public endpoint for registration to validate username availability.
     Accepts form data from HTMX requests.
     """
-    user_service = UserService(db)
-
     is_available = await user_service.check_username_availability(
         username=username,
         exclude_user_id=None
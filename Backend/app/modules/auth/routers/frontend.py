@@ -14,6 +14,7 @@ from app.database import get_db
 from app.modules.auth.dependencies import get_current_user_optional, get_current_user_from_cookie_or_header
 from app.modules.expenses.models.user_household import UserHousehold
 from app.modules.expenses.models.household import Household, UserHouseholdRole
+from app.modules.expenses.utils.permission_cache import permission_cache
 
 router = APIRouter()
 
@@ -178,6 +179,7 @@ async def join_household_action(
         )
         db.add(new_membership)
         db.commit()
+        await permission_cache.invalidate(current_user.id, household.id)
         
         return HTMLResponse(
             f"""
@@ -7,9 +7,10 @@ from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.core.utils.helpers import decode_cursor, encode_cursor
+from app.database import get_async_db
 from app.modules.auth.dependencies import (
     get_current_active_user,
     get_current_admin_user,
@@ -27,6 +28,7 @@ from app.modules.auth.schemas.user import (
     UsernameAvailability,
     UserProfile,
     UserResponse,
+    UserSearchResponse,
     UserStats,
     UserUpdate,
     UserListResponse,
@@ -39,7 +41,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/users", tags=["User Management"])
 
 
-def get_user_service(db: Session = Depends(get_db)) -> UserService:
+def get_user_service(db: AsyncSession = Depends(get_async_db)) -> UserService:
     """Get user service instance."""
     return UserService(db)
 
@@ -60,15 +62,13 @@ async def get_my_profile(
 async def update_my_profile(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Update current user's profile information.
 
     Allows users to update their profile details like name, email, and username.
     """
-    user_service = UserService(db)
-
     success, message, updated_user = await user_service.update_user_profile(
         user_id=current_user.id,
         first_name=user_update.first_name,
@@ -90,15 +90,13 @@ async def update_my_profile(
 async def change_my_password(
     password_change: PasswordChange,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Change current user's password.
 
     Validates current password and updates to new password with security checks.
     """
-    user_service = UserService(db)
-
     success, message = await user_service.change_password(
         user_id=current_user.id,
         current_password=password_change.current_password,
@@ -121,15 +119,13 @@ async def change_my_password(
 async def update_my_avatar(
     avatar_update: AvatarUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Update current user's avatar.
 
     Updates the user's avatar URL.
     """
-    user_service = UserService(db)
-
     success, message = await user_service.update_avatar(
         user_id=current_user.id,
         avatar_url=avatar_update.avatar_url
@@ -147,61 +143,70 @@ async def update_my_avatar(
     )
 
 
-@router.get("/search", response_model=list[UserResponse])
+@router.get("/search", response_model=UserSearchResponse)
 async def search_users(
-    query: str = Query(None, description="Search query"),
+    query: str = Query(None, min_length=3, description="Search query"),
     email_verified: bool = Query(None, description="Filter by email verification"),
     is_active: bool = Query(None, description="Filter by active status"),
     limit: int = Query(20, ge=1, le=100, description="Maximum results"),
-    offset: int = Query(0, ge=0, description="Results offset"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page"),
     current_user: User = Depends(get_current_verified_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Search and filter users.
 
     Allows verified users to search for other users with various filters.
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next page.
     """
-    user_service = UserService(db)
+    decoded_cursor = None
+    if cursor:
+        decoded_cursor = decode_cursor(cursor)
+        if decoded_cursor is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
 
-    users = await user_service.search_users(
+    users, next_cursor = await user_service.search_users(
         query=query,
         email_verified=email_verified,
         is_active=is_active,
         limit=limit,
-        offset=offset
+        cursor=decoded_cursor
     )
 
-    return [UserResponse.model_validate(user) for user in users]
+    return UserSearchResponse(
+        users=[UserResponse.model_validate(user) for user in users],
+        next_cursor=encode_cursor(*next_cursor) if next_cursor else None
+    )
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user_by_id(
     user_id: UUID,
     current_user: User = Depends(get_current_verified_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Get user by ID.
 
     Returns public profile information for a specific user.
     """
-    user_service = UserService(db)
-
-    user = await user_service.get_user_profile(user_id)
-    if not user:
+    profile = await user_service.get_user_profile(user_id)
+    if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    return UserResponse.model_validate(user)
+    return profile
 
 
 @router.post("/check-email", response_model=AvailabilityResponse)
 async def check_email_availability(
     email_check: EmailAvailability,
-    db: Session = Depends(get_db),
+    user_service: UserService = Depends(get_user_service),
     current_user: User = Depends(get_current_user_optional)
 ):
     """
@@ -210,8 +215,6 @@ async def check_email_availability(
     Validates if an email address is available for use.
     Public endpoint for registration, but can exclude current user if authenticated.
     """
-    user_service = UserService(db)
-
     is_available = await user_service.check_email_availability(
         email=email_check.email,
         exclude_user_id=current_user.id if current_user else None
@@ -226,7 +229,7 @@ async def check_email_availability(
 @router.post("/check-username", response_model=AvailabilityResponse)
 async def check_username_availability(
     username_check: UsernameAvailability,
-    db: Session = Depends(get_db),
+    user_service: UserService = Depends(get_user_service),
     current_user: User = Depends(get_current_user_optional)
 ):
     """
@@ -235,8 +238,6 @@ async def check_username_availability(
     Validates if a username is available for use.
     Public endpoint for registration, but can exclude current user if authenticated.
     """
-    user_service = UserService(db)
-
     is_available = await user_service.check_username_availability(
         username=username_check.username,
         exclude_user_id=current_user.id if current_user else None
@@ -252,15 +253,13 @@ async def check_username_availability(
 @router.get("/admin/stats", response_model=UserStats)
 async def get_user_stats(
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Get user statistics (Admin only).
 
     Returns comprehensive user statistics for administrators.
     """
-    user_service = UserService(db)
-
     stats = await user_service.get_user_stats()
     return UserStats(**stats)
 
@@ -269,15 +268,13 @@ async def get_user_stats(
 async def get_recent_users(
     limit: int = Query(10, ge=1, le=50, description="Number of recent users"),
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Get recently registered users (Admin only).
 
     Returns a list of recently registered users for administrators.
     """
-    user_service = UserService(db)
-
     users = await user_service.get_recent_users(limit=limit)
     return [UserResponse.model_validate(user) for user in users]
 
@@ -286,15 +283,13 @@ async def get_recent_users(
 async def activate_user(
     user_id: UUID,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Activate a user account (Admin only).
 
     Activates a deactivated user account.
     """
-    user_service = UserService(db)
-
     success, message = await user_service.activate_user(user_id)
 
     if not success:
@@ -313,15 +308,13 @@ async def activate_user(
 async def deactivate_user(
     user_id: UUID,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Deactivate a user account (Admin only).
 
     Deactivates a user account, preventing login.
     """
-    user_service = UserService(db)
-
     success, message = await user_service.deactivate_user(user_id)
 
     if not success:
@@ -340,15 +333,13 @@ async def deactivate_user(
 async def delete_user(
     user_id: UUID,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Delete a user account (Admin only).
 
     Soft deletes a user account and all associated data.
     """
-    user_service = UserService(db)
-
     # Prevent admin from deleting themselves
     if user_id == current_user.id:
         raise HTTPException(
@@ -41,6 +41,7 @@ class AdminUserListResponse(BaseModel):
     total: int = Field(..., description="Total number of users")
     skip: int = Field(..., description="Number of users skipped")
     limit: int = Field(..., description="Maximum number of users returned")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
 
 
 class AdminUserStatsResponse(BaseModel):
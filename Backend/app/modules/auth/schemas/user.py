@@ -80,6 +80,13 @@ class UserListResponse(BaseModel):
     has_prev: bool = Field(..., description="Whether there are previous pages")
 
 
+class UserSearchResponse(BaseModel):
+    """Schema for keyset-paginated user search results."""
+
+    users: list[UserResponse] = Field(..., description="Matching users")
+    next_cursor: str | None = Field(None, description="Cursor for the next page, if any")
+
+
 class PasswordChange(BaseModel):
     """Schema for password change requests."""
 
@@ -2,39 +2,55 @@
 Authentication service for user registration, login, and token management.
 """
 
+import asyncio
 from datetime import datetime, timedelta
 from uuid import UUID
 
+from sqlalchemy import bindparam, insert, lambda_stmt, or_, select, true, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.services.base_service import BaseService
-from app.core.utils.validators import validate_email
+from app.core.utils.helpers import mask_email, uuid7
+from app.core.utils.validators import validate_email_address
 from app.modules.auth.models.email_verification import EmailVerificationToken
 from app.modules.auth.models.password_history import PasswordHistory
 from app.modules.auth.models.password_reset import PasswordResetToken
 from app.modules.auth.models.user import User
 from app.modules.auth.models.user_session import UserSession
 from app.modules.auth.schemas.user import UserCreate, UserUpdate, UserResponse
-from app.modules.auth.utils.jwt import blacklist_token, create_user_tokens
+from app.modules.auth.services.user_service import USER_BY_EMAIL_STMT
+from app.modules.auth.utils.jwt import (
+    blacklist_token,
+    create_user_tokens,
+    register_refresh_token,
+)
+from app.modules.auth.utils.login_guard import LOGIN_RATE_LIMITED_MESSAGE, login_guard
 from app.modules.auth.utils.password import (
     check_password_history,
     validate_password_strength_detailed,
 )
+from app.modules.auth.utils.profile_cache import profile_cache
 from app.modules.auth.utils.security import (
     generate_password_reset_token_secure,
     generate_session_token,
     generate_verification_token,
     hash_password,
-    mask_email,
+    run_in_hash_pool,
     verify_password_secure,
 )
 
+USER_BY_LOGIN_STMT = lambda_stmt(
+    lambda: select(User).where(
+        (User.email == bindparam("login")) | (User.username == bindparam("login"))
+    )
+)
+
 
 class AuthService(BaseService[User, UserCreate, UserUpdate]):
     """Service for authentication operations."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(User)
         self.db = db
 
@@ -65,32 +81,43 @@ class AuthService(BaseService[User, UserCreate, UserUpdate]):
         """
         try:
             # Validate email format
-            if not validate_email(email):
+            if not validate_email_address(email):
                 return False, "Invalid email format", None
 
-            # Validate password strength
-            password_validation = validate_password_strength_detailed(password)
+            # Token generation never needs to hold a pooled connection
+            verification_token_value = generate_verification_token()
+
+            # Validate password strength while the availability query
+            # (email and username in one round-trip) is in flight
+            email = email.lower()
+            username = username.lower()
+            password_validation, conflict_result = await asyncio.gather(
+                asyncio.to_thread(validate_password_strength_detailed, password),
+                self.db.execute(
+                    select(User.email, User.username)
+                    .where(or_(User.email == email, User.username == username))
+                    .limit(2)
+                )
+            )
             if not password_validation["is_valid"]:
                 errors = ", ".join(password_validation["errors"])
                 return False, f"Password validation failed: {errors}", None
 
-            # Check if email already exists
-            existing_user = self.db.query(User).filter(User.email == email.lower()).first()
-            if existing_user:
+            conflicts = conflict_result.all()
+            if any(row.email == email for row in conflicts):
                 return False, "Email address is already registered", None
-
-            # Check if username already exists
-            existing_username = self.db.query(User).filter(User.username == username.lower()).first()
-            if existing_username:
+            if conflicts:
                 return False, "Username is already taken", None
 
-            # Hash password
-            hashed_password = hash_password(password)
+            # Hash password in the bounded hashing pool
+            hashed_password = await run_in_hash_pool(hash_password, password)
 
-            # Create user
+            # Create user; the ID is generated here so dependent rows can
+            # reference it without an intermediate flush
             user = User(
-                email=email.lower(),
-                username=username.lower(),
+                id=uuid7(),
+                email=email,
+                username=username,
                 hashed_password=hashed_password,
                 first_name=first_name,
                 last_name=last_name,
@@ -102,36 +129,111 @@ class AuthService(BaseService[User, UserCreate, UserUpdate]):
             if created_by_admin and admin_id:
                 user.set_created_by_admin(admin_id)
 
-            self.db.add(user)
-            self.db.flush()  # Get the user ID
-
             # Create password history entry
             password_history = PasswordHistory(
                 user_id=user.id,
                 password_hash=hashed_password,
                 changed_at=datetime.utcnow()
             )
-            self.db.add(password_history)
 
             # Generate email verification token
             verification_token = EmailVerificationToken(
                 user_id=user.id,
-                token=generate_verification_token(),
+                token=verification_token_value,
                 expires_at=datetime.utcnow() + timedelta(hours=24)
             )
-            self.db.add(verification_token)
 
-            self.db.commit()
+            # Single flush on commit
+            self.db.add_all([user, password_history, verification_token])
+            await self.db.commit()
+            await login_guard.forget_unknown_logins(email, username)
 
             return True, "User registered successfully", user
 
         except IntegrityError:
-            self.db.rollback()
+            await self.db.rollback()
             return False, "Email or username already exists", None
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             return False, f"Registration failed: {str(e)}", None
 
+    async def register_users_bulk(
+        self,
+        users: list[UserCreate]
+    ) -> tuple[bool, str, int]:
+        """
+        Register many users with set-based inserts.
+
+        Intended for provisioning; all users are created in one transaction
+        or none are.
+
+        Args:
+            users: Users to create
+
+        Returns:
+            Tuple of (success, message, created_count)
+        """
+        if not users:
+            return True, "No users to register", 0
+
+        for user_data in users:
+            password_validation = validate_password_strength_detailed(user_data.password)
+            if not password_validation["is_valid"]:
+                errors = ", ".join(password_validation["errors"])
+                return False, f"Password validation failed for {user_data.username}: {errors}", 0
+
+        try:
+            hashed_passwords = await asyncio.gather(*(
+                run_in_hash_pool(hash_password, user_data.password) for user_data in users
+            ))
+
+            now = datetime.utcnow()
+            user_rows = []
+            history_rows = []
+            token_rows = []
+            for user_data, hashed_password in zip(users, hashed_passwords, strict=True):
+                user_id = uuid7()
+                user_rows.append({
+                    "id": user_id,
+                    "email": user_data.email.lower(),
+                    "username": user_data.username.lower(),
+                    "hashed_password": hashed_password,
+                    "first_name": user_data.first_name,
+                    "last_name": user_data.last_name,
+                    "email_verified": False,
+                    "is_active": True
+                })
+                history_rows.append({
+                    "id": uuid7(),
+                    "user_id": user_id,
+                    "password_hash": hashed_password,
+                    "changed_at": now
+                })
+                token_rows.append({
+                    "id": uuid7(),
+                    "user_id": user_id,
+                    "token": generate_verification_token(),
+                    "expires_at": now + timedelta(hours=24)
+                })
+
+            await self.db.execute(insert(User), user_rows)
+            await self.db.execute(insert(PasswordHistory), history_rows)
+            await self.db.execute(insert(EmailVerificationToken), token_rows)
+            await self.db.commit()
+            await login_guard.forget_unknown_logins(
+                *(row["email"] for row in user_rows),
+                *(row["username"] for row in user_rows)
+            )
+
+            return True, f"Registered {len(user_rows)} users", len(user_rows)
+
+        except IntegrityError:
+            await self.db.rollback()
+            return False, "Email or username already exists", 0
+        except Exception as e:
+            await self.db.rollback()
+            return False, f"Bulk registration failed: {str(e)}", 0
+
     async def authenticate_user(
         self,
         email_or_username: str,
@@ -152,21 +254,31 @@ class AuthService(BaseService[User, UserCreate, UserUpdate]):
             Tuple of (success, message, token_data)
         """
         try:
-            # Find user by email or username
-            user = self.db.query(User).filter(
-                (User.email == email_or_username.lower()) |
-                (User.username == email_or_username.lower())
-            ).first()
+            if await login_guard.is_rate_limited(ip_address):
+                return False, LOGIN_RATE_LIMITED_MESSAGE, None
+
+            login = email_or_username.lower()
+
+            # Skip the lookup for logins recently seen to match no user
+            user = None
+            if not await login_guard.is_unknown_login(login):
+                user = (await self.db.execute(
+                    USER_BY_LOGIN_STMT, {"login": login}
+                )).scalar_one_or_none()
 
             if not user:
+                await login_guard.remember_unknown_login(login)
+                # Same hashing cost as a real check, so timing does not
+                # reveal whether the account exists
+                await login_guard.verify_dummy_password(password)
                 return False, "Invalid credentials", None
 
             # Check if user is active
             if not user.is_active:
                 return False, "Account is deactivated", None
 
-            # Verify password
-            if not verify_password_secure(password, user.hashed_password):
+            # Verify password in the bounded hashing pool
+            if not await run_in_hash_pool(verify_password_secure, password, user.hashed_password):
                 return False, "Invalid credentials", None
 
             # Update last login
@@ -179,6 +291,7 @@ class AuthService(BaseService[User, UserCreate, UserUpdate]):
                 username=user.username,
                 email_verified=user.email_verified
             )
+            await register_refresh_token(token_data["refresh_jti"], user.id)
 
             # Add user information to token data for the response
             token_data["user"] = UserResponse.model_validate(user).model_dump()
@@ -194,12 +307,12 @@ class AuthService(BaseService[User, UserCreate, UserUpdate]):
             )
             self.db.add(session)
 
-            self.db.commit()
+            await self.db.commit()
 
             return True, "Login successful", token_data
 
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             return False, f"Authentication failed: {str(e)}", None
 
     async def logout_user(
@@ -221,7 +334,7 @@ class AuthService(BaseService[User, UserCreate, UserUpdate]):
         """
         try:
             # Blacklist the access token
-            blacklist_success = blacklist_token(
+            blacklist_success = await blacklist_token(
                 token=access_token,
                 db=self.db,
                 reason="User logout"
@@ -232,70 +345,83 @@ class AuthService(BaseService[User, UserCreate, UserUpdate]):
 
             # Deactivate session if provided
             if session_token:
-                session = self.db.query(UserSession).filter(
-                    UserSession.user_id == user_id,
-                    UserSession.session_token == session_token,
-                    UserSession.is_active
-                ).first()
+                session = (await self.db.execute(
+                    select(UserSession).where(
+                        UserSession.user_id == user_id,
+                        UserSession.session_token == session_token,
+                        UserSession.is_active
+                    )
+                )).scalar_one_or_none()
 
                 if session:
                     session.deactivate()
 
-            self.db.commit()
+            await self.db.commit()
             return True, "Logout successful"
 
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             return False, f"Logout failed: {str(e)}"
 
     async def request_password_reset(
         self,
         email: str
-    ) -> tuple[bool, str, str | None]:
+    ) -> tuple[bool, str, str | None, str | None]:
         """
         Request a password reset token.
 
+        The token is generated before the first query and handed back to the
+        caller, so the reset email can be sent after commit without reading
+        the token again.
+
         Args:
             email: User email address
 
         Returns:
-            Tuple of (success, message, masked_email)
+            Tuple of (success, message, masked_email, reset_token)
         """
         try:
-            user = self.db.query(User).filter(User.email == email.lower()).first()
+            reset_token_value = generate_password_reset_token_secure()
+
+            user = (await self.db.execute(
+                USER_BY_EMAIL_STMT, {"email": email.lower()}
+            )).scalar_one_or_none()
 
             if not user:
                 # Don't reveal if email exists for security
-                return True, "If the email exists, a reset link has been sent", mask_email(email)
+                return True, "If the email exists, a reset link has been sent", mask_email(email), None
 
             if not user.is_active:
-                return False, "Account is deactivated", None
-
-            # Deactivate any existing reset tokens
-            existing_tokens = self.db.query(PasswordResetToken).filter(
-                PasswordResetToken.user_id == user.id,
-                not PasswordResetToken.is_used,
-                PasswordResetToken.expires_at > datetime.utcnow()
-            ).all()
-
-            for token in existing_tokens:
-                token.mark_as_used()
+                return False, "Account is deactivated", None, None
+
+            # Deactivate any existing reset tokens in a single UPDATE
+            now = datetime.utcnow()
+            await self.db.execute(
+                update(PasswordResetToken)
+                .where(
+                    PasswordResetToken.user_id == user.id,
+                    PasswordResetToken.is_used.is_(False),
+                    PasswordResetToken.expires_at > now
+                )
+                .values(is_used=True, used_at=now)
+                .execution_options(synchronize_session=False)
+            )
 
             # Create new reset token
             reset_token = PasswordResetToken(
                 user_id=user.id,
-                token=generate_password_reset_token_secure(),
+                token=reset_token_value,
                 expires_at=datetime.utcnow() + timedelta(hours=1)  # 1 hour expiry
             )
             self.db.add(reset_token)
 
-            self.db.commit()
+            await self.db.commit()
 
-            return True, "Password reset link has been sent", mask_email(email)
+            return True, "Password reset link has been sent", mask_email(email), reset_token_value
 
         except Exception as e:
-            self.db.rollback()
-            return False, f"Password reset request failed: {str(e)}", None
+            await self.db.rollback()
+            return False, f"Password reset request failed: {str(e)}", None, None
 
     async def reset_password(
         self,
@@ -313,33 +439,47 @@ class AuthService(BaseService[User, UserCreate, UserUpdate]):
             Tuple of (success, message)
         """
         try:
-            # Find valid reset token
-            reset_token = self.db.query(PasswordResetToken).filter(
-                PasswordResetToken.token == token,
-                not PasswordResetToken.is_used,
-                PasswordResetToken.expires_at > datetime.utcnow()
-            ).first()
-
-            if not reset_token:
+            # Fetch the valid reset token, its user and the last 5 password
+            # hashes in one round-trip (one row per history entry). The token
+            # row stays locked until commit; a concurrent redemption skips it
+            # and sees the token as invalid instead of applying it twice.
+            recent_history = (
+                select(PasswordHistory.password_hash)
+                .where(PasswordHistory.user_id == User.id)
+                .order_by(PasswordHistory.changed_at.desc())
+                .limit(5)
+                .lateral()
+            )
+            # Password strength is validated while the lookup is in flight
+            password_validation, result = await asyncio.gather(
+                asyncio.to_thread(validate_password_strength_detailed, new_password),
+                self.db.execute(
+                    select(PasswordResetToken, User, recent_history.c.password_hash)
+                    .join(User, User.id == PasswordResetToken.user_id)
+                    .outerjoin(recent_history, true())
+                    .where(
+                        PasswordResetToken.token == token,
+                        PasswordResetToken.is_used.is_(False),
+                        PasswordResetToken.expires_at > datetime.utcnow()
+                    )
+                    .with_for_update(of=PasswordResetToken, skip_locked=True)
+                )
+            )
+            rows = result.all()
+
+            if not rows:
                 return False, "Invalid or expired reset token"
 
-            user = self.db.query(User).filter(User.id == reset_token.user_id).first()
-            if not user:
-                return False, "User not found"
+            reset_token, user, _ = rows[0]
+            history_hashes = [password_hash for _, _, password_hash in rows if password_hash]
 
-            # Validate new password strength
-            password_validation = validate_password_strength_detailed(new_password)
             if not password_validation["is_valid"]:
                 errors = ", ".join(password_validation["errors"])
                 return False, f"Password validation failed: {errors}"
 
             # Check password history
-            password_history = self.db.query(PasswordHistory).filter(
-                PasswordHistory.user_id == user.id
-            ).order_by(PasswordHistory.changed_at.desc()).limit(5).all()
-
-            history_hashes = [ph.password_hash for ph in password_history]
-            is_allowed, history_error = check_password_history(
+            is_allowed, history_error = await run_in_hash_pool(
+                check_password_history,
                 user_id=user.id,
                 new_password=new_password,
                 password_history=history_hashes,
@@ -350,7 +490,7 @@ class AuthService(BaseService[User, UserCreate, UserUpdate]):
                 return False, history_error
 
             # Hash new password
-            new_hashed_password = hash_password(new_password)
+            new_hashed_password = await run_in_hash_pool(hash_password, new_password)
 
             # Update user password
             user.hashed_password = new_hashed_password
@@ -364,14 +504,14 @@ class AuthService(BaseService[User, UserCreate, UserUpdate]):
             self.db.add(password_history_entry)
 
             # Mark reset token as used
-            reset_token.mark_as_used()
+            reset_token.use_token()
 
-            self.db.commit()
+            await self.db.commit()
 
             return True, "Password reset successfully"
 
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             return False, f"Password reset failed: {str(e)}"
 
     async def verify_email(
@@ -388,30 +528,38 @@ class AuthService(BaseService[User, UserCreate, UserUpdate]):
             Tuple of (success, message)
         """
         try:
-            # Find valid verification token
-            verification_token = self.db.query(EmailVerificationToken).filter(
-                EmailVerificationToken.token == token,
-                not EmailVerificationToken.is_used,
-                EmailVerificationToken.expires_at > datetime.utcnow()
-            ).first()
-
-            if not verification_token:
+            # Claim the token atomically so concurrent requests cannot both use it
+            now = datetime.utcnow()
+            user_id = (await self.db.execute(
+                update(EmailVerificationToken)
+                .where(
+                    EmailVerificationToken.token == token,
+                    EmailVerificationToken.is_used.is_(False),
+                    EmailVerificationToken.expires_at > now
+                )
+                .values(is_used=True, used_at=now)
+                .returning(EmailVerificationToken.user_id)
+                .execution_options(synchronize_session=False)
+            )).scalar_one_or_none()
+
+            if user_id is None:
                 return False, "Invalid or expired verification token"
 
-            user = self.db.query(User).filter(User.id == verification_token.user_id).first()
-            if not user:
-                return False, "User not found"
-
             # Verify email
-            user.verify_email()
-            verification_token.mark_as_used()
+            await self.db.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(email_verified=True)
+                .execution_options(synchronize_session=False)
+            )
 
-            self.db.commit()
+            await self.db.commit()
+            await profile_cache.invalidate(user_id)
 
             return True, "Email verified successfully"
 
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             return False, f"Email verification failed: {str(e)}"
 
     async def resend_verification_email(
@@ -428,7 +576,11 @@ class AuthService(BaseService[User, UserCreate, UserUpdate]):
             Tuple of (success, message)
         """
         try:
-            user = self.db.query(User).filter(User.email == email.lower()).first()
+            verification_token_value = generate_verification_token()
+
+            user = (await self.db.execute(
+                USER_BY_EMAIL_STMT, {"email": email.lower()}
+            )).scalar_one_or_none()
 
             if not user:
                 return False, "User not found"
@@ -439,27 +591,29 @@ class AuthService(BaseService[User, UserCreate, UserUpdate]):
             if not user.is_active:
                 return False, "Account is deactivated"
 
-            # Deactivate existing verification tokens
-            existing_tokens = self.db.query(EmailVerificationToken).filter(
-                EmailVerificationToken.user_id == user.id,
-                not EmailVerificationToken.is_used
-            ).all()
-
-            for token in existing_tokens:
-                token.mark_as_used()
+            # Deactivate existing verification tokens in a single UPDATE
+            await self.db.execute(
+                update(EmailVerificationToken)
+                .where(
+                    EmailVerificationToken.user_id == user.id,
+                    EmailVerificationToken.is_used.is_(False)
+                )
+                .values(is_used=True, used_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
 
             # Create new verification token
             verification_token = EmailVerificationToken(
                 user_id=user.id,
-                token=generate_verification_token(),
+                token=verification_token_value,
                 expires_at=datetime.utcnow() + timedelta(hours=24)
             )
             self.db.add(verification_token)
 
-            self.db.commit()
+            await self.db.commit()
 
             return True, "Verification email sent"
 
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             return False, f"Failed to resend verification email: {str(e)}"
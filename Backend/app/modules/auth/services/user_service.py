@@ -5,24 +5,48 @@ User service for profile management and user operations.
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import and_, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, String, and_, bindparam, exists, func, lambda_stmt, literal_column, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.services.base_service import BaseService
-from app.core.utils.validators import validate_email
+from app.core.utils.validators import validate_email_address
 from app.modules.auth.models.password_history import PasswordHistory
 from app.modules.auth.models.user import User
-from app.modules.auth.schemas.user import UserCreate, UserUpdate
+from app.modules.auth.schemas.user import UserCreate, UserResponse, UserUpdate
+from app.modules.auth.utils.login_guard import login_guard
 from app.modules.auth.utils.password import (
     validate_password_change,
 )
-from app.modules.auth.utils.security import hash_password
+from app.modules.auth.utils.profile_cache import profile_cache
+from app.modules.auth.utils.security import hash_password, run_in_hash_pool
+
+# Hot lookups built once; the compiled SQL is reused and only parameters change
+USER_BY_EMAIL_STMT = lambda_stmt(lambda: select(User).where(User.email == bindparam("email")))
+USER_BY_USERNAME_STMT = lambda_stmt(lambda: select(User).where(User.username == bindparam("username")))
+
+# Must match the ix_users_search_trgm expression so the GIN index is used;
+# the separators are inlined because bound parameters cannot match an index
+_SEPARATOR: ColumnElement[str] = literal_column("' '", type_=String)
+_EMPTY: ColumnElement[str] = literal_column("''", type_=String)
+USER_SEARCH_DOCUMENT: ColumnElement[str] = (
+    func.lower(User.username, type_=String)
+    .concat(_SEPARATOR)
+    .concat(func.lower(User.email, type_=String))
+    .concat(_SEPARATOR)
+    .concat(func.coalesce(func.lower(User.first_name, type_=String), _EMPTY))
+    .concat(_SEPARATOR)
+    .concat(func.coalesce(func.lower(User.last_name, type_=String), _EMPTY))
+)
+
+# Trigrams need at least three characters to narrow the GIN index scan
+SEARCH_MIN_QUERY_LENGTH = 3
+SEARCH_MAX_LIMIT = 200
 
 
 class UserService(BaseService[User, UserCreate, UserUpdate]):
     """Service for user profile management and operations."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(User)
         self.db = db
 
@@ -36,19 +60,47 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         Returns:
             User object or None if not found
         """
-        return self.get(self.db, user_id)
+        return await self.db.get(User, user_id)
+
+    async def _count_users(self, **criteria) -> dict[str, int]:
+        """
+        Count all users plus filtered subsets in a single table pass.
+
+        Args:
+            **criteria: Named SQLAlchemy filter expressions, each becoming a
+                ``COUNT(*) FILTER (WHERE ...)`` column
+
+        Returns:
+            Dictionary with ``total`` and one count per criteria name
+        """
+        stmt = select(
+            func.count().label("total"),
+            *(func.count().filter(criterion).label(name) for name, criterion in criteria.items())
+        ).select_from(User)
+        row = (await self.db.execute(stmt)).one()
+        return dict(row._mapping)
 
-    async def get_user_profile(self, user_id: UUID) -> User | None:
+    async def get_user_profile(self, user_id: UUID) -> UserResponse | None:
         """
-        Get user profile by ID.
+        Get user profile by ID, served from the profile cache when possible.
 
         Args:
             user_id: User UUID
 
         Returns:
-            User object or None if not found
+            Profile snapshot or None if not found
         """
-        return self.get_by_id(user_id)
+        profile = profile_cache.get(user_id)
+        if profile is not None:
+            return profile
+
+        user = await self.get_by_id(user_id)
+        if not user:
+            return None
+
+        profile = UserResponse.model_validate(user)
+        profile_cache.set(user_id, profile)
+        return profile
 
     async def update_user_profile(
         self,
@@ -72,35 +124,43 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
             Tuple of (success, message, updated_user)
         """
         try:
-            user = self.get_by_id(user_id)
+            user = await self.get_by_id(user_id)
             if not user:
                 return False, "User not found", None
 
+            email_lc = email.lower() if email else None
+            username_lc = username.lower() if username else None
+            email_changed = bool(email) and email != user.email
+            username_changed = bool(username) and username != user.username
+
             # Validate email if provided
-            if email and email != user.email:
-                if not validate_email(email):
-                    return False, "Invalid email format", None
-
-                # Check if email already exists
-                existing_user = self.db.query(User).filter(
-                    and_(User.email == email.lower(), User.id != user_id)
-                ).first()
-                if existing_user:
+            if email_changed and not validate_email_address(email):
+                return False, "Invalid email format", None
+
+            # Check email and username availability in one round-trip
+            criteria = []
+            if email_changed:
+                criteria.append(User.email == email_lc)
+            if username_changed:
+                criteria.append(User.username == username_lc)
+
+            if criteria:
+                conflicts = (await self.db.execute(
+                    select(User.email, User.username)
+                    .where(and_(or_(*criteria), User.id != user_id))
+                    .limit(2)
+                )).all()
+                if email_changed and any(row.email == email_lc for row in conflicts):
                     return False, "Email address is already in use", None
+                if conflicts:
+                    return False, "Username is already taken", None
 
-                user.email = email.lower()
+            if email_changed:
+                user.email = email_lc
                 user.email_verified = False  # Reset verification status
 
-            # Validate username if provided
-            if username and username != user.username:
-                # Check if username already exists
-                existing_user = self.db.query(User).filter(
-                    and_(User.username == username.lower(), User.id != user_id)
-                ).first()
-                if existing_user:
-                    return False, "Username is already taken", None
-
-                user.username = username.lower()
+            if username_changed:
+                user.username = username_lc
 
             # Update other fields
             if first_name is not None:
@@ -108,12 +168,17 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
             if last_name is not None:
                 user.last_name = last_name
 
-            self.db.commit()
+            await self.db.commit()
+            await profile_cache.invalidate(user_id)
+
+            # New login names may be cached as unknown
+            if email_changed or username_changed:
+                await login_guard.forget_unknown_logins(user.email, user.username)
 
             return True, "Profile updated successfully", user
 
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             return False, f"Profile update failed: {str(e)}", None
 
     async def change_password(
@@ -134,19 +199,23 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
             Tuple of (success, message)
         """
         try:
-            user = self.get_by_id(user_id)
+            user = await self.get_by_id(user_id)
             if not user:
                 return False, "User not found"
 
             # Get password history
-            password_history = self.db.query(PasswordHistory).filter(
-                PasswordHistory.user_id == user_id
-            ).order_by(PasswordHistory.changed_at.desc()).limit(5).all()
+            password_history = (await self.db.execute(
+                select(PasswordHistory)
+                .where(PasswordHistory.user_id == user_id)
+                .order_by(PasswordHistory.changed_at.desc())
+                .limit(5)
+            )).scalars().all()
 
             history_hashes = [ph.password_hash for ph in password_history]
 
             # Validate password change
-            validation_result = validate_password_change(
+            validation_result = await run_in_hash_pool(
+                validate_password_change,
                 current_password=current_password,
                 new_password=new_password,
                 current_password_hash=user.hashed_password,
@@ -158,7 +227,7 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
                 return False, f"Password change failed: {errors}"
 
             # Hash new password
-            new_hashed_password = hash_password(new_password)
+            new_hashed_password = await run_in_hash_pool(hash_password, new_password)
 
             # Update user password
             user.hashed_password = new_hashed_password
@@ -171,12 +240,13 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
             )
             self.db.add(password_history_entry)
 
-            self.db.commit()
+            await self.db.commit()
+            await profile_cache.invalidate(user_id)
 
             return True, "Password changed successfully"
 
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             return False, f"Password change failed: {str(e)}"
 
     async def update_avatar(
@@ -195,17 +265,18 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
             Tuple of (success, message)
         """
         try:
-            user = self.get_by_id(user_id)
+            user = await self.get_by_id(user_id)
             if not user:
                 return False, "User not found"
 
             user.avatar_url = avatar_url
-            self.db.commit()
+            await self.db.commit()
+            await profile_cache.invalidate(user_id)
 
             return True, "Avatar updated successfully"
 
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             return False, f"Avatar update failed: {str(e)}"
 
     async def activate_user(self, user_id: UUID) -> tuple[bool, str]:
@@ -219,17 +290,18 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
             Tuple of (success, message)
         """
         try:
-            user = self.get_by_id(user_id)
+            user = await self.get_by_id(user_id)
             if not user:
                 return False, "User not found"
 
             user.activate()
-            self.db.commit()
+            await self.db.commit()
+            await profile_cache.invalidate(user_id)
 
             return True, "User activated successfully"
 
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             return False, f"User activation failed: {str(e)}"
 
     async def deactivate_user(self, user_id: UUID) -> tuple[bool, str]:
@@ -243,17 +315,18 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
             Tuple of (success, message)
         """
         try:
-            user = self.get_by_id(user_id)
+            user = await self.get_by_id(user_id)
             if not user:
                 return False, "User not found"
 
             user.deactivate()
-            self.db.commit()
+            await self.db.commit()
+            await profile_cache.invalidate(user_id)
 
             return True, "User deactivated successfully"
 
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             return False, f"User deactivation failed: {str(e)}"
 
     async def search_users(
@@ -262,42 +335,54 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         email_verified: bool | None = None,
         is_active: bool | None = None,
         limit: int = 50,
-        offset: int = 0
-    ) -> list[User]:
+        cursor: tuple[datetime, UUID] | None = None
+    ) -> tuple[list[User], tuple[datetime, UUID] | None]:
         """
         Search and filter users.
 
+        Users are ordered newest first and paginated by keyset, so every page
+        costs the same regardless of how deep it is.
+
         Args:
-            query: Search query for username, email, or name
+            query: Search query for username, email, or name (at least three characters)
             email_verified: Filter by email verification status
             is_active: Filter by active status
-            limit: Maximum number of results
-            offset: Number of results to skip
+            limit: Maximum number of results, capped at SEARCH_MAX_LIMIT
+            cursor: Optional (created_at, id) of the last user on the previous page
 
         Returns:
-            List of matching users
+            Tuple of (matching users, cursor for the next page or None)
         """
-        query_filter = self.db.query(User)
+        if query is not None and len(query) < SEARCH_MIN_QUERY_LENGTH:
+            return [], None
+
+        limit = min(limit, SEARCH_MAX_LIMIT)
+        stmt = select(User)
 
         # Apply search query
         if query:
-            search_filter = or_(
-                User.username.ilike(f"%{query}%"),
-                User.email.ilike(f"%{query}%"),
-                User.first_name.ilike(f"%{query}%"),
-                User.last_name.ilike(f"%{query}%")
-            )
-            query_filter = query_filter.filter(search_filter)
+            stmt = stmt.where(USER_SEARCH_DOCUMENT.like(f"%{query.lower()}%"))
 
         # Apply filters
         if email_verified is not None:
-            query_filter = query_filter.filter(User.email_verified == email_verified)
+            stmt = stmt.where(User.email_verified == email_verified)
 
         if is_active is not None:
-            query_filter = query_filter.filter(User.is_active == is_active)
+            stmt = stmt.where(User.is_active == is_active)
 
-        # Apply pagination
-        return query_filter.offset(offset).limit(limit).all()
+        # Apply keyset pagination; one extra row tells whether a next page exists
+        if cursor:
+            stmt = stmt.where(tuple_(User.created_at, User.id) < tuple_(*cursor))
+
+        stmt = stmt.order_by(User.created_at.desc(), User.id.desc()).limit(limit + 1)
+        users = list((await self.db.execute(stmt)).scalars().all())
+
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = (users[-1].created_at, users[-1].id)
+
+        return users, next_cursor
 
     async def get_user_by_email(self, email: str) -> User | None:
         """
@@ -309,7 +394,7 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         Returns:
             User object or None if not found
         """
-        return self.db.query(User).filter(User.email == email.lower()).first()
+        return await self.get_by_email(email)
 
     async def get_user_by_username(self, username: str) -> User | None:
         """
@@ -321,7 +406,7 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         Returns:
             User object or None if not found
         """
-        return self.db.query(User).filter(User.username == username.lower()).first()
+        return await self.get_by_username(username)
 
     async def check_email_availability(self, email: str, exclude_user_id: UUID | None = None) -> bool:
         """
@@ -334,12 +419,13 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         Returns:
             True if email is available
         """
-        query = self.db.query(User).filter(User.email == email.lower())
+        criteria = [func.lower(User.email) == email.lower()]
 
         if exclude_user_id:
-            query = query.filter(User.id != exclude_user_id)
+            criteria.append(User.id != exclude_user_id)
 
-        return query.first() is None
+        taken = (await self.db.execute(select(exists().where(*criteria)))).scalar()
+        return not taken
 
     async def check_username_availability(self, username: str, exclude_user_id: UUID | None = None) -> bool:
         """
@@ -352,12 +438,13 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         Returns:
             True if username is available
         """
-        query = self.db.query(User).filter(User.username == username.lower())
+        criteria = [func.lower(User.username) == username.lower()]
 
         if exclude_user_id:
-            query = query.filter(User.id != exclude_user_id)
+            criteria.append(User.id != exclude_user_id)
 
-        return query.first() is None
+        taken = (await self.db.execute(select(exists().where(*criteria)))).scalar()
+        return not taken
 
     async def get_user_stats(self) -> dict[str, int]:
         """
@@ -366,9 +453,10 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         Returns:
             Dictionary with user statistics
         """
-        total_users = self.db.query(User).count()
-        active_users = self.db.query(User).filter(User.is_active).count()
-        verified_users = self.db.query(User).filter(User.email_verified).count()
+        counts = await self._count_users(active=User.is_active, verified=User.email_verified)
+        total_users = counts["total"]
+        active_users = counts["active"]
+        verified_users = counts["verified"]
 
         return {
             "total_users": total_users,
@@ -388,7 +476,10 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         Returns:
             List of recent users
         """
-        return self.db.query(User).order_by(User.created_at.desc()).limit(limit).all()
+        result = await self.db.execute(
+            select(User).order_by(User.created_at.desc()).limit(limit)
+        )
+        return list(result.scalars().all())
 
     async def delete_user(self, user_id: UUID) -> tuple[bool, str]:
         """
@@ -401,72 +492,84 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
             Tuple of (success, message)
         """
         try:
-            user = self.get_by_id(user_id)
+            user = await self.get_by_id(user_id)
             if not user:
                 return False, "User not found"
 
-            # Soft delete using the base model's delete method
-            self.delete(user_id)
+            # The account row stays so the user's expenses and payments keep
+            # their references
+            user.deactivate()
+            await self.db.commit()
+            await profile_cache.invalidate(user_id)
 
             return True, "User deleted successfully"
 
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             return False, f"User deletion failed: {str(e)}"
 
     async def get_by_email(self, email: str) -> User | None:
         """Get user by email address."""
-        return self.db.query(User).filter(User.email == email.lower()).first()
+        result = await self.db.execute(USER_BY_EMAIL_STMT, {"email": email.lower()})
+        return result.scalar_one_or_none()
 
     async def get_by_username(self, username: str) -> User | None:
         """Get user by username."""
-        return self.db.query(User).filter(User.username == username.lower()).first()
+        result = await self.db.execute(USER_BY_USERNAME_STMT, {"username": username.lower()})
+        return result.scalar_one_or_none()
 
     async def list_users_with_filters(
         self,
         skip: int = 0,
         limit: int = 100,
         search: str | None = None,
+        cursor: tuple[datetime, UUID] | None = None,
         **filters
     ) -> tuple[list[User], int]:
         """
         List users with filtering and pagination.
+
+        Users are ordered newest first. When a cursor is given, keyset
+        pagination is used and ``skip`` is ignored, so deep pages cost the
+        same as the first one.
         
         Args:
-            skip: Number of users to skip
+            skip: Number of users to skip (offset pagination)
             limit: Maximum number of users to return
             search: Search term for email/username
+            cursor: Optional (created_at, id) of the last user on the previous page
             **filters: Additional filters (role, is_active, etc.)
             
         Returns:
             Tuple of (users_list, total_count)
         """
-        query = self.db.query(User)
+        stmt = select(User)
         
         # Apply search filter
         if search:
-            search_term = f"%{search.lower()}%"
-            query = query.filter(
-                or_(
-                    User.email.ilike(search_term),
-                    User.username.ilike(search_term),
-                    User.first_name.ilike(search_term),
-                    User.last_name.ilike(search_term)
-                )
-            )
+            stmt = stmt.where(USER_SEARCH_DOCUMENT.like(f"%{search.lower()}%"))
         
         # Apply additional filters
         for key, value in filters.items():
             if hasattr(User, key) and value is not None:
-                query = query.filter(getattr(User, key) == value)
+                stmt = stmt.where(getattr(User, key) == value)
         
         # Get total count
-        total = query.count()
+        total = (await self.db.execute(
+            select(func.count()).select_from(stmt.subquery())
+        )).scalar_one()
         
+        stmt = stmt.order_by(User.created_at.desc(), User.id.desc())
+
         # Apply pagination
-        users = query.offset(skip).limit(limit).all()
+        if cursor:
+            stmt = stmt.where(tuple_(User.created_at, User.id) < tuple_(*cursor))
+        else:
+            stmt = stmt.offset(skip)
+
+        users = (await self.db.execute(stmt.limit(limit))).scalars().all()
         
-        return users, total
+        return list(users), total
 
     async def get_user_statistics(self) -> dict:
         """
@@ -475,46 +578,32 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         Returns:
             Dictionary with user statistics
         """
-        from sqlalchemy import func
         from datetime import date, timedelta
         
-        total_users = self.db.query(User).count()
-        active_users = self.db.query(User).filter(User.is_active == True).count()
-        inactive_users = total_users - active_users
-        
-        admin_users = self.db.query(User).filter(User.role == "admin").count()
-        regular_users = total_users - admin_users
-        
-        verified_users = self.db.query(User).filter(User.email_verified == True).count()
-        unverified_users = total_users - verified_users
-        
-        # Users created today
         today = date.today()
-        users_created_today = self.db.query(User).filter(
-            func.date(User.created_at) == today
-        ).count()
-        
-        # Users created this week
         week_ago = today - timedelta(days=7)
-        users_created_this_week = self.db.query(User).filter(
-            User.created_at >= week_ago
-        ).count()
-        
-        # Users created this month
         month_ago = today - timedelta(days=30)
-        users_created_this_month = self.db.query(User).filter(
-            User.created_at >= month_ago
-        ).count()
+
+        # All counts in one aggregate query
+        counts = await self._count_users(
+            active=User.is_active == True,
+            admin=User.role == "admin",
+            verified=User.email_verified == True,
+            created_today=func.date(User.created_at) == today,
+            created_this_week=User.created_at >= week_ago,
+            created_this_month=User.created_at >= month_ago
+        )
+        total_users = counts["total"]
         
         return {
             "total_users": total_users,
-            "active_users": active_users,
-            "inactive_users": inactive_users,
-            "admin_users": admin_users,
-            "regular_users": regular_users,
-            "verified_users": verified_users,
-            "unverified_users": unverified_users,
-            "users_created_today": users_created_today,
-            "users_created_this_week": users_created_this_week,
-            "users_created_this_month": users_created_this_month
+            "active_users": counts["active"],
+            "inactive_users": total_users - counts["active"],
+            "admin_users": counts["admin"],
+            "regular_users": total_users - counts["admin"],
+            "verified_users": counts["verified"],
+            "unverified_users": total_users - counts["verified"],
+            "users_created_today": counts["created_today"],
+            "users_created_this_week": counts["created_this_week"],
+            "users_created_this_month": counts["created_this_month"]
         }
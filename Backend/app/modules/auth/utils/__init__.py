@@ -13,6 +13,8 @@ __all__ = [
     "generate_session_token",
     "hash_password",
     "verify_password_secure",
+    "secrets_equal",
+    "run_in_hash_pool",
     "create_user_tokens",
 
     # Password utilities
@@ -27,6 +29,7 @@ __all__ = [
     "verify_access_token",
     "verify_refresh_token",
     "refresh_access_token",
+    "register_refresh_token",
     "blacklist_token",
     "logout_user_all_devices",
     "cleanup_expired_blacklisted_tokens",
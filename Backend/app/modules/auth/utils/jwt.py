@@ -3,15 +3,26 @@ Enhanced JWT utilities for the auth module.
 """
 
 import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Any
 from uuid import UUID, uuid4
 
 import jwt
+from jwt.algorithms import get_default_algorithms
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.modules.auth.models.token_blacklist import TokenBlacklist
+from app.modules.auth.utils.refresh_token_store import refresh_token_store
+from app.modules.auth.utils.token_denylist import token_denylist
+
+# Tokens that recently failed verification are remembered for a short time so
+# replaying the same bad token does not pay for signature checking again.
+REJECTED_TOKEN_CACHE_SIZE = 1024
+REJECTED_TOKEN_TTL_SECONDS = 60
 
 
 class JWTManager:
@@ -22,10 +33,49 @@ class JWTManager:
         self.algorithm = settings.jwt_algorithm
         self.access_token_expire_minutes = settings.jwt_access_token_expire_minutes
         self.refresh_token_expire_days = settings.jwt_refresh_token_expire_days
+        self.refresh_token_ttl_seconds = self.refresh_token_expire_days * 24 * 60 * 60
+
+        # Parse keys once instead of on every encode/decode call.
+        algorithm = get_default_algorithms()[self.algorithm]
+        self._signing_key = algorithm.prepare_key(self.secret_key)
+        self._verifying_key = algorithm.prepare_key(
+            settings.jwt_public_key or self.secret_key
+        )
+        self._rejected_tokens: OrderedDict[str, float] = OrderedDict()
+
+    def _decode(self, token: str) -> dict[str, Any]:
+        """
+        Decode and verify a token with the cached verification key.
+
+        Args:
+            token: JWT token to decode
+
+        Returns:
+            Decoded token payload
+
+        Raises:
+            jwt.PyJWTError: If the token is invalid or was recently rejected
+        """
+        now = time.monotonic()
+        rejected_until = self._rejected_tokens.get(token)
+        if rejected_until is not None:
+            if rejected_until > now:
+                raise jwt.InvalidTokenError("Token was recently rejected")
+            del self._rejected_tokens[token]
+
+        try:
+            return jwt.decode(
+                token, self._verifying_key, algorithms=[self.algorithm]
+            )
+        except jwt.PyJWTError:
+            self._rejected_tokens[token] = now + REJECTED_TOKEN_TTL_SECONDS
+            if len(self._rejected_tokens) > REJECTED_TOKEN_CACHE_SIZE:
+                self._rejected_tokens.popitem(last=False)
+            raise
 
     def create_access_token(
         self,
-        user_id: UUID,
+        user_id: UUID | str,
         additional_claims: dict[str, Any] | None = None,
         expires_delta: timedelta | None = None
     ) -> tuple[str, str]:
@@ -33,7 +83,7 @@ class JWTManager:
         Create an access token with custom claims.
 
         Args:
-            user_id: User UUID
+            user_id: User UUID or its string form
             additional_claims: Additional claims to include
             expires_delta: Custom expiration time
 
@@ -59,26 +109,28 @@ class JWTManager:
         if additional_claims:
             payload.update(additional_claims)
 
-        token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        token = jwt.encode(payload, self._signing_key, algorithm=self.algorithm)
         return token, jti
 
     def create_refresh_token(
         self,
-        user_id: UUID,
-        additional_claims: dict[str, Any] | None = None
+        user_id: UUID | str,
+        additional_claims: dict[str, Any] | None = None,
+        jti: str | None = None
     ) -> tuple[str, str]:
         """
         Create a refresh token.
 
         Args:
-            user_id: User UUID
+            user_id: User UUID or its string form
             additional_claims: Additional claims to include
+            jti: Optional pre-generated token ID
 
         Returns:
             Tuple of (token, jti)
         """
         expire = datetime.utcnow() + timedelta(days=self.refresh_token_expire_days)
-        jti = str(uuid4())
+        jti = jti or str(uuid4())
 
         payload = {
             "sub": str(user_id),
@@ -92,7 +144,7 @@ class JWTManager:
         if additional_claims:
             payload.update(additional_claims)
 
-        token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        token = jwt.encode(payload, self._signing_key, algorithm=self.algorithm)
         return token, jti
 
     def create_token_pair(
@@ -110,8 +162,10 @@ class JWTManager:
         Returns:
             Dictionary with token information
         """
-        access_token, access_jti = self.create_access_token(user_id, additional_claims)
-        refresh_token, refresh_jti = self.create_refresh_token(user_id, additional_claims)
+        # Format the UUID once; str() of a str is free in both token builders
+        subject = str(user_id)
+        access_token, access_jti = self.create_access_token(subject, additional_claims)
+        refresh_token, refresh_jti = self.create_refresh_token(subject, additional_claims)
 
         return {
             "access_token": access_token,
@@ -122,7 +176,7 @@ class JWTManager:
             "refresh_jti": refresh_jti
         }
 
-    def verify_token(
+    async def verify_token(
         self,
         token: str,
         db: Session,
@@ -140,9 +194,7 @@ class JWTManager:
             Decoded token payload or None if invalid
         """
         try:
-            payload = jwt.decode(
-                token, self.secret_key, algorithms=[self.algorithm]
-            )
+            payload = self._decode(token)
 
             # Check token type if specified
             if expected_type and payload.get("type") != expected_type:
@@ -150,7 +202,7 @@ class JWTManager:
 
             # Check if token is blacklisted
             jti = payload.get("jti")
-            if jti and TokenBlacklist.is_token_blacklisted(db, jti):
+            if jti and await token_denylist.is_revoked(jti, db):
                 return None
 
             return payload
@@ -158,13 +210,17 @@ class JWTManager:
         except jwt.PyJWTError:
             return None
 
-    def refresh_access_token(
+    async def refresh_access_token(
         self,
         refresh_token: str,
         db: Session
     ) -> dict[str, Any] | None:
         """
-        Create a new access token using a refresh token.
+        Exchange a refresh token for a new access and refresh token pair.
+
+        The presented refresh token is consumed, so each refresh token can
+        only be used once. With Redis the lookup and rotation happen in one
+        atomic script; otherwise the old token is blacklisted in the database.
 
         Args:
             refresh_token: Valid refresh token
@@ -173,57 +229,91 @@ class JWTManager:
         Returns:
             New token pair or None if refresh token is invalid
         """
-        payload = self.verify_token(refresh_token, db, expected_type="refresh")
-        if not payload:
-            return None
+        new_refresh_jti = str(uuid4())
 
-        user_id = UUID(payload["sub"])
+        if refresh_token_store.enabled:
+            try:
+                payload = self._decode(refresh_token)
+            except jwt.PyJWTError:
+                return None
+
+            if payload.get("type") != "refresh" or not payload.get("jti"):
+                return None
 
-        # Create new access token
+            owner_id = await refresh_token_store.rotate(
+                payload["jti"], new_refresh_jti, self.refresh_token_ttl_seconds
+            )
+            if owner_id is None:
+                return None
+            user_id = UUID(owner_id)
+        else:
+            payload = await self.verify_token(refresh_token, db, expected_type="refresh")
+            if not payload:
+                return None
+
+            user_id = UUID(payload["sub"])
+            await self.blacklist_token(refresh_token, db, reason="refresh_rotated")
+
+        # Create new token pair
         access_token, access_jti = self.create_access_token(user_id)
+        new_refresh_token, _ = self.create_refresh_token(user_id, jti=new_refresh_jti)
 
         return {
             "access_token": access_token,
+            "refresh_token": new_refresh_token,
             "token_type": "bearer",
             "expires_in": self.access_token_expire_minutes * 60,
-            "access_jti": access_jti
+            "access_jti": access_jti,
+            "refresh_jti": new_refresh_jti
         }
 
-    def blacklist_token(
+    async def blacklist_token(
         self,
         token: str,
-        db: Session,
+        db: Session | AsyncSession,
         reason: str | None = None
     ) -> bool:
         """
         Blacklist a token.
 
+        The revocation is stored in Redis with a TTL matching the token's
+        remaining lifetime; the database blacklist table is only written
+        when Redis is not configured.
+
         Args:
             token: Token to blacklist
-            db: Database session
+            db: Database session (sync or async)
             reason: Reason for blacklisting
 
         Returns:
             True if token was blacklisted successfully
         """
         try:
-            payload = jwt.decode(
-                token, self.secret_key, algorithms=[self.algorithm]
-            )
+            payload = self._decode(token)
 
             jti = payload.get("jti")
             if not jti:
                 return False
 
-            TokenBlacklist.blacklist_token(
-                db=db,
-                jti=jti,
-                token_type=payload.get("type", "unknown"),
-                expires_at=datetime.fromtimestamp(payload["exp"]),
-                user_id=payload.get("sub"),
-                reason=reason,
-                token_hash=self._hash_token(token)
-            )
+            expires_at = datetime.fromtimestamp(payload["exp"])
+            if await token_denylist.revoke(jti, expires_at):
+                return True
+
+            def write_blacklist_entry(session: Session) -> None:
+                TokenBlacklist.blacklist_token(
+                    db=session,
+                    jti=jti,
+                    token_type=payload.get("type", "unknown"),
+                    expires_at=expires_at,
+                    user_id=payload.get("sub"),
+                    reason=reason,
+                    token_hash=self._hash_token(token)
+                )
+
+            if isinstance(db, AsyncSession):
+                await db.run_sync(write_blacklist_entry)
+            else:
+                write_blacklist_entry(db)
 
             return True
 
@@ -302,7 +392,23 @@ def create_user_tokens(user_id: UUID, **kwargs) -> dict[str, Any]:
     return jwt_manager.create_token_pair(user_id, kwargs if kwargs else None)
 
 
-def verify_access_token(token: str, db: Session) -> dict[str, Any] | None:
+async def register_refresh_token(jti: str, user_id: UUID) -> bool:
+    """
+    Record a newly issued refresh token so it can later be rotated.
+
+    Args:
+        jti: Refresh token JWT ID
+        user_id: User UUID
+
+    Returns:
+        True if the token was stored in Redis
+    """
+    return await refresh_token_store.register(
+        jti, user_id, jwt_manager.refresh_token_ttl_seconds
+    )
+
+
+async def verify_access_token(token: str, db: Session) -> dict[str, Any] | None:
     """
     Verify an access token.
 
@@ -313,10 +419,10 @@ def verify_access_token(token: str, db: Session) -> dict[str, Any] | None:
     Returns:
         Token payload or None if invalid
     """
-    return jwt_manager.verify_token(token, db, expected_type="access")
+    return await jwt_manager.verify_token(token, db, expected_type="access")
 
 
-def verify_refresh_token(token: str, db: Session) -> dict[str, Any] | None:
+async def verify_refresh_token(token: str, db: Session) -> dict[str, Any] | None:
     """
     Verify a refresh token.
 
@@ -327,36 +433,40 @@ def verify_refresh_token(token: str, db: Session) -> dict[str, Any] | None:
     Returns:
         Token payload or None if invalid
     """
-    return jwt_manager.verify_token(token, db, expected_type="refresh")
+    return await jwt_manager.verify_token(token, db, expected_type="refresh")
 
 
-def refresh_access_token(refresh_token: str, db: Session) -> dict[str, Any] | None:
+async def refresh_access_token(refresh_token: str, db: Session) -> dict[str, Any] | None:
     """
-    Refresh an access token.
+    Refresh an access token, rotating the refresh token.
 
     Args:
         refresh_token: Valid refresh token
         db: Database session
 
     Returns:
-        New access token or None if refresh token is invalid
+        New token pair or None if refresh token is invalid
     """
-    return jwt_manager.refresh_access_token(refresh_token, db)
+    return await jwt_manager.refresh_access_token(refresh_token, db)
 
 
-def blacklist_token(token: str, db: Session, reason: str | None = None) -> bool:
+async def blacklist_token(
+    token: str,
+    db: Session | AsyncSession,
+    reason: str | None = None
+) -> bool:
     """
     Blacklist a token.
 
     Args:
         token: Token to blacklist
-        db: Database session
+        db: Database session (sync or async)
         reason: Reason for blacklisting
 
     Returns:
         True if successful
     """
-    return jwt_manager.blacklist_token(token, db, reason)
+    return await jwt_manager.blacklist_token(token, db, reason)
 
 
 def logout_user_all_devices(user_id: UUID, db: Session) -> int:
@@ -411,4 +521,4 @@ def generate_api_key(user_id: UUID, name: str, expires_days: int = 365) -> str:
         "token_version": 1
     }
 
-    return jwt.encode(payload, jwt_manager.secret_key, algorithm=jwt_manager.algorithm)
+    return jwt.encode(payload, jwt_manager._signing_key, algorithm=jwt_manager.algorithm)
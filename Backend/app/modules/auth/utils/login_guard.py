@@ -0,0 +1,117 @@
+"""
+Login abuse protection backed by Redis.
+
+Two cheap checks run before a login touches the database:
+
+* a per-IP fixed-window counter (``auth:rl:{ip}``) rejecting clients that
+  exceed the configured attempts per minute, and
+* a short-lived negative cache (``auth:nouser:{login}``) remembering
+  email/username values that matched no user.
+
+Lookups for unknown users still run a dummy bcrypt verification so response
+timing does not reveal whether an account exists. Without Redis every check
+is a no-op.
+"""
+
+from app.config import settings
+from app.core.redis_client import get_redis
+from app.modules.auth.utils.security import (
+    hash_password,
+    run_in_hash_pool,
+    verify_password_secure,
+)
+
+RATE_LIMIT_KEY_PREFIX = "auth:rl:"
+UNKNOWN_LOGIN_KEY_PREFIX = "auth:nouser:"
+RATE_LIMIT_WINDOW_SECONDS = 60
+
+LOGIN_RATE_LIMITED_MESSAGE = "Too many login attempts, please try again later"
+
+
+class LoginGuard:
+    """Rate limiting and unknown-login caching for authentication."""
+
+    def __init__(self) -> None:
+        self._dummy_hash: str | None = None
+
+    async def is_rate_limited(self, ip_address: str | None) -> bool:
+        """
+        Count a login attempt and check the per-IP limit.
+
+        Args:
+            ip_address: Client IP address
+
+        Returns:
+            True if the client exceeded the allowed attempts for this window
+        """
+        redis = get_redis()
+        if redis is None or not ip_address:
+            return False
+
+        key = f"{RATE_LIMIT_KEY_PREFIX}{ip_address}"
+        attempts = await redis.incr(key)
+        if attempts == 1:
+            await redis.expire(key, RATE_LIMIT_WINDOW_SECONDS)
+
+        return attempts > settings.auth_login_rate_limit_per_minute
+
+    async def is_unknown_login(self, login: str) -> bool:
+        """
+        Check whether a login recently matched no user.
+
+        Args:
+            login: Lowercased email or username
+
+        Returns:
+            True if the login is cached as unknown
+        """
+        redis = get_redis()
+        if redis is None:
+            return False
+
+        return bool(await redis.exists(f"{UNKNOWN_LOGIN_KEY_PREFIX}{login}"))
+
+    async def remember_unknown_login(self, login: str) -> None:
+        """
+        Cache a login that matched no user.
+
+        Args:
+            login: Lowercased email or username
+        """
+        redis = get_redis()
+        if redis is None:
+            return
+
+        await redis.set(
+            f"{UNKNOWN_LOGIN_KEY_PREFIX}{login}", 1, ex=settings.auth_unknown_login_cache_seconds
+        )
+
+    async def forget_unknown_logins(self, *logins: str | None) -> None:
+        """
+        Drop cached unknown logins, e.g. after a user registers with them.
+
+        Args:
+            *logins: Lowercased emails or usernames
+        """
+        redis = get_redis()
+        keys = [f"{UNKNOWN_LOGIN_KEY_PREFIX}{login}" for login in logins if login]
+        if redis is None or not keys:
+            return
+
+        await redis.delete(*keys)
+
+    async def verify_dummy_password(self, password: str) -> None:
+        """
+        Spend the same work as a real password check for an unknown user.
+
+        Args:
+            password: Submitted plain text password
+        """
+        if self._dummy_hash is None:
+            self._dummy_hash = await run_in_hash_pool(hash_password, "unknown-user-password")
+
+        await run_in_hash_pool(verify_password_secure, password, self._dummy_hash)
+
+
+# Global login guard instance
+login_guard = LoginGuard()
@@ -2,24 +2,97 @@
 Password utilities for the auth module.
 """
 
+import hashlib
 import re
+import secrets
+import string
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from uuid import UUID
 
 from app.core.utils.security import verify_password
 from app.core.utils.validators import validate_password_strength
+from app.modules.auth.utils.security import secrets_equal
+
+# Common compromised passwords (basic check), built once at import
+COMMON_PASSWORDS = frozenset({
+    'password', '123456', '123456789', 'qwerty', 'abc123',
+    'password123', 'admin', 'letmein', 'welcome', 'monkey',
+    '1234567890', 'dragon', 'master', 'hello', 'freedom'
+})
+
+# Character classes are checked against the password's set of distinct
+# characters, which is built once per password instead of rescanning it
+_LOWERCASE_CHARS = frozenset(string.ascii_lowercase)
+_UPPERCASE_CHARS = frozenset(string.ascii_uppercase)
+_SPECIAL_CHARS = frozenset('!@#$%^&*(),.?":{}|<>-_=[]\\/~`+')
+
+# Patterns are compiled once; each alternation of literals is matched in a
+# single pass over the password
+_REPEATED_RE = re.compile(r'(.)\1{2,}')
+_SEQUENCE_RE = re.compile(r'123|abc|qwe|asd')
+_COMMON_FRAGMENT_RE = re.compile(r'123|abc|qwe|asd|password|admin')
+_MIXED_CASE_RE = re.compile(r'[a-z][A-Z]|[A-Z][a-z]')
+# Same as r'\d.*[a-zA-Z]' but anchored to the first digit of each line, so a
+# failed match is linear instead of restarting at every digit
+_DIGIT_BEFORE_LETTER_RE = re.compile(r'^[^\d\n]*\d.*[a-zA-Z]', re.MULTILINE)
+_TOO_COMMON = frozenset({'password', '123456', 'admin', 'user'})
+
+# Generator alphabets (lowercase, uppercase, digits), built once with and
+# without the ambiguous characters
+_AMBIGUOUS_CHARS = str.maketrans('', '', 'loIO01')
+_GENERATOR_ALPHABETS = {
+    exclude_ambiguous: tuple(
+        alphabet.translate(_AMBIGUOUS_CHARS) if exclude_ambiguous else alphabet
+        for alphabet in (string.ascii_lowercase, string.ascii_uppercase, string.digits)
+    )
+    for exclude_ambiguous in (False, True)
+}
+_GENERATOR_SPECIAL = '!@#$%^&*(),.?":{}|<>\\-_=\\[\\]\\\\/~`+'
+
+# Recent strength results keyed by SHA-256 digest so plain text passwords
+# are never retained; validation runs in worker threads, hence the lock
+STRENGTH_CACHE_SIZE = 2048
+_strength_cache: OrderedDict[bytes, dict[str, any]] = OrderedDict()
+_strength_cache_lock = threading.Lock()
 
 
 def validate_password_strength_detailed(password: str) -> dict[str, any]:
     """
     Detailed password strength validation with scoring.
 
+    Results are memoized for repeated candidates (form retries, multi-step
+    signups); every call returns a fresh dictionary.
+
     Args:
         password: Password to validate
 
     Returns:
         Dictionary with validation results and detailed feedback
     """
+    key = hashlib.sha256(password.encode()).digest()
+    with _strength_cache_lock:
+        cached = _strength_cache.get(key)
+        if cached is not None:
+            _strength_cache.move_to_end(key)
+
+    if cached is None:
+        cached = _compute_password_strength(password)
+        with _strength_cache_lock:
+            _strength_cache[key] = cached
+            if len(_strength_cache) > STRENGTH_CACHE_SIZE:
+                _strength_cache.popitem(last=False)
+
+    return {
+        **cached,
+        "errors": list(cached["errors"]),
+        "suggestions": list(cached["suggestions"])
+    }
+
+
+def _compute_password_strength(password: str) -> dict[str, any]:
+    """Run the strength checks behind validate_password_strength_detailed."""
     is_valid, errors = validate_password_strength(password)
     score = calculate_password_strength_score(password)
 
@@ -50,35 +123,35 @@ def calculate_password_strength_score(password: str) -> int:
         score += min(25, length * 2)
 
     # Character variety scoring (up to 40 points)
-    if re.search(r'[a-z]', password):
+    chars = set(password)
+    if not _LOWERCASE_CHARS.isdisjoint(chars):
         score += 10
-    if re.search(r'[A-Z]', password):
+    if not _UPPERCASE_CHARS.isdisjoint(chars):
         score += 10
-    if re.search(r'\d', password):
+    if any(char.isdecimal() for char in chars):
         score += 10
-    if re.search(r'[!@#$%^&*(),.?":{}|<>\-_=\[\]\\\/~`+]', password):
+    if not _SPECIAL_CHARS.isdisjoint(chars):
         score += 10
 
     # Pattern complexity (up to 20 points)
     # No repeated characters
-    if not re.search(r'(.)\1{2,}', password):
+    if not _REPEATED_RE.search(password):
         score += 5
 
     # No common patterns
-    if not re.search(r'(123|abc|qwe|asd)', password.lower()):
+    if not _SEQUENCE_RE.search(password.lower()):
         score += 5
 
     # Mixed case within word
-    if re.search(r'[a-z][A-Z]|[A-Z][a-z]', password):
+    if _MIXED_CASE_RE.search(password):
         score += 5
 
     # Numbers not just at end
-    if re.search(r'\d.*[a-zA-Z]', password):
+    if _DIGIT_BEFORE_LETTER_RE.search(password):
         score += 5
 
     # Uniqueness bonus (up to 15 points)
-    unique_chars = len(set(password))
-    score += min(15, unique_chars)
+    score += min(15, len(chars))
 
     return min(100, score)
 
@@ -117,20 +190,21 @@ def get_password_suggestions(password: str, errors: list[str]) -> list[str]:
         List of improvement suggestions
     """
     suggestions = []
+    lowered = password.lower()
 
     if len(password) < 12:
         suggestions.append("Consider using at least 12 characters for better security")
 
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>\-_=\[\]\\\/~`+]', password):
+    if _SPECIAL_CHARS.isdisjoint(password):
         suggestions.append("Add special characters like !@#$%^&* for stronger security")
 
-    if re.search(r'(.)\1{2,}', password):
+    if _REPEATED_RE.search(password):
         suggestions.append("Avoid repeating the same character multiple times")
 
-    if re.search(r'(123|abc|qwe|asd|password|admin)', password.lower()):
+    if _COMMON_FRAGMENT_RE.search(lowered):
         suggestions.append("Avoid common patterns and dictionary words")
 
-    if password.lower() in ['password', '123456', 'admin', 'user']:
+    if lowered in _TOO_COMMON:
         suggestions.append("This password is too common - choose something unique")
 
     if not suggestions:
@@ -187,41 +261,23 @@ def generate_secure_password(
     Returns:
         Generated secure password
     """
-    import secrets
-    import string
-
     if length < 8:
         length = 8
 
-    # Build character sets
-    chars = ""
-    required_chars = []
-
-    if include_lowercase:
-        lowercase = string.ascii_lowercase
-        if exclude_ambiguous:
-            lowercase = lowercase.replace('l', '').replace('o', '')
-        chars += lowercase
-        required_chars.append(secrets.choice(lowercase))
-
-    if include_uppercase:
-        uppercase = string.ascii_uppercase
-        if exclude_ambiguous:
-            uppercase = uppercase.replace('I', '').replace('O', '')
-        chars += uppercase
-        required_chars.append(secrets.choice(uppercase))
-
-    if include_numbers:
-        numbers = string.digits
-        if exclude_ambiguous:
-            numbers = numbers.replace('0', '').replace('1', '')
-        chars += numbers
-        required_chars.append(secrets.choice(numbers))
-
-    if include_special:
-        special = "!@#$%^&*(),.?\":{}|<>\-_=\[\]\\\/~`+"
-        chars += special
-        required_chars.append(secrets.choice(special))
+    # Pick the prebuilt character sets
+    lowercase, uppercase, numbers = _GENERATOR_ALPHABETS[bool(exclude_ambiguous)]
+    alphabets = [
+        alphabet
+        for alphabet, included in (
+            (lowercase, include_lowercase),
+            (uppercase, include_uppercase),
+            (numbers, include_numbers),
+            (_GENERATOR_SPECIAL, include_special),
+        )
+        if included
+    ]
+    chars = ''.join(alphabets)
+    required_chars = [secrets.choice(alphabet) for alphabet in alphabets]
 
     # Generate remaining characters
     remaining_length = length - len(required_chars)
@@ -246,14 +302,7 @@ def is_password_compromised(password: str) -> bool:
     Returns:
         True if password is known to be compromised
     """
-    # Common compromised passwords (basic check)
-    common_passwords = {
-        'password', '123456', '123456789', 'qwerty', 'abc123',
-        'password123', 'admin', 'letmein', 'welcome', 'monkey',
-        '1234567890', 'dragon', 'master', 'hello', 'freedom'
-    }
-
-    return password.lower() in common_passwords
+    return password.strip().lower() in COMMON_PASSWORDS
 
 
 def get_password_age_warning(last_changed: datetime, max_age_days: int = 90) -> str | None:
@@ -309,7 +358,7 @@ def validate_password_change(
         return result
 
     # Check if new password is same as current
-    if current_password == new_password:
+    if secrets_equal(current_password, new_password):
         result["is_valid"] = False
         result["errors"].append("New password must be different from current password")
 
@@ -0,0 +1,108 @@
+"""
+In-process cache of user profile snapshots.
+
+Profiles are cached as ``UserResponse`` snapshots rather than ORM objects so
+they can be shared safely between requests and sessions. Entries expire
+after a short TTL and are dropped on every user write. When Redis is
+configured, invalidations are also published on a pub/sub channel so other
+workers drop their copy immediately.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from app.core.redis_client import get_redis
+from app.modules.auth.schemas.user import UserResponse
+
+logger = logging.getLogger(__name__)
+
+PROFILE_CACHE_SIZE = 10_000
+PROFILE_CACHE_TTL_SECONDS = 60
+INVALIDATION_CHANNEL = "auth:profile:invalidate"
+
+
+class ProfileCache:
+    """LRU cache of user profiles with TTL and cross-worker invalidation."""
+
+    def __init__(self, maxsize: int = PROFILE_CACHE_SIZE, ttl: float = PROFILE_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[UUID, tuple[float, UserResponse]] = OrderedDict()
+
+    def get(self, user_id: UUID) -> UserResponse | None:
+        """
+        Get a cached profile.
+
+        Args:
+            user_id: User UUID
+
+        Returns:
+            Cached profile or None if missing or expired
+        """
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+
+        expires_at, profile = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return None
+
+        self._entries.move_to_end(user_id)
+        return profile
+
+    def set(self, user_id: UUID, profile: UserResponse) -> None:
+        """
+        Cache a profile.
+
+        Args:
+            user_id: User UUID
+            profile: Profile snapshot
+        """
+        self._entries[user_id] = (time.monotonic() + self.ttl, profile)
+        self._entries.move_to_end(user_id)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, user_id: UUID) -> None:
+        """Drop a profile from this worker's cache."""
+        self._entries.pop(user_id, None)
+
+    async def invalidate(self, user_id: UUID) -> None:
+        """
+        Drop a profile here and on every other worker.
+
+        Args:
+            user_id: User UUID
+        """
+        self.discard(user_id)
+
+        redis = get_redis()
+        if redis is not None:
+            await redis.publish(INVALIDATION_CHANNEL, str(user_id))
+
+    async def run_listener(self) -> None:
+        """Drop profiles invalidated by other workers until cancelled."""
+        redis = get_redis()
+        if redis is None:
+            return
+
+        while True:
+            try:
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.discard(UUID(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Profile cache invalidation listener failed: {e}")
+                await asyncio.sleep(1)
+
+
+# Global profile cache instance
+profile_cache = ProfileCache()
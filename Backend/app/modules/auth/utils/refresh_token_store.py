@@ -0,0 +1,87 @@
+"""
+Refresh token rotation backed by Redis.
+
+Each issued refresh token is stored as ``refresh:{jti}`` holding the user ID
+until the token expires. Rotation runs as a single Lua script so looking up,
+consuming and replacing a refresh token is one atomic round-trip; a refresh
+token can therefore only be exchanged once.
+"""
+
+from uuid import UUID
+
+from redis.commands.core import AsyncScript
+
+from app.core.redis_client import get_redis
+
+REFRESH_KEY_PREFIX = "refresh:"
+
+# KEYS[1] = old refresh key, KEYS[2] = new refresh key, ARGV[1] = TTL seconds
+ROTATE_REFRESH_TOKEN_SCRIPT = """
+local uid = redis.call('GET', KEYS[1])
+if not uid then
+    return nil
+end
+redis.call('DEL', KEYS[1])
+redis.call('SET', KEYS[2], uid, 'EX', ARGV[1])
+return uid
+"""
+
+
+class RefreshTokenStore:
+    """Redis store for active refresh token IDs."""
+
+    def __init__(self):
+        self._rotate_script: AsyncScript | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether Redis is configured for refresh token storage."""
+        return get_redis() is not None
+
+    async def register(self, jti: str, user_id: UUID, ttl_seconds: int) -> bool:
+        """
+        Store a newly issued refresh token.
+
+        Args:
+            jti: Refresh token JWT ID
+            user_id: Owner of the token
+            ttl_seconds: Token lifetime in seconds
+
+        Returns:
+            True if the token was stored in Redis
+        """
+        redis = get_redis()
+        if redis is None:
+            return False
+
+        await redis.set(f"{REFRESH_KEY_PREFIX}{jti}", str(user_id), ex=ttl_seconds)
+        return True
+
+    async def rotate(self, old_jti: str, new_jti: str, ttl_seconds: int) -> str | None:
+        """
+        Atomically consume a refresh token and store its replacement.
+
+        Args:
+            old_jti: JWT ID of the refresh token being exchanged
+            new_jti: JWT ID of the replacement refresh token
+            ttl_seconds: Lifetime of the replacement token in seconds
+
+        Returns:
+            Owning user ID, or None if the old token is unknown or already used
+        """
+        redis = get_redis()
+        if redis is None:
+            return None
+
+        # register_script uses EVALSHA and loads the script on first use
+        if self._rotate_script is None:
+            self._rotate_script = redis.register_script(ROTATE_REFRESH_TOKEN_SCRIPT)
+
+        return await self._rotate_script(
+            keys=[f"{REFRESH_KEY_PREFIX}{old_jti}", f"{REFRESH_KEY_PREFIX}{new_jti}"],
+            args=[ttl_seconds]
+        )
+
+
+# Global refresh token store instance
+refresh_token_store = RefreshTokenStore()
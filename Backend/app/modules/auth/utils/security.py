@@ -2,9 +2,17 @@
 Auth module security utilities.
 """
 
+import asyncio
+import hashlib
+import hmac
+import os
 import secrets
 import string
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import partial
+from typing import TypeVar
 from uuid import UUID
 
 from app.config import settings
@@ -15,6 +23,17 @@ from app.core.utils.security import (
     verify_password,
 )
 
+T = TypeVar("T")
+
+# bcrypt releases the GIL, so a thread pool sized to the CPU count hashes in
+# parallel; the semaphore queues excess callers on the event loop instead of
+# piling work up inside the executor. Both are created on first use so a
+# shut-down pool or a closed event loop is never reused.
+HASH_POOL_SIZE = os.cpu_count() or 1
+_hash_pool: ThreadPoolExecutor | None = None
+_hash_semaphore: asyncio.Semaphore | None = None
+_hash_semaphore_loop: asyncio.AbstractEventLoop | None = None
+
 
 def generate_verification_token() -> str:
     """
@@ -80,6 +99,57 @@ def verify_password_secure(plain_password: str, hashed_password: str) -> bool:
     return True
 
 
+def secrets_equal(first: str, second: str) -> bool:
+    """
+    Compare two secrets in constant time.
+
+    Args:
+        first: First secret
+        second: Second secret
+
+    Returns:
+        True if both secrets are equal
+    """
+    # compare_digest only accepts ASCII str, so compare the UTF-8 bytes
+    return hmac.compare_digest(first.encode(), second.encode())
+
+
+async def run_in_hash_pool(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run a password hashing or verification function off the event loop.
+
+    Args:
+        func: CPU-bound callable, e.g. ``hash_password``
+        *args: Positional arguments for ``func``
+        **kwargs: Keyword arguments for ``func``
+
+    Returns:
+        Result of ``func``
+    """
+    global _hash_pool, _hash_semaphore, _hash_semaphore_loop
+
+    loop = asyncio.get_running_loop()
+    if _hash_semaphore is None or _hash_semaphore_loop is not loop:
+        _hash_semaphore = asyncio.Semaphore(HASH_POOL_SIZE)
+        _hash_semaphore_loop = loop
+
+    async with _hash_semaphore:
+        if _hash_pool is None:
+            _hash_pool = ThreadPoolExecutor(max_workers=HASH_POOL_SIZE, thread_name_prefix="password-hash")
+        return await loop.run_in_executor(_hash_pool, partial(func, *args, **kwargs))
+
+
+def shutdown_hash_pool() -> None:
+    """Stop the password hashing worker threads; the next call starts a new pool."""
+    global _hash_pool, _hash_semaphore, _hash_semaphore_loop
+
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+    _hash_pool = None
+    _hash_semaphore = None
+    _hash_semaphore_loop = None
+
+
 def create_user_tokens(user_id: UUID) -> dict[str, str]:
     """
     Create access and refresh tokens for a user.
@@ -90,8 +160,9 @@ def create_user_tokens(user_id: UUID) -> dict[str, str]:
     Returns:
         Dictionary containing access_token and refresh_token
     """
-    access_token = create_access_token(subject=str(user_id))
-    refresh_token = create_refresh_token(subject=str(user_id))
+    subject = str(user_id)
+    access_token = create_access_token(subject=subject)
+    refresh_token = create_refresh_token(subject=subject)
 
     return {
         "access_token": access_token,
@@ -100,6 +171,33 @@ def create_user_tokens(user_id: UUID) -> dict[str, str]:
     }
 
 
+def _random_chars(alphabet: str, count: int) -> list[str]:
+    """
+    Draw characters uniformly from an alphabet using batched random bytes.
+
+    Bytes at or above the largest multiple of the alphabet size are
+    rejected so the modulo does not bias the result.
+
+    Args:
+        alphabet: Characters to draw from (at most 256)
+        count: Number of characters to draw
+
+    Returns:
+        List of random characters
+    """
+    size = len(alphabet)
+    limit = 256 // size * size
+    chars: list[str] = []
+    while len(chars) < count:
+        # Twice the needed bytes almost always covers the rejected ones
+        for byte in secrets.token_bytes((count - len(chars)) * 2):
+            if byte < limit:
+                chars.append(alphabet[byte % size])
+                if len(chars) == count:
+                    break
+    return chars
+
+
 def generate_secure_random_password(length: int = 12) -> str:
     """
     Generate a secure random password.
@@ -130,8 +228,7 @@ def generate_secure_random_password(length: int = 12) -> str:
     all_chars = string.ascii_letters + string.digits + "!@#$%^&*(),.?\":{}|<>"
     remaining_length = length - len(password_chars)
 
-    for _ in range(remaining_length):
-        password_chars.append(secrets.choice(all_chars))
+    password_chars.extend(_random_chars(all_chars, remaining_length))
 
     # Shuffle the password characters
     secrets.SystemRandom().shuffle(password_chars)
@@ -165,29 +262,6 @@ def get_token_expiry_time(hours: int) -> datetime:
     return datetime.utcnow() + timedelta(hours=hours)
 
 
-def mask_email(email: str) -> str:
-    """
-    Mask an email address for security/privacy.
-
-    Args:
-        email: Email address to mask
-
-    Returns:
-        Masked email address
-    """
-    if '@' not in email:
-        return email
-
-    local, domain = email.split('@', 1)
-
-    if len(local) <= 2:
-        masked_local = local[0] + '*'
-    else:
-        masked_local = local[0] + '*' * (len(local) - 2) + local[-1]
-
-    return f"{masked_local}@{domain}"
-
-
 def generate_device_fingerprint(user_agent: str | None, ip_address: str | None) -> str:
     """
     Generate a device fingerprint for session tracking.
@@ -199,7 +273,7 @@ def generate_device_fingerprint(user_agent: str | None, ip_address: str | None)
     Returns:
         Device fingerprint hash
     """
-    import hashlib
-
     fingerprint_data = f"{user_agent or 'unknown'}:{ip_address or 'unknown'}"
-    return hashlib.sha256(fingerprint_data.encode()).hexdigest()[:16]
+    # An 8-byte BLAKE2b digest gives the same 16 hex characters without
+    # computing and discarding half of a SHA-256 digest
+    return hashlib.blake2b(fingerprint_data.encode(), digest_size=8).hexdigest()
@@ -3,6 +3,7 @@ Startup utilities for auth module.
 """
 
 import logging
+from sqlalchemy import case, update
 from sqlalchemy.orm import Session
 
 from app.config import settings
@@ -29,20 +30,25 @@ async def create_default_admin_user(db: Session) -> User | None:
         logger.info("Default admin creation is disabled")
         return None
     
-    # Check if admin user already exists
-    existing_admin = db.query(User).filter(
-        User.email == settings.default_admin_email
-    ).first()
+    # Ensure an existing user is an admin in a single round trip. Postgres
+    # evaluates the CASE expressions against the old row, so a user who is
+    # already an admin keeps their current status flags.
+    already_admin = User.role == UserRole.ADMIN
+    existing_admin = db.execute(
+        update(User)
+        .where(User.email == settings.default_admin_email)
+        .values(
+            role=UserRole.ADMIN,
+            is_active=case((already_admin, User.is_active), else_=True),
+            email_verified=case((already_admin, User.email_verified), else_=True),
+        )
+        .returning(User)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
     
     if existing_admin:
         logger.info(f"Default admin user already exists: {existing_admin.email}")
-        # Ensure the user is an admin
-        if not existing_admin.is_admin():
-            existing_admin.make_admin()
-            existing_admin.activate()
-            existing_admin.verify_email()
-            db.commit()
-            logger.info(f"Promoted existing user to admin: {existing_admin.email}")
+        db.commit()
         return existing_admin
     
     # Create new admin user directly (bypass email validation)
@@ -0,0 +1,135 @@
+"""
+Revoked JWT lookup backed by Redis with an in-process bloom prefilter.
+
+Revoked token IDs are stored in Redis as ``jwt:bl:{jti}`` keys that expire
+together with the token. Every worker keeps a bloom filter of known revoked
+IDs so the common case (token not revoked) is answered without a network
+round-trip. The filter is rebuilt from Redis periodically; a token revoked
+on another worker is therefore picked up within one refresh interval.
+
+When Redis is not configured the database blacklist table is used instead.
+"""
+
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.core.redis_client import get_redis
+from app.modules.auth.models.token_blacklist import TokenBlacklist
+
+logger = logging.getLogger(__name__)
+
+DENYLIST_KEY_PREFIX = "jwt:bl:"
+BLOOM_REFRESH_INTERVAL_SECONDS = 30
+
+
+class JTIBloomFilter:
+    """Small fixed-size bloom filter for JWT IDs."""
+
+    def __init__(self, size_bits: int = 1 << 20, hash_count: int = 4):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self._bits = bytearray(size_bits // 8)
+
+    def _positions(self, value: str) -> list[int]:
+        digest = hashlib.blake2b(value.encode(), digest_size=4 * self.hash_count).digest()
+        return [
+            int.from_bytes(digest[i * 4:(i + 1) * 4], "little") % self.size_bits
+            for i in range(self.hash_count)
+        ]
+
+    def add(self, value: str) -> None:
+        """Add a value to the filter."""
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+class TokenDenylist:
+    """Revoked token store with Redis storage and a local bloom prefilter."""
+
+    def __init__(self):
+        self._bloom = JTIBloomFilter()
+        self._revoked_during_refresh: set[str] | None = None
+
+    async def revoke(self, jti: str, expires_at: datetime) -> bool:
+        """
+        Mark a token ID as revoked until it expires.
+
+        Args:
+            jti: JWT ID
+            expires_at: Token expiration time
+
+        Returns:
+            True if the revocation was stored in Redis
+        """
+        redis = get_redis()
+        if redis is None:
+            return False
+
+        await redis.set(
+            f"{DENYLIST_KEY_PREFIX}{jti}", 1, exat=int(expires_at.timestamp())
+        )
+        self._bloom.add(jti)
+        if self._revoked_during_refresh is not None:
+            self._revoked_during_refresh.add(jti)
+        return True
+
+    async def is_revoked(self, jti: str, db: Session) -> bool:
+        """
+        Check whether a token ID has been revoked.
+
+        Args:
+            jti: JWT ID
+            db: Database session (used when Redis is not configured)
+
+        Returns:
+            True if the token is revoked
+        """
+        redis = get_redis()
+        if redis is None:
+            return TokenBlacklist.is_token_blacklisted(db, jti)
+
+        if jti not in self._bloom:
+            return False
+
+        return bool(await redis.exists(f"{DENYLIST_KEY_PREFIX}{jti}"))
+
+    async def refresh(self) -> None:
+        """Rebuild the bloom filter from the revoked IDs stored in Redis."""
+        redis = get_redis()
+        if redis is None:
+            return
+
+        bloom = JTIBloomFilter(self._bloom.size_bits, self._bloom.hash_count)
+        self._revoked_during_refresh = set()
+        try:
+            async for key in redis.scan_iter(match=f"{DENYLIST_KEY_PREFIX}*", count=1000):
+                bloom.add(key[len(DENYLIST_KEY_PREFIX):])
+            # SCAN may miss keys written while it runs; keep local revocations
+            for jti in self._revoked_during_refresh:
+                bloom.add(jti)
+            self._bloom = bloom
+        finally:
+            self._revoked_during_refresh = None
+
+    async def run_refresher(self, interval: int = BLOOM_REFRESH_INTERVAL_SECONDS) -> None:
+        """Periodically refresh the bloom filter until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Failed to refresh token denylist filter: {e}")
+            await asyncio.sleep(interval)
+
+
+# Global denylist instance
+token_denylist = TokenDenylist()
@@ -1,29 +1,70 @@
 """
 Dependencies for the expenses module.
+
+Households and memberships resolved by these dependencies are kept on
+``request.state`` so a chain of them issues each lookup only once.
 """
 
 from typing import Optional
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.modules.auth.dependencies import get_current_user
 from app.modules.auth.models.user import User
 from app.modules.expenses.services import HouseholdService
-from app.modules.expenses.models import Household, UserHousehold
+from app.modules.expenses.models import Household, UserHousehold, UserHouseholdRole
+
+
+def _request_cache(request: Request) -> dict:
+    """Get the per-request cache shared by the household dependencies."""
+    cache = getattr(request.state, "household_cache", None)
+    if cache is None:
+        cache = {}
+        request.state.household_cache = cache
+    return cache
+
+
+async def _get_cached_membership(
+    request: Request,
+    household_service: HouseholdService,
+    user_id: UUID,
+    household_id: UUID
+) -> Optional[UserHousehold]:
+    """Load the user's active membership once per request."""
+    cache = _request_cache(request)
+    key = ("membership", user_id, household_id)
+    if key not in cache:
+        cache[key] = await household_service.get_membership_if_authorized(
+            user_id=user_id,
+            household_id=household_id
+        )
+    return cache[key]
+
+
+def get_household_service(db: Session = Depends(get_db)) -> HouseholdService:
+    """Get household service dependency."""
+    return HouseholdService(db)
 
 
 async def get_household_or_404(
     household_id: UUID,
+    request: Request,
     db: Session = Depends(get_db)
 ) -> Household:
     """Get household by ID or raise 404."""
-    household = db.query(Household).filter(
-        Household.id == household_id,
-        Household.is_active == True
-    ).first()
+    cache = _request_cache(request)
+    key = ("household", household_id)
+    household = cache.get(key)
+    if household is None:
+        household = db.query(Household).filter(
+            Household.id == household_id,
+            Household.is_active == True
+        ).first()
+        cache[key] = household
     
     if not household:
         raise HTTPException(
@@ -36,15 +77,14 @@ async def get_household_or_404(
 
 async def get_user_household_membership(
     household_id: UUID,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    household_service: HouseholdService = Depends(get_household_service)
 ) -> UserHousehold:
     """Get user's household membership or raise 403."""
-    membership = db.query(UserHousehold).filter(
-        UserHousehold.household_id == household_id,
-        UserHousehold.user_id == current_user.id,
-        UserHousehold.is_active == True
-    ).first()
+    membership = await _get_cached_membership(
+        request, household_service, current_user.id, household_id
+    )
     
     if not membership:
         raise HTTPException(
@@ -57,54 +97,44 @@ async def get_user_household_membership(
 
 async def require_household_admin(
     household_id: UUID,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    household_service: HouseholdService = Depends(lambda db=Depends(get_db): HouseholdService(db))
+    household_service: HouseholdService = Depends(get_household_service)
 ) -> UserHousehold:
     """Require user to be admin of the household."""
-    has_permission = await household_service.check_user_permission(
-        user_id=current_user.id,
-        household_id=household_id,
-        required_role="admin"
+    membership = await _get_cached_membership(
+        request, household_service, current_user.id, household_id
     )
     
-    if not has_permission:
+    if not membership or membership.role != UserHouseholdRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required for this operation"
         )
     
-    # Return the membership for further use
-    membership = await get_user_household_membership(household_id, current_user)
     return membership
 
 
 async def require_household_member(
     household_id: UUID,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    household_service: HouseholdService = Depends(lambda db=Depends(get_db): HouseholdService(db))
+    household_service: HouseholdService = Depends(get_household_service)
 ) -> UserHousehold:
     """Require user to be a member of the household."""
-    has_permission = await household_service.check_user_permission(
-        user_id=current_user.id,
-        household_id=household_id
+    membership = await _get_cached_membership(
+        request, household_service, current_user.id, household_id
     )
     
-    if not has_permission:
+    if not membership:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You must be a member of this household"
         )
     
-    # Return the membership for further use
-    membership = await get_user_household_membership(household_id, current_user)
     return membership
 
 
-def get_household_service(db: Session = Depends(get_db)) -> HouseholdService:
-    """Get household service dependency."""
-    return HouseholdService(db)
-
-
 def get_expense_service(db: Session = Depends(get_db)):
     """Get expense service dependency."""
     from app.modules.expenses.services import ExpenseService
@@ -117,7 +147,7 @@ def get_splitting_service(db: Session = Depends(get_db)):
     return SplittingService(db)
 
 
-def get_analytics_service(db: Session = Depends(get_db)):
+def get_analytics_service(db: AsyncSession = Depends(get_async_db)):
     """Get analytics service dependency."""
     from app.modules.expenses.services import AnalyticsService
     return AnalyticsService(db) 
\ No newline at end of file
@@ -12,6 +12,7 @@ from .expense import Expense
 from .expense_share import ExpenseShare
 from .payment import Payment, PaymentType, PaymentMethod
 from .expense_share_payment import ExpenseSharePayment
+from .expense_monthly_rollup import ExpenseMonthlyRollup
 
 __all__ = [
     "User",  # Make User available for relationships
@@ -25,4 +26,5 @@ __all__ = [
     "PaymentType", 
     "PaymentMethod",
     "ExpenseSharePayment",
+    "ExpenseMonthlyRollup",
 ]
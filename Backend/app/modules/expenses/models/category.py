@@ -58,7 +58,8 @@ class Category(BaseModel, NameMixin, ActiveMixin):
         back_populates="category"
     )
     
-    def __repr__(self) -> str:
+    def describe(self) -> str:
+        """Get a detailed description of the record for debugging."""
         scope = "global" if self.household_id is None else f"household:{self.household_id}"
         return f"<Category(id={self.id}, name='{self.name}', scope='{scope}')>"
     
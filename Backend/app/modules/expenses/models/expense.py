@@ -4,17 +4,26 @@ Expense model for expenses module.
 
 from datetime import date, datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
+from uuid import UUID as PyUUID
 
-from sqlalchemy import Column, String, Text, Date, DECIMAL, ForeignKey
+from sqlalchemy import Column, String, Text, Date, DECIMAL, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 from sqlalchemy.types import TypeDecorator, TEXT
 
 from app.core.models.base import BaseModel
+from app.core.utils.helpers import format_amount, to_cents, to_decimal, to_uuid
 from app.core.models.mixins import ActiveMixin
 
 
+class ShareStats(NamedTuple):
+    """Aggregates over the active shares of an expense."""
+
+    total: Decimal
+    paid: int
+    unpaid: int
+
 
 class Expense(BaseModel, ActiveMixin):
     """Expense model for tracking household expenses."""
@@ -25,8 +34,7 @@ class Expense(BaseModel, ActiveMixin):
     household_id = Column(
         UUID(as_uuid=True),
         ForeignKey("households.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     
     # User who created the expense
@@ -115,37 +123,60 @@ class Expense(BaseModel, ActiveMixin):
         cascade="all, delete-orphan"
     )
     
-    def __repr__(self) -> str:
+    __table_args__ = (
+        Index(
+            'ix_expenses_household_active_date',
+            'household_id',
+            'is_active',
+            'expense_date',
+            'category_id'
+        ),
+        Index('ix_expenses_household_updated', 'household_id', 'updated_at'),
+    )
+    
+    def describe(self) -> str:
+        """Get a detailed description of the record for debugging."""
         return f"<Expense(id={self.id}, title='{self.title}', amount={self.amount} {self.currency})>"
     
     @property
     def amount_decimal(self) -> Decimal:
         """Get the amount as a Decimal object."""
-        return Decimal(str(self.amount))
+        return to_decimal(self.amount)
     
     @property
     def formatted_amount(self) -> str:
         """Get formatted amount with currency symbol."""
-        currency_symbols = {
-            "USD": "$",
-            "EUR": "€",
-            "GBP": "£",
-            "JPY": "¥",
-            "CAD": "C$",
-            "AUD": "A$",
-        }
-        symbol = currency_symbols.get(self.currency, self.currency)
-        return f"{symbol}{self.amount:.2f}"
+        return format_amount(self.amount, self.currency)
+    
+    def share_stats(self) -> ShareStats:
+        """
+        Aggregate the active shares in a single pass.
+
+        Not memoized: shares are paid in place, so a cached result would go
+        stale. Callers needing several aggregates should call this once.
+        """
+        total = Decimal(0)
+        paid = 0
+        unpaid = 0
+        for share in self.shares:
+            if not share.is_active:
+                continue
+            total += to_decimal(share.share_amount)
+            if share.is_paid:
+                paid += 1
+            else:
+                unpaid += 1
+        return ShareStats(total, paid, unpaid)
     
     @property
     def total_shares_amount(self) -> Decimal:
         """Get the total amount of all shares."""
-        return sum(Decimal(str(share.share_amount)) for share in self.shares if share.is_active)
+        return self.share_stats().total
     
     @property
     def is_fully_shared(self) -> bool:
         """Check if the expense is fully allocated to shares."""
-        return abs(self.amount_decimal - self.total_shares_amount) < Decimal('0.01')
+        return to_cents(self.amount) == to_cents(self.total_shares_amount)
     
     @property
     def remaining_amount(self) -> Decimal:
@@ -155,12 +186,12 @@ class Expense(BaseModel, ActiveMixin):
     @property
     def paid_shares_count(self) -> int:
         """Get the number of shares that have been paid."""
-        return len([share for share in self.shares if share.is_active and share.is_paid])
+        return self.share_stats().paid
     
     @property
     def unpaid_shares_count(self) -> int:
         """Get the number of shares that haven't been paid."""
-        return len([share for share in self.shares if share.is_active and not share.is_paid])
+        return self.share_stats().unpaid
     
     @property
     def is_fully_paid(self) -> bool:
@@ -191,10 +222,29 @@ class Expense(BaseModel, ActiveMixin):
         """Remove the receipt from this expense."""
         self.receipt_url = None
     
-    def get_share_for_user(self, user_id: str):
+    def shares_by_user(self) -> dict:
+        """
+        Map user IDs to their active share in a single pass.
+
+        Build this once when looking up shares for several users; load
+        ``ExpenseShare.user_household`` eagerly to avoid a query per share.
+        """
+        return {
+            share.user_household.user_id: share
+            for share in self.shares
+            if share.is_active
+        }
+    
+    def get_share_for_user(self, user_id: PyUUID | str):
         """Get the expense share for a specific user."""
+        try:
+            user_id = to_uuid(user_id)
+        except ValueError:
+            return None
         for share in self.shares:
-            if share.user_household.user_id == user_id and share.is_active:
+            # Check the loaded flag first so inactive shares never touch
+            # the user_household relationship
+            if share.is_active and share.user_household.user_id == user_id:
                 return share
         return None
     
@@ -0,0 +1,132 @@
+"""
+ExpenseMonthlyRollup model for precomputed monthly spending totals.
+"""
+
+from datetime import date
+from decimal import Decimal
+from uuid import UUID as PyUUID
+
+from sqlalchemy import DECIMAL, Column, Date, ForeignKey, Integer, event, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.utils.helpers import to_decimal
+from app.database import Base
+
+from .expense import Expense
+
+# Primary key stand-ins for expenses without a category or creator
+NO_CATEGORY = PyUUID(int=0)
+NO_USER = PyUUID(int=0)
+
+# Expense attributes that decide which bucket an expense counts towards
+_BUCKET_ATTRIBUTES = ("household_id", "expense_date", "category_id", "created_by", "amount", "is_active")
+
+
+class ExpenseMonthlyRollup(Base):
+    """Active expense totals per household, month, category and creator."""
+
+    __tablename__ = "expense_monthly_rollups"
+
+    household_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("households.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # First day of the month
+    month = Column(Date, primary_key=True)
+
+    # NO_CATEGORY / NO_USER when the expense has none; not foreign keys so
+    # buckets survive category and user deletion
+    category_id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+
+    total_amount = Column(
+        DECIMAL(precision=12, scale=2),
+        nullable=False,
+        default=Decimal("0")
+    )
+
+    expense_count = Column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ExpenseMonthlyRollup(household_id={self.household_id}, month={self.month}, "
+            f"total={self.total_amount}, count={self.expense_count})>"
+        )
+
+
+def _add_to_bucket(connection, values: dict, sign: int) -> None:
+    """Add (or with sign=-1 subtract) one expense to its monthly bucket."""
+    if not values["is_active"] or values["household_id"] is None or values["expense_date"] is None:
+        return
+
+    expense_date: date = values["expense_date"]
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(ExpenseMonthlyRollup).values(
+        household_id=values["household_id"],
+        month=expense_date.replace(day=1),
+        category_id=values["category_id"] or NO_CATEGORY,
+        user_id=values["created_by"] or NO_USER,
+        total_amount=to_decimal(values["amount"]) * sign,
+        expense_count=sign
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["household_id", "month", "category_id", "user_id"],
+        set_={
+            "total_amount": ExpenseMonthlyRollup.total_amount + stmt.excluded.total_amount,
+            "expense_count": ExpenseMonthlyRollup.expense_count + stmt.excluded.expense_count
+        }
+    )
+    connection.execute(stmt)
+
+
+def _current_values(expense: Expense) -> dict:
+    return {name: getattr(expense, name) for name in _BUCKET_ATTRIBUTES}
+
+
+def _committed_values(expense: Expense) -> dict:
+    # Bucket attributes keep active history, so a changed attribute always
+    # has its previous value in history.deleted
+    values = {}
+    attrs = inspect(expense).attrs
+    for name in _BUCKET_ATTRIBUTES:
+        history = attrs[name].history
+        values[name] = history.deleted[0] if history.deleted else getattr(expense, name)
+    return values
+
+
+def _track_previous_value(expense: Expense, value, oldvalue, initiator) -> None:
+    pass
+
+
+# active_history loads the previous value before a bucket attribute is
+# replaced, even when it was expired or never loaded, so updates can take
+# the expense out of its old bucket
+for _name in _BUCKET_ATTRIBUTES:
+    event.listen(getattr(Expense, _name), "set", _track_previous_value, active_history=True)
+
+
+@event.listens_for(Expense, "after_insert")
+def _rollup_expense_insert(mapper, connection, expense: Expense) -> None:
+    _add_to_bucket(connection, _current_values(expense), 1)
+
+
+@event.listens_for(Expense, "after_update")
+def _rollup_expense_update(mapper, connection, expense: Expense) -> None:
+    attrs = inspect(expense).attrs
+    if not any(attrs[name].history.has_changes() for name in _BUCKET_ATTRIBUTES):
+        return
+
+    _add_to_bucket(connection, _committed_values(expense), -1)
+    _add_to_bucket(connection, _current_values(expense), 1)
+
+
+@event.listens_for(Expense, "after_delete")
+def _rollup_expense_delete(mapper, connection, expense: Expense) -> None:
+    _add_to_bucket(connection, _committed_values(expense), -1)
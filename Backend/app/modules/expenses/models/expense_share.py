@@ -2,17 +2,32 @@
 ExpenseShare model for expenses module.
 """
 
-from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
-from sqlalchemy import Column, String, DECIMAL, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, DECIMAL, Boolean, DateTime, ForeignKey, Index, select, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 from app.core.models.base import BaseModel
+from app.core.utils.helpers import (
+    divide_amount,
+    format_amount,
+    percentage_of,
+    request_now,
+    split_amount_equally,
+    to_decimal,
+)
 from app.core.models.mixins import ActiveMixin
 
+from .expense import Expense
+
+
+def _expense_currency(context) -> str:
+    """Default a share's currency to its expense's when not set explicitly."""
+    expense_id = context.get_current_parameters()["expense_id"]
+    return context.connection.scalar(select(Expense.currency).where(Expense.id == expense_id))
+
 
 class ExpenseShare(BaseModel, ActiveMixin):
     """ExpenseShare model for tracking how expenses are split between users."""
@@ -31,8 +46,7 @@ class ExpenseShare(BaseModel, ActiveMixin):
     user_household_id = Column(
         UUID(as_uuid=True),
         ForeignKey("user_households.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     
     # Share amount (the actual amount this user owes)
@@ -42,6 +56,13 @@ class ExpenseShare(BaseModel, ActiveMixin):
         index=True
     )
     
+    # Copy of the expense currency so formatting a share needs no join
+    currency = Column(
+        String(3),
+        nullable=False,
+        default=_expense_currency
+    )
+    
     # Optional: share percentage (for percentage-based splits)
     share_percentage = Column(
         DECIMAL(precision=5, scale=2),  # 0.00 to 100.00
@@ -52,15 +73,13 @@ class ExpenseShare(BaseModel, ActiveMixin):
     is_paid = Column(
         Boolean,
         default=False,
-        nullable=False,
-        index=True
+        nullable=False
     )
     
     # When the share was paid
     paid_at = Column(
         DateTime,
-        nullable=True,
-        index=True
+        nullable=True
     )
     
     # Optional payment method
@@ -92,37 +111,49 @@ class ExpenseShare(BaseModel, ActiveMixin):
         cascade="all, delete-orphan"
     )
     
-    def __repr__(self) -> str:
+    # Balance and reimbursement queries look up unpaid active shares by
+    # member or by expense; paid shares make up most of the table, so the
+    # partial indexes stay small
+    __table_args__ = (
+        Index('ix_expense_shares_user_household_expense', 'user_household_id', 'expense_id'),
+        Index(
+            'ix_expense_shares_unpaid_user_household',
+            'user_household_id',
+            postgresql_where=text('NOT is_paid AND is_active')
+        ),
+        Index(
+            'ix_expense_shares_unpaid_expense',
+            'expense_id',
+            postgresql_where=text('NOT is_paid AND is_active')
+        ),
+        Index(
+            'ix_expense_shares_paid_at',
+            'paid_at',
+            postgresql_where=text('paid_at IS NOT NULL')
+        ),
+    )
+    
+    def describe(self) -> str:
+        """Get a detailed description of the record for debugging."""
         status = "paid" if self.is_paid else "unpaid"
         return f"<ExpenseShare(expense_id={self.expense_id}, user_household_id={self.user_household_id}, amount={self.share_amount}, status={status})>"
     
     @property
     def share_amount_decimal(self) -> Decimal:
         """Get the share amount as a Decimal object."""
-        return Decimal(str(self.share_amount))
+        return to_decimal(self.share_amount)
     
     @property
     def share_percentage_decimal(self) -> Optional[Decimal]:
         """Get the share percentage as a Decimal object."""
         if self.share_percentage is not None:
-            return Decimal(str(self.share_percentage))
+            return to_decimal(self.share_percentage)
         return None
     
     @property
     def formatted_amount(self) -> str:
         """Get formatted share amount with currency symbol."""
-        if self.expense:
-            currency_symbols = {
-                "USD": "$",
-                "EUR": "€",
-                "GBP": "£",
-                "JPY": "¥",
-                "CAD": "C$",
-                "AUD": "A$",
-            }
-            symbol = currency_symbols.get(self.expense.currency, self.expense.currency)
-            return f"{symbol}{self.share_amount:.2f}"
-        return f"${self.share_amount:.2f}"
+        return format_amount(self.share_amount, self.currency or "USD")
     
     @property
     def user_display_name(self) -> str:
@@ -149,7 +180,7 @@ class ExpenseShare(BaseModel, ActiveMixin):
     def days_since_expense(self) -> int:
         """Get the number of days since the expense was created."""
         if self.expense:
-            delta = datetime.utcnow().date() - self.expense.expense_date
+            delta = request_now().date() - self.expense.expense_date
             return delta.days
         return 0
     
@@ -157,14 +188,15 @@ class ExpenseShare(BaseModel, ActiveMixin):
     def days_since_paid(self) -> Optional[int]:
         """Get the number of days since this share was paid."""
         if self.paid_at:
-            delta = datetime.utcnow() - self.paid_at
-            return delta.days
+            # A share paid after the request time was pinned is paid today
+            delta = request_now() - self.paid_at
+            return max(delta.days, 0)
         return None
     
     def mark_as_paid(self, payment_method: Optional[str] = None, payment_notes: Optional[str] = None) -> None:
         """Mark this share as paid."""
         self.is_paid = True
-        self.paid_at = datetime.utcnow()
+        self.paid_at = request_now()
         if payment_method:
             self.payment_method = payment_method
         if payment_notes:
@@ -194,13 +226,21 @@ class ExpenseShare(BaseModel, ActiveMixin):
         self.payment_notes = notes
     
     @classmethod
-    def create_share(cls, expense_id: str, user_household_id: str, share_amount: Decimal, share_percentage: Optional[Decimal] = None):
-        """Create a new expense share."""
+    def create_share(
+        cls,
+        expense_id: str,
+        user_household_id: str,
+        share_amount: Decimal,
+        share_percentage: Optional[Decimal] = None,
+        currency: Optional[str] = None
+    ):
+        """Create a new expense share; currency defaults to the expense's."""
         return cls(
             expense_id=expense_id,
             user_household_id=user_household_id,
             share_amount=share_amount,
             share_percentage=share_percentage,
+            currency=currency,
             is_paid=False,
             is_active=True
         )
@@ -208,12 +248,36 @@ class ExpenseShare(BaseModel, ActiveMixin):
     @classmethod
     def create_equal_share(cls, expense_id: str, user_household_id: str, total_amount: Decimal, num_people: int):
         """Create an equal share for an expense."""
-        share_amount = total_amount / num_people
-        share_percentage = Decimal('100.00') / num_people
+        share_amount = divide_amount(total_amount, num_people)
+        share_percentage = divide_amount(Decimal(100), num_people)
         return cls.create_share(expense_id, user_household_id, share_amount, share_percentage)
     
+    @classmethod
+    def create_equal_shares(
+        cls,
+        expense_id: str,
+        user_household_ids: List[str],
+        total_amount: Decimal,
+        currency: Optional[str] = None
+    ) -> List["ExpenseShare"]:
+        """
+        Create equal shares for several members at once.
+
+        Amounts come from split_amount_equally so they add up to the total.
+        Add the shares together with ``add_all``: the flush then inserts
+        them as one batched statement.
+        """
+        if not user_household_ids:
+            return []
+        share_amounts = split_amount_equally(total_amount, len(user_household_ids))
+        share_percentage = divide_amount(Decimal(100), len(user_household_ids))
+        return [
+            cls.create_share(expense_id, user_household_id, share_amount, share_percentage, currency)
+            for user_household_id, share_amount in zip(user_household_ids, share_amounts, strict=True)
+        ]
+    
     @classmethod
     def create_percentage_share(cls, expense_id: str, user_household_id: str, total_amount: Decimal, percentage: Decimal):
         """Create a percentage-based share for an expense."""
-        share_amount = (total_amount * percentage) / Decimal('100.00')
+        share_amount = percentage_of(total_amount, percentage)
         return cls.create_share(expense_id, user_household_id, share_amount, percentage) 
\ No newline at end of file
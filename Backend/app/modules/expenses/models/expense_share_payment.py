@@ -7,13 +7,24 @@ from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import Column, DECIMAL, DateTime, ForeignKey
+from sqlalchemy import Column, String, DECIMAL, DateTime, ForeignKey, Index, select
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 from app.core.models.base import BaseModel
+from app.core.utils.helpers import format_amount, to_cents, to_decimal
 from app.core.models.mixins import ActiveMixin
 
+from .expense_share import ExpenseShare
+
+
+def _expense_share_currency(context) -> str:
+    """Default an allocation's currency to its expense share's when not set explicitly."""
+    expense_share_id = context.get_current_parameters()["expense_share_id"]
+    return context.connection.scalar(
+        select(ExpenseShare.currency).where(ExpenseShare.id == expense_share_id)
+    )
+
 
 class ExpenseSharePayment(BaseModel, ActiveMixin):
     """Links payments to expense shares, allowing payments to cover multiple expense shares."""
@@ -24,8 +35,7 @@ class ExpenseSharePayment(BaseModel, ActiveMixin):
     payment_id = Column(
         UUID(as_uuid=True),
         ForeignKey("payments.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     
     # Expense share being paid
@@ -43,6 +53,13 @@ class ExpenseSharePayment(BaseModel, ActiveMixin):
         index=True
     )
     
+    # Copy of the expense currency so formatting an allocation needs no join
+    currency = Column(
+        String(3),
+        nullable=False,
+        default=_expense_share_currency
+    )
+    
     # When this allocation was created
     allocated_at = Column(
         DateTime,
@@ -62,35 +79,30 @@ class ExpenseSharePayment(BaseModel, ActiveMixin):
         back_populates="payments"
     )
     
-    def __repr__(self) -> str:
+    # Allocations are looked up per payment and filtered on is_active
+    __table_args__ = (
+        Index('ix_expense_share_payments_payment_active', 'payment_id', 'is_active'),
+    )
+    
+    def describe(self) -> str:
+        """Get a detailed description of the record for debugging."""
         return f"<ExpenseSharePayment(payment_id={self.payment_id}, expense_share_id={self.expense_share_id}, amount={self.amount})>"
     
     @property
     def amount_decimal(self) -> Decimal:
         """Get the amount as a Decimal object."""
-        return Decimal(str(self.amount))
+        return to_decimal(self.amount)
     
     @property
     def formatted_amount(self) -> str:
         """Get formatted amount with currency symbol."""
-        if self.expense_share and self.expense_share.expense:
-            currency_symbols = {
-                "USD": "$",
-                "EUR": "€",
-                "GBP": "£",
-                "JPY": "¥",
-                "CAD": "C$",
-                "AUD": "A$",
-            }
-            symbol = currency_symbols.get(self.expense_share.expense.currency, self.expense_share.expense.currency)
-            return f"{symbol}{self.amount:.2f}"
-        return f"${self.amount:.2f}"
+        return format_amount(self.amount, self.currency or "USD")
     
     @property
     def covers_full_share(self) -> bool:
         """Check if this payment allocation covers the full expense share amount."""
         if self.expense_share:
-            return abs(self.amount_decimal - self.expense_share.share_amount_decimal) < Decimal('0.01')
+            return to_cents(self.amount) == to_cents(self.expense_share.share_amount)
         return False
     
     @property
@@ -110,13 +122,15 @@ class ExpenseSharePayment(BaseModel, ActiveMixin):
         cls,
         payment_id: UUID,
         expense_share_id: UUID,
-        amount: Decimal
+        amount: Decimal,
+        currency: Optional[str] = None
     ):
-        """Create a new payment allocation to an expense share."""
+        """Create a new payment allocation; currency defaults to the expense share's."""
         return cls(
             payment_id=payment_id,
             expense_share_id=expense_share_id,
             amount=amount,
+            currency=currency,
             is_active=True
         )
     
@@ -126,5 +140,6 @@ class ExpenseSharePayment(BaseModel, ActiveMixin):
         return cls.create_allocation(
             payment_id=payment_id,
             expense_share_id=expense_share.id,
-            amount=expense_share.share_amount_decimal
+            amount=expense_share.share_amount_decimal,
+            currency=expense_share.currency
         ) 
\ No newline at end of file
@@ -3,14 +3,18 @@ Household model for expenses module.
 """
 
 from enum import Enum
+from types import MappingProxyType
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import Column, String, Text, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy import Column, String, Text, ForeignKey, JSON, func, select
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PGUUID
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import relationship
 
 from app.core.models.base import BaseModel
+from app.core.utils.helpers import to_uuid
 from app.core.models.mixins import ActiveMixin, NameMixin, DescriptionMixin
 
 
@@ -19,6 +23,17 @@ def get_enum_values(enum_class):
     return [member.value for member in enum_class]
 
 
+# Settings given to new households; copied per row, never mutated
+DEFAULT_HOUSEHOLD_SETTINGS = MappingProxyType({
+    "default_currency": "USD",
+    "allow_member_invites": True,
+    "require_receipt_for_large_expenses": False,
+    "large_expense_threshold": 100.00,
+    "default_split_method": "equal",
+    "timezone": "UTC"
+})
+
+
 class UserHouseholdRole(str, Enum):
     """User role within a household."""
     ADMIN = "admin"
@@ -46,18 +61,12 @@ class Household(BaseModel, NameMixin, DescriptionMixin, ActiveMixin):
         index=True
     )
     
-    # Household settings (JSON field for preferences)
+    # Household settings (JSON field for preferences); JSONB on PostgreSQL
+    # so reads skip re-parsing the text. MutableDict tracks in-place changes.
     settings = Column(
-        JSON,
+        MutableDict.as_mutable(JSON().with_variant(JSONB(), "postgresql")),
         nullable=True,
-        default=lambda: {
-            "default_currency": "USD",
-            "allow_member_invites": True,
-            "require_receipt_for_large_expenses": False,
-            "large_expense_threshold": 100.00,
-            "default_split_method": "equal",
-            "timezone": "UTC"
-        }
+        default=lambda: dict(DEFAULT_HOUSEHOLD_SETTINGS)
     )
     
     # Relationships
@@ -91,18 +100,47 @@ class Household(BaseModel, NameMixin, DescriptionMixin, ActiveMixin):
         cascade="all, delete-orphan"
     )
     
-    def __repr__(self) -> str:
+    def describe(self) -> str:
+        """Get a detailed description of the record for debugging."""
         return f"<Household(id={self.id}, name='{self.name}', invite_code='{self.invite_code}')>"
     
-    @property
+    @hybrid_property
     def member_count(self) -> int:
         """Get the number of active members in the household."""
-        return len([m for m in self.members if m.is_active])
-    
-    @property
+        return sum(1 for _ in self.iter_active_members())
+    
+    @member_count.expression
+    def member_count(cls):
+        """Count active members in SQL without loading the collection."""
+        from .user_household import UserHousehold
+        
+        return (
+            select(func.count(UserHousehold.id))
+            .where(UserHousehold.household_id == cls.id, UserHousehold.is_active.is_(True))
+            .correlate(cls)
+            .scalar_subquery()
+        )
+    
+    @hybrid_property
     def admin_count(self) -> int:
         """Get the number of admin members in the household."""
-        return len([m for m in self.members if m.is_active and m.role == UserHouseholdRole.ADMIN])
+        return sum(1 for m in self.members if m.is_active and m.role == UserHouseholdRole.ADMIN)
+    
+    @admin_count.expression
+    def admin_count(cls):
+        """Count active admins in SQL without loading the collection."""
+        from .user_household import UserHousehold
+        
+        return (
+            select(func.count(UserHousehold.id))
+            .where(
+                UserHousehold.household_id == cls.id,
+                UserHousehold.is_active.is_(True),
+                UserHousehold.role == UserHouseholdRole.ADMIN
+            )
+            .correlate(cls)
+            .scalar_subquery()
+        )
     
     def get_setting(self, key: str, default=None):
         """Get a specific setting value."""
@@ -116,51 +154,44 @@ class Household(BaseModel, NameMixin, DescriptionMixin, ActiveMixin):
             self.settings = {}
         self.settings[key] = value
     
+    def iter_active_members(self):
+        """Iterate over active members without building a list."""
+        return (m for m in self.members if m.is_active)
+    
     def get_active_members(self):
         """Get all active members of the household."""
-        return [m for m in self.members if m.is_active]
+        return list(self.iter_active_members())
     
     def get_admins(self):
         """Get all admin members of the household."""
         return [m for m in self.members if m.is_active and m.role == UserHouseholdRole.ADMIN]
     
-    def is_member(self, user_id: str) -> bool:
+    def members_by_user(self) -> dict:
+        """
+        Map user IDs to their active membership in a single pass.
+
+        Build this once when checking several users against the same
+        household instead of calling ``get_member`` repeatedly.
+        """
+        return {m.user_id: m for m in self.members if m.is_active}
+    
+    def is_member(self, user_id: UUID | str) -> bool:
         """Check if a user is a member of this household."""
-        # Convert string to UUID for comparison
-        try:
-            user_uuid = UUID(user_id) if isinstance(user_id, str) else user_id
-            return any(m.user_id == user_uuid and m.is_active for m in self.members)
-        except (ValueError, TypeError):
-            # If conversion fails, try string comparison
-            return any(str(m.user_id) == str(user_id) and m.is_active for m in self.members)
+        return self.get_member(user_id) is not None
     
-    def is_admin(self, user_id: str) -> bool:
+    def is_admin(self, user_id: UUID | str) -> bool:
         """Check if a user is an admin of this household."""
-        # Convert string to UUID for comparison
-        try:
-            user_uuid = UUID(user_id) if isinstance(user_id, str) else user_id
-            return any(
-                m.user_id == user_uuid and m.is_active and m.role == UserHouseholdRole.ADMIN 
-                for m in self.members
-            )
-        except (ValueError, TypeError):
-            # If conversion fails, try string comparison
-            return any(
-                str(m.user_id) == str(user_id) and m.is_active and m.role == UserHouseholdRole.ADMIN 
-                for m in self.members
-            )
+        member = self.get_member(user_id)
+        return member is not None and member.role == UserHouseholdRole.ADMIN
     
-    def get_member(self, user_id: str):
+    def get_member(self, user_id: UUID | str):
         """Get a specific member by user ID."""
-        # Convert string to UUID for comparison
+        # Parse once; a malformed ID cannot match any member
         try:
-            user_uuid = UUID(user_id) if isinstance(user_id, str) else user_id
-            for member in self.members:
-                if member.user_id == user_uuid and member.is_active:
-                    return member
-        except (ValueError, TypeError):
-            # If conversion fails, try string comparison
-            for member in self.members:
-                if str(member.user_id) == str(user_id) and member.is_active:
-                    return member
-        return None 
\ No newline at end of file
+            user_uuid = to_uuid(user_id)
+        except ValueError:
+            return None
+        for member in self.members:
+            if member.user_id == user_uuid and member.is_active:
+                return member
+        return None
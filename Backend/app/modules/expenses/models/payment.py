@@ -7,13 +7,17 @@ from decimal import Decimal
 from typing import Optional, List
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, String, Text, DECIMAL, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, Text, DECIMAL, DateTime, ForeignKey, Enum, Index, func, select
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
 from app.core.models.base import BaseModel
+from app.core.utils.helpers import format_amount, to_cents, to_decimal
 from app.core.models.mixins import ActiveMixin
 
+from .expense_share_payment import ExpenseSharePayment
+
 
 class PaymentType(PyEnum):
     """Types of payments."""
@@ -41,8 +45,7 @@ class Payment(BaseModel, ActiveMixin):
     household_id = Column(
         UUID(as_uuid=True),
         ForeignKey("households.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     
     # Who made the payment (payer)
@@ -76,14 +79,14 @@ class Payment(BaseModel, ActiveMixin):
     )
     
     payment_type = Column(
-        Enum(PaymentType),
+        Enum(PaymentType, name="paymenttype", native_enum=False, length=20, validate_strings=True),
         nullable=False,
         default=PaymentType.REIMBURSEMENT,
         index=True
     )
     
     payment_method = Column(
-        Enum(PaymentMethod),
+        Enum(PaymentMethod, name="paymentmethod", native_enum=False, length=20, validate_strings=True),
         nullable=True,
         index=True
     )
@@ -133,27 +136,25 @@ class Payment(BaseModel, ActiveMixin):
         cascade="all, delete-orphan"
     )
     
-    def __repr__(self) -> str:
+    # Household payment listings filter by household and sort by date
+    __table_args__ = (
+        Index('ix_payments_household_date', 'household_id', 'payment_date'),
+        Index('ix_payments_household_updated', 'household_id', 'updated_at'),
+    )
+    
+    def describe(self) -> str:
+        """Get a detailed description of the record for debugging."""
         return f"<Payment(id={self.id}, amount={self.amount} {self.currency}, type={self.payment_type.value})>"
     
     @property
     def amount_decimal(self) -> Decimal:
         """Get the amount as a Decimal object."""
-        return Decimal(str(self.amount))
+        return to_decimal(self.amount)
     
     @property
     def formatted_amount(self) -> str:
         """Get formatted amount with currency symbol."""
-        currency_symbols = {
-            "USD": "$",
-            "EUR": "€",
-            "GBP": "£",
-            "JPY": "¥",
-            "CAD": "C$",
-            "AUD": "A$",
-        }
-        symbol = currency_symbols.get(self.currency, self.currency)
-        return f"{symbol}{self.amount:.2f}"
+        return format_amount(self.amount, self.currency)
     
     @property
     def payer_name(self) -> str:
@@ -169,13 +170,25 @@ class Payment(BaseModel, ActiveMixin):
             return self.payee.display_name
         return "Unknown"
     
-    @property
+    @hybrid_property
     def total_allocated_amount(self) -> Decimal:
         """Get the total amount allocated to expense shares."""
         return sum(
-            Decimal(str(esp.amount)) 
-            for esp in self.expense_share_payments 
-            if esp.is_active
+            (to_decimal(esp.amount) for esp in self.expense_share_payments if esp.is_active),
+            Decimal(0)
+        )
+    
+    @total_allocated_amount.expression
+    def total_allocated_amount(cls):
+        """Sum active allocations in SQL without loading the collection."""
+        return (
+            select(func.coalesce(func.sum(ExpenseSharePayment.amount), 0))
+            .where(
+                ExpenseSharePayment.payment_id == cls.id,
+                ExpenseSharePayment.is_active.is_(True)
+            )
+            .correlate(cls)
+            .scalar_subquery()
         )
     
     @property
@@ -191,16 +204,15 @@ class Payment(BaseModel, ActiveMixin):
     @property
     def is_fully_allocated(self) -> bool:
         """Check if the payment is fully allocated to expense shares."""
-        return abs(self.unallocated_amount) < Decimal('0.01')
+        return to_cents(self.amount) == to_cents(self.total_allocated_amount)
     
     def add_expense_share(self, expense_share, amount: Decimal) -> None:
         """Add an expense share to this payment."""
-        from .expense_share_payment import ExpenseSharePayment
-        
         esp = ExpenseSharePayment(
             payment_id=self.id,
             expense_share_id=expense_share.id,
-            amount=amount
+            amount=amount,
+            currency=expense_share.currency
         )
         self.expense_share_payments.append(esp)
     
@@ -5,7 +5,7 @@ UserHousehold association model for expenses module.
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Enum as SQLEnum, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -73,7 +73,19 @@ class UserHousehold(BaseModel, ActiveMixin):
         cascade="all, delete-orphan"
     )
     
-    def __repr__(self) -> str:
+    # Membership checks filter on all three columns; the partial index
+    # covers only active rows
+    __table_args__ = (
+        Index(
+            'ix_user_households_active_user_household',
+            'user_id',
+            'household_id',
+            postgresql_where=text('is_active')
+        ),
+    )
+    
+    def describe(self) -> str:
+        """Get a detailed description of the record for debugging."""
         return f"<UserHousehold(user_id={self.user_id}, household_id={self.household_id}, role='{self.role}')>"
     
     @property
@@ -2,41 +2,87 @@
 Analytics router for expense analytics and reporting.
 """
 
+import hashlib
+import json
 import logging
 from datetime import datetime, date
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import get_db
+from app.database import get_async_db, get_async_session_factory
 from app.modules.auth.dependencies import get_current_user
 from app.modules.auth.models.user import User
+from app.modules.expenses.dependencies import get_household_service
 from app.modules.expenses.schemas.analytics import (
     SpendingSummaryResponse,
     CategoryAnalysisResponse,
     UserSpendingPatternsResponse,
     HouseholdBalancesResponse,
-    AnalyticsDashboardResponse,
-    ExportDataResponse
+    AnalyticsDashboardResponse
+)
+from app.modules.expenses.services.analytics_service import (
+    NO_EXPENSES_INSIGHT,
+    AnalyticsService,
+    build_dashboard_insights
 )
-from app.modules.expenses.services.analytics_service import AnalyticsService
 from app.modules.expenses.services.household_service import HouseholdService
+from app.modules.expenses.utils.analytics_cache import analytics_cache
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/households/{household_id}/analytics", tags=["analytics"])
+router = APIRouter(
+    prefix="/households/{household_id}/analytics",
+    tags=["analytics"],
+    default_response_class=ORJSONResponse
+)
+
+# Export format -> (media type, file extension)
+EXPORT_MEDIA_TYPES = {
+    "csv": ("text/csv", "csv"),
+    "json": ("application/json", "json"),
+    "excel": ("text/csv", "csv"),
+}
+
+# Browsers may reuse a response briefly, then revalidate it with its ETag
+ANALYTICS_CACHE_CONTROL = "private, max-age=60"
 
 
-def get_analytics_service(db: Session = Depends(get_db)) -> AnalyticsService:
+def get_analytics_service(db: AsyncSession = Depends(get_async_db)) -> AnalyticsService:
     """Get analytics service instance."""
     return AnalyticsService(db)
 
 
-def get_household_service(db: Session = Depends(get_db)) -> HouseholdService:
-    """Get household service instance."""
-    return HouseholdService(db)
+def parse_uuid_csv(value: Optional[str]) -> Optional[List[UUID]]:
+    """Parse a comma-separated query parameter into a list of UUIDs."""
+    if not value:
+        return None
+
+    try:
+        return [UUID(item.strip()) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Expected a comma-separated list of UUIDs"
+        )
+
+
+def get_category_ids(
+    category_ids: Optional[str] = Query(None, description="Filter by category IDs (comma-separated)")
+) -> Optional[List[UUID]]:
+    """Get the parsed category ID filter."""
+    return parse_uuid_csv(category_ids)
+
+
+def get_user_ids(
+    user_ids: Optional[str] = Query(None, description="Filter by user IDs (comma-separated)")
+) -> Optional[List[UUID]]:
+    """Get the parsed user ID filter."""
+    return parse_uuid_csv(user_ids)
 
 
 async def verify_household_access(
@@ -57,13 +103,58 @@ async def verify_household_access(
         )
 
 
+async def check_not_modified(
+    request: Request,
+    response: Response,
+    household_id: UUID,
+    name: str,
+    params: dict,
+    analytics_service: AnalyticsService
+) -> Optional[Response]:
+    """
+    Tag an analytics response and answer revalidations that still match.
+
+    The ETag covers the endpoint, its parameters, today's date (default
+    ranges end today), the latest change to the household, its members,
+    categories, expenses, shares or payments, and its analytics cache
+    generation.
+
+    Returns:
+        A 304 response when the client's copy is current, otherwise None
+        after setting the ETag and Cache-Control headers on the response
+    """
+    last_modified = await analytics_service.get_last_modified(household_id)
+    generation = await analytics_cache.generation(household_id)
+    encoded = json.dumps(jsonable_encoder({
+        "household_id": household_id,
+        "name": name,
+        "params": params,
+        "today": date.today(),
+        "last_modified": last_modified,
+        "generation": generation
+    }), sort_keys=True)
+    etag = f'"{hashlib.blake2s(encoded.encode()).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": ANALYTICS_CACHE_CONTROL}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in client_tags or "*" in client_tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
+
+
 @router.get("/summary", response_model=SpendingSummaryResponse)
 async def get_spending_summary(
     household_id: UUID,
+    request: Request,
+    response: Response,
     date_from: Optional[date] = Query(None, description="Filter from date"),
     date_to: Optional[date] = Query(None, description="Filter to date"),
-    category_ids: Optional[str] = Query(None, description="Filter by category IDs (comma-separated)"),
-    user_ids: Optional[str] = Query(None, description="Filter by user IDs (comma-separated)"),
+    category_ids: Optional[List[UUID]] = Depends(get_category_ids),
+    user_ids: Optional[List[UUID]] = Depends(get_user_ids),
     include_inactive: bool = Query(False, description="Include inactive expenses"),
     current_user: User = Depends(get_current_user),
     analytics_service: AnalyticsService = Depends(get_analytics_service),
@@ -73,11 +164,32 @@ async def get_spending_summary(
     try:
         await verify_household_access(household_id, current_user, household_service)
         
+        cache_params = {
+            "user_id": current_user.id,
+            "date_from": date_from,
+            "date_to": date_to,
+            "category_ids": category_ids,
+            "user_ids": user_ids,
+            "include_inactive": include_inactive
+        }
+        not_modified = await check_not_modified(
+            request, response, household_id, "summary", cache_params, analytics_service
+        )
+        if not_modified:
+            return not_modified
+        
+        cache_key = await analytics_cache.entry_key(household_id, "summary", cache_params)
+        cached = await analytics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         success, message, summary = await analytics_service.get_spending_summary(
             household_id=household_id,
             user_id=current_user.id,
             start_date=date_from,
-            end_date=date_to
+            end_date=date_to,
+            category_ids=category_ids,
+            user_ids=user_ids
         )
         
         if not success:
@@ -86,12 +198,16 @@ async def get_spending_summary(
                 detail=message
             )
         
+        await analytics_cache.set(cache_key, summary)
         return summary
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error getting spending summary: {e}")
+    except Exception:
+        logger.exception(
+            "Error getting spending summary for household %s", household_id,
+            extra={"household_id": str(household_id), "user_id": str(current_user.id)}
+        )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve spending summary"
@@ -101,6 +217,8 @@ async def get_spending_summary(
 @router.get("/categories", response_model=List[CategoryAnalysisResponse])
 async def get_category_analysis(
     household_id: UUID,
+    request: Request,
+    response: Response,
     date_from: Optional[date] = Query(None, description="Filter from date"),
     date_to: Optional[date] = Query(None, description="Filter to date"),
     limit: int = Query(10, ge=1, le=50, description="Number of top categories to return"),
@@ -112,11 +230,29 @@ async def get_category_analysis(
     try:
         await verify_household_access(household_id, current_user, household_service)
         
+        cache_params = {
+            "user_id": current_user.id,
+            "date_from": date_from,
+            "date_to": date_to,
+            "limit": limit
+        }
+        not_modified = await check_not_modified(
+            request, response, household_id, "categories", cache_params, analytics_service
+        )
+        if not_modified:
+            return not_modified
+        
+        cache_key = await analytics_cache.entry_key(household_id, "categories", cache_params)
+        cached = await analytics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         success, message, analysis = await analytics_service.get_category_analysis(
             household_id=household_id,
             user_id=current_user.id,
             start_date=date_from,
-            end_date=date_to
+            end_date=date_to,
+            limit=limit
         )
         
         if not success:
@@ -125,14 +261,17 @@ async def get_category_analysis(
                 detail=message
             )
         
-        # Return the categories list, limited by the limit parameter
         categories = analysis.get("categories", [])
-        return categories[:limit]
+        await analytics_cache.set(cache_key, categories)
+        return categories
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error getting category analysis: {e}")
+    except Exception:
+        logger.exception(
+            "Error getting category analysis for household %s", household_id,
+            extra={"household_id": str(household_id), "user_id": str(current_user.id)}
+        )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve category analysis"
@@ -142,6 +281,8 @@ async def get_category_analysis(
 @router.get("/users", response_model=List[UserSpendingPatternsResponse])
 async def get_user_spending_patterns(
     household_id: UUID,
+    request: Request,
+    response: Response,
     date_from: Optional[date] = Query(None, description="Filter from date"),
     date_to: Optional[date] = Query(None, description="Filter to date"),
     user_id: Optional[UUID] = Query(None, description="Specific user to analyze"),
@@ -153,6 +294,23 @@ async def get_user_spending_patterns(
     try:
         await verify_household_access(household_id, current_user, household_service)
         
+        cache_params = {
+            "user_id": current_user.id,
+            "target_user_id": user_id,
+            "date_from": date_from,
+            "date_to": date_to
+        }
+        not_modified = await check_not_modified(
+            request, response, household_id, "users", cache_params, analytics_service
+        )
+        if not_modified:
+            return not_modified
+        
+        cache_key = await analytics_cache.entry_key(household_id, "users", cache_params)
+        cached = await analytics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         success, message, patterns = await analytics_service.get_user_spending_patterns(
             household_id=household_id,
             user_id=current_user.id,
@@ -169,13 +327,17 @@ async def get_user_spending_patterns(
         
         # Convert patterns dict to list format expected by response model
         if isinstance(patterns, dict):
-            return [patterns]
+            patterns = [patterns]
+        await analytics_cache.set(cache_key, patterns)
         return patterns
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error getting user spending patterns: {e}")
+    except Exception:
+        logger.exception(
+            "Error getting user spending patterns for household %s", household_id,
+            extra={"household_id": str(household_id), "user_id": str(current_user.id)}
+        )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve user spending patterns"
@@ -185,6 +347,8 @@ async def get_user_spending_patterns(
 @router.get("/balances", response_model=HouseholdBalancesResponse)
 async def get_household_balances(
     household_id: UUID,
+    request: Request,
+    response: Response,
     include_settled: bool = Query(False, description="Include settled balances"),
     current_user: User = Depends(get_current_user),
     analytics_service: AnalyticsService = Depends(get_analytics_service),
@@ -194,6 +358,18 @@ async def get_household_balances(
     try:
         await verify_household_access(household_id, current_user, household_service)
         
+        cache_params = {"user_id": current_user.id, "include_settled": include_settled}
+        not_modified = await check_not_modified(
+            request, response, household_id, "balances", cache_params, analytics_service
+        )
+        if not_modified:
+            return not_modified
+        
+        cache_key = await analytics_cache.entry_key(household_id, "balances", cache_params)
+        cached = await analytics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         success, message, balances = await analytics_service.get_balance_calculations(
             household_id=household_id,
             user_id=current_user.id
@@ -205,19 +381,23 @@ async def get_household_balances(
                 detail=message
             )
         
+        await analytics_cache.set(cache_key, balances)
         return balances
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error getting household balances: {e}")
+    except Exception:
+        logger.exception(
+            "Error getting household balances for household %s", household_id,
+            extra={"household_id": str(household_id), "user_id": str(current_user.id)}
+        )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve household balances"
         )
 
 
-@router.get("/export", response_model=ExportDataResponse)
+@router.get("/export", response_class=StreamingResponse)
 async def export_household_data(
     household_id: UUID,
     format: str = Query("csv", description="Export format: csv, json, excel"),
@@ -227,49 +407,55 @@ async def export_household_data(
     include_users: bool = Query(True, description="Include user data"),
     include_balances: bool = Query(True, description="Include balance data"),
     current_user: User = Depends(get_current_user),
-    analytics_service: AnalyticsService = Depends(get_analytics_service),
-    household_service: HouseholdService = Depends(get_household_service)
+    household_service: HouseholdService = Depends(get_household_service),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_async_session_factory)
 ):
     """Export household data in various formats."""
-    try:
-        await verify_household_access(household_id, current_user, household_service)
-        
-        if format not in ["csv", "json", "excel"]:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Format must be one of: csv, json, excel"
-            )
-        
-        success, message, export_data = await analytics_service.export_data(
-            household_id=household_id,
-            user_id=current_user.id,
-            export_type=format,
-            start_date=date_from,
-            end_date=date_to,
-            include_shares=True
-        )
-        
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=message
-            )
-        
-        return export_data
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error exporting household data: {e}")
+    await verify_household_access(household_id, current_user, household_service)
+    
+    if format not in EXPORT_MEDIA_TYPES:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to export household data"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Format must be one of: csv, json, excel"
         )
+    
+    # Excel opens CSV directly; the BOM makes it read the file as UTF-8
+    export_type = "json" if format == "json" else "csv"
+    media_type, extension = EXPORT_MEDIA_TYPES[format]
+    
+    async def stream_export():
+        # Dependency sessions are closed before a streamed body is sent,
+        # so the export reads through a session of its own
+        if format == "excel":
+            yield "\ufeff"
+        try:
+            async with session_factory() as db:
+                async for chunk in AnalyticsService(db).export_data_stream(
+                    household_id=household_id,
+                    export_type=export_type,
+                    start_date=date_from,
+                    end_date=date_to
+                ):
+                    yield chunk
+        except Exception:
+            logger.exception(
+                "Error exporting household data for household %s", household_id,
+                extra={"household_id": str(household_id), "user_id": str(current_user.id)}
+            )
+            raise
+    
+    return StreamingResponse(
+        stream_export(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="household-{household_id}-export.{extension}"'}
+    )
 
 
 @router.get("/dashboard", response_model=AnalyticsDashboardResponse)
 async def get_analytics_dashboard(
     household_id: UUID,
+    request: Request,
+    response: Response,
     date_from: Optional[date] = Query(None, description="Filter from date"),
     date_to: Optional[date] = Query(None, description="Filter to date"),
     current_user: User = Depends(get_current_user),
@@ -280,104 +466,87 @@ async def get_analytics_dashboard(
     try:
         await verify_household_access(household_id, current_user, household_service)
         
-        # Get all analytics data in parallel
-        import asyncio
-        
-        spending_summary_task = analytics_service.get_spending_summary(
-            household_id=household_id,
-            user_id=current_user.id,
-            start_date=date_from,
-            end_date=date_to
+        cache_params = {"user_id": current_user.id, "date_from": date_from, "date_to": date_to}
+        not_modified = await check_not_modified(
+            request, response, household_id, "dashboard", cache_params, analytics_service
         )
+        if not_modified:
+            return not_modified
         
-        category_analysis_task = analytics_service.get_category_analysis(
-            household_id=household_id,
-            user_id=current_user.id,
-            start_date=date_from,
-            end_date=date_to
-        )
+        cache_key = await analytics_cache.entry_key(household_id, "dashboard", cache_params)
+        cached = await analytics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        household_name = await household_service.get_household_name(household_id)
+        if household_name is None:
+            raise HTTPException(status_code=404, detail="Household not found")
         
-        user_patterns_task = analytics_service.get_user_spending_patterns(
+        # New households have nothing to aggregate
+        if not await analytics_service.has_any_expense(household_id):
+            return AnalyticsDashboardResponse(
+                household_id=household_id,
+                household_name=household_name,
+                generated_at=datetime.utcnow(),
+                spending_summary={
+                    "totals": {
+                        "total_amount": 0.0,
+                        "expense_count": 0,
+                        "average_expense": 0.0,
+                        "daily_average": 0.0
+                    }
+                },
+                top_categories=[],
+                user_patterns=[],
+                balance_overview={"total_outstanding": 0.0},
+                key_insights=[NO_EXPENSES_INSIGHT],
+                recommendations=[],
+                alerts=[]
+            )
+        
+        success, message, bundle = await analytics_service.get_dashboard_bundle(
             household_id=household_id,
             user_id=current_user.id,
             start_date=date_from,
-            end_date=date_to
-        )
-        
-        balance_overview_task = analytics_service.get_balance_calculations(
-            household_id=household_id,
-            user_id=current_user.id
-        )
-        
-        # Wait for all tasks to complete
-        results = await asyncio.gather(
-            spending_summary_task,
-            category_analysis_task,
-            user_patterns_task,
-            balance_overview_task
+            end_date=date_to,
+            category_limit=5
         )
+        if not success:
+            raise HTTPException(status_code=400, detail=message)
         
-        # Unpack results and check for errors
-        spending_success, spending_msg, spending_summary = results[0]
-        category_success, category_msg, category_analysis = results[1]
-        user_success, user_msg, user_patterns = results[2]
-        balance_success, balance_msg, balance_overview = results[3]
-        
-        if not spending_success:
-            raise HTTPException(status_code=400, detail=f"Spending summary error: {spending_msg}")
-        if not category_success:
-            raise HTTPException(status_code=400, detail=f"Category analysis error: {category_msg}")
-        if not user_success:
-            raise HTTPException(status_code=400, detail=f"User patterns error: {user_msg}")
-        if not balance_success:
-            raise HTTPException(status_code=400, detail=f"Balance overview error: {balance_msg}")
-        
-        # Get household info
-        household = await household_service.get_household_with_members(household_id)
-        if not household:
-            raise HTTPException(status_code=404, detail="Household not found")
-        
-        # Get top categories (limit to 5 for dashboard)
-        top_categories = category_analysis.get("categories", [])[:5]
-        
-        # Generate insights and recommendations
-        key_insights = []
-        recommendations = []
-        alerts = []
-        
-        # Add some basic insights based on the data
-        total_expenses = spending_summary.get("totals", {}).get("expense_count", 0)
-        total_amount = spending_summary.get("totals", {}).get("total_amount", 0)
-        
-        if total_expenses > 0:
-            key_insights.append(f"Total of {total_expenses} expenses recorded")
-            key_insights.append(f"Total spending: ${total_amount:.2f}")
+        spending_summary = bundle.summary
+        category_analysis = bundle.categories
+        user_patterns = bundle.user_patterns
+        balance_overview = bundle.balances
         
-        if top_categories:
-            key_insights.append(f"Top spending category: {top_categories[0].get('name', 'Unknown')}")
+        top_categories = category_analysis.get("categories", [])
         
-        total_outstanding = balance_overview.get("total_outstanding", 0)
-        if total_outstanding > 0:
-            alerts.append(f"Outstanding balances: ${total_outstanding:.2f}")
-            recommendations.append("Consider settling outstanding balances")
+        key_insights, recommendations, alerts = build_dashboard_insights(
+            spending_summary, top_categories, balance_overview
+        )
         
-        return AnalyticsDashboardResponse(
+        dashboard = AnalyticsDashboardResponse(
             household_id=household_id,
-            household_name=household.name,
+            household_name=household_name,
             generated_at=datetime.utcnow(),
             spending_summary=spending_summary,
             top_categories=top_categories,
-            user_patterns=user_patterns if isinstance(user_patterns, list) else [user_patterns],
+            user_patterns=user_patterns,
             balance_overview=balance_overview,
             key_insights=key_insights,
             recommendations=recommendations,
             alerts=alerts
         )
+        await analytics_cache.set(cache_key, dashboard)
+        return dashboard
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error getting analytics dashboard: {e}")
+    except Exception:
+        logger.exception(
+            "Error getting analytics dashboard for household %s", household_id,
+            extra={"household_id": str(household_id), "user_id": str(current_user.id)}
+        )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve analytics dashboard"
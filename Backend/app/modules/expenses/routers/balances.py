@@ -6,6 +6,7 @@ from typing import Dict, Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -19,7 +20,7 @@ from app.modules.expenses.schemas.payment_schemas import (
     UserPaymentSummary,
 )
 
-router = APIRouter(prefix="/balances", tags=["balances"])
+router = APIRouter(prefix="/balances", tags=["balances"], default_response_class=ORJSONResponse)
 
 
 def get_payment_service(db: Session = Depends(get_db)) -> PaymentService:
@@ -82,19 +83,22 @@ async def get_payment_history(
     # Build payment history with related expenses
     from app.modules.expenses.schemas.payment_schemas import PaymentHistoryEntry, PaymentResponse, ExpenseShareSummary
     
+    allocations = await payment_service.get_allocation_summaries(
+        [payment.id for payment in result["payments"]]
+    )
+    
     payment_entries = []
     for payment in result["payments"]:
-        # Get related expense shares
-        related_expenses = []
-        for esp in payment.expense_share_payments:
-            if esp.is_active and esp.expense_share:
-                related_expenses.append(ExpenseShareSummary(
-                    id=esp.expense_share.id,
-                    expense_id=esp.expense_share.expense_id,
-                    expense_title=esp.expense_share.expense.title if esp.expense_share.expense else "Unknown",
-                    share_amount=esp.expense_share.share_amount,
-                    allocated_amount=esp.amount
-                ))
+        related_expenses = [
+            ExpenseShareSummary(
+                id=row.expense_share_id,
+                expense_id=row.expense_id,
+                expense_title=row.expense_title,
+                share_amount=row.share_amount,
+                allocated_amount=row.allocated_amount
+            )
+            for row in allocations[payment.id]
+        ]
         
         payment_entries.append(PaymentHistoryEntry(
             payment=PaymentResponse.from_orm(payment),
@@ -21,6 +21,7 @@ from app.modules.expenses.schemas import (
     CategoryListResponse,
     CategoryStatsResponse,
 )
+from app.modules.expenses.utils.analytics_cache import analytics_cache
 
 logger = logging.getLogger(__name__)
 
@@ -226,6 +227,7 @@ async def update_category(
         
         db.commit()
         db.refresh(category)
+        await analytics_cache.invalidate(category.household_id)
         
         return CategoryDetailResponse(
             id=category.id,
@@ -304,6 +306,7 @@ async def delete_category(
         # Soft delete the category
         category.is_active = False
         db.commit()
+        await analytics_cache.invalidate(category.household_id)
         
     except HTTPException:
         raise
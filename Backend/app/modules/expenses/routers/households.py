@@ -13,6 +13,8 @@ from app.database import get_db
 from app.modules.auth.dependencies import get_current_user
 from app.modules.auth.models.user import User
 from app.modules.expenses.services import HouseholdService
+from app.modules.expenses.utils.analytics_cache import analytics_cache
+from app.modules.expenses.utils.permission_cache import permission_cache
 from app.modules.expenses.schemas import (
     HouseholdCreate,
     HouseholdUpdate,
@@ -166,6 +168,7 @@ async def update_household(
             setattr(household, field, value)
         
         household_service.db.commit()
+        await analytics_cache.invalidate(household_id)
         return household
         
     except HTTPException:
@@ -209,6 +212,7 @@ async def delete_household(
         
         household.is_active = False
         household_service.db.commit()
+        await analytics_cache.invalidate(household_id)
         
     except HTTPException:
         raise
@@ -578,6 +582,8 @@ async def invite_member(
                 )
                 db.add(new_membership)
                 db.commit()
+                await permission_cache.invalidate(existing_user.id, household_id)
+                await analytics_cache.invalidate(household_id)
                 
                 message = f"User {email} has been added to the household successfully!"
                 status_class = "green"
@@ -694,6 +700,8 @@ async def update_member(
             user_household.role = role
         
         db.commit()
+        await permission_cache.invalidate(user_id, household_id)
+        await analytics_cache.invalidate(household_id)
         
         from fastapi.responses import HTMLResponse
         return HTMLResponse(
@@ -802,6 +810,8 @@ async def remove_member(
         # Soft delete the membership
         user_household.is_active = False
         db.commit()
+        await permission_cache.invalidate(user_id, household_id)
+        await analytics_cache.invalidate(household_id)
         
         from fastapi.responses import HTMLResponse
         return HTMLResponse(
@@ -2,41 +2,160 @@
 Analytics service for generating expense reports and insights.
 """
 
+import csv
+import io
+import json
 import logging
+from functools import lru_cache
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from typing import List, Optional, Tuple, Dict, Any
+from typing import AsyncIterator, Callable, List, NamedTuple, Optional, Tuple, TypeVar, Dict, Any
 from uuid import UUID
 
-from sqlalchemy import func, desc, asc, and_, or_
+from sqlalchemy import Select, Subquery, func, desc, asc, or_, not_, exists, literal, select, union_all
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app.core.services.base_service import BaseService
-from app.core.utils.helpers import format_currency
+from app.core.utils.helpers import format_currency, to_decimal
+from app.modules.auth.models.user import User
 from app.modules.expenses.models.expense import Expense
 from app.modules.expenses.models.expense_share import ExpenseShare
+from app.modules.expenses.models.expense_monthly_rollup import NO_CATEGORY, NO_USER, ExpenseMonthlyRollup
 from app.modules.expenses.models.household import Household
+from app.modules.expenses.models.payment import Payment
 from app.modules.expenses.models.user_household import UserHousehold
 from app.modules.expenses.models.category import Category
+from app.modules.expenses.utils.permission_cache import permission_cache
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Rows fetched per round trip when streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "amount",
+    "currency",
+    "expense_date",
+    "created_at",
+    "category",
+    "creator",
+    "tags",
+    "receipt_url",
+)
+
+
+# Dashboard insight templates
+EXPENSE_COUNT_INSIGHT = "Total of {} expenses recorded".format
+TOTAL_SPENDING_INSIGHT = "Total spending: ${:.2f}".format
+TOP_CATEGORY_INSIGHT = "Top spending category: {}".format
+OUTSTANDING_ALERT = "Outstanding balances: ${:.2f}".format
+SETTLE_RECOMMENDATION = "Consider settling outstanding balances"
+NO_EXPENSES_INSIGHT = "No expenses recorded yet"
+
+
+@lru_cache(maxsize=1024)
+def _insight_lines(
+    expense_count: int,
+    total_amount: float,
+    top_category: Optional[str],
+    total_outstanding: float
+) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    key_insights = []
+    recommendations = []
+    alerts = []
+
+    if expense_count > 0:
+        key_insights.append(EXPENSE_COUNT_INSIGHT(expense_count))
+        key_insights.append(TOTAL_SPENDING_INSIGHT(total_amount))
+
+    if top_category is not None:
+        key_insights.append(TOP_CATEGORY_INSIGHT(top_category))
+
+    if total_outstanding > 0:
+        alerts.append(OUTSTANDING_ALERT(total_outstanding))
+        recommendations.append(SETTLE_RECOMMENDATION)
+
+    return tuple(key_insights), tuple(recommendations), tuple(alerts)
+
+
+def build_dashboard_insights(
+    spending_summary: Dict[str, Any],
+    top_categories: List[Dict[str, Any]],
+    balance_overview: Dict[str, Any]
+) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Build the dashboard insight, recommendation and alert lines.
+
+    Only a handful of figures feed the text, so lines are memoized on them.
+
+    Args:
+        spending_summary: Spending summary from the dashboard bundle
+        top_categories: Top categories, largest first
+        balance_overview: Balance summary from the dashboard bundle
+
+    Returns:
+        Tuple of (key_insights, recommendations, alerts)
+    """
+    totals = spending_summary.get("totals", {})
+    key_insights, recommendations, alerts = _insight_lines(
+        totals.get("expense_count", 0),
+        totals.get("total_amount", 0),
+        top_categories[0].get("name", "Unknown") if top_categories else None,
+        balance_overview.get("total_outstanding", 0)
+    )
+    return list(key_insights), list(recommendations), list(alerts)
+
+
+class DashboardBundle(NamedTuple):
+    """Result sets backing the analytics dashboard."""
+
+    summary: Dict[str, Any]
+    categories: Dict[str, Any]
+    user_patterns: List[Dict[str, Any]]
+    balances: Dict[str, Any]
+
 
 class AnalyticsService(BaseService[Expense, dict, dict]):
     """Service for expense analytics and reporting."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         super().__init__(Expense)
         self.db = db
 
+    async def _run(self, work: Callable[[Session], T]) -> T:
+        """
+        Run ORM query work on the service session.
+
+        With an AsyncSession the work runs through run_sync on the async
+        driver, so the event loop keeps serving other requests while the
+        query waits on the database.
+
+        Args:
+            work: Callable receiving a sync Session
+
+        Returns:
+            Result of the callable
+        """
+        if isinstance(self.db, AsyncSession):
+            return await self.db.run_sync(work)
+        return work(self.db)
+
     async def get_spending_summary(
         self,
         household_id: UUID,
         user_id: UUID,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-        period: str = "month"
+        period: str = "month",
+        category_ids: Optional[List[UUID]] = None,
+        user_ids: Optional[List[UUID]] = None
     ) -> Tuple[bool, str, Dict[str, Any]]:
         """
         Get comprehensive spending summary for a household.
@@ -47,6 +166,8 @@ class AnalyticsService(BaseService[Expense, dict, dict]):
             start_date: Optional start date filter
             end_date: Optional end date filter
             period: Period for grouping (day, week, month, year)
+            category_ids: Optional categories to restrict the summary to
+            user_ids: Optional expense creators to restrict the summary to
 
         Returns:
             Tuple of (success, message, summary_dict)
@@ -68,80 +189,71 @@ class AnalyticsService(BaseService[Expense, dict, dict]):
                 else:
                     start_date = end_date - timedelta(days=30)
 
-            # Get expenses in date range
-            expenses = (
-                self.db.query(Expense)
-                .options(joinedload(Expense.category), joinedload(Expense.creator))
-                .filter(
-                    Expense.household_id == household_id,
-                    Expense.is_active == True,
-                    Expense.expense_date >= start_date,
-                    Expense.expense_date <= end_date
-                )
-                .all()
+            summary, _, _ = await self._build_spending_summary(
+                household_id, start_date, end_date, period, category_ids, user_ids
             )
 
-            # Calculate basic metrics
-            total_amount = sum(expense.amount for expense in expenses)
-            expense_count = len(expenses)
-            average_expense = total_amount / expense_count if expense_count > 0 else Decimal("0")
+            return True, "Spending summary generated successfully", summary
 
-            # Get category breakdown
-            category_breakdown = await self._get_category_breakdown(expenses)
+        except Exception as e:
+            logger.error(f"Error generating spending summary: {e}")
+            return False, f"Failed to generate summary: {str(e)}", {}
 
-            # Get user breakdown
-            user_breakdown = await self._get_user_breakdown(expenses, household_id)
+    async def has_any_expense(self, household_id: UUID) -> bool:
+        """
+        Check whether a household has at least one active expense.
 
-            # Get time series data
-            time_series = await self._get_time_series_data(expenses, period)
+        Args:
+            household_id: Household ID
 
-            # Get top expenses
-            top_expenses = sorted(expenses, key=lambda x: x.amount, reverse=True)[:10]
+        Returns:
+            True if an active expense exists
+        """
+        stmt = select(exists().where(
+            Expense.household_id == household_id,
+            Expense.is_active == True
+        ))
+        return await self._run(lambda db: db.execute(stmt).scalar())
 
-            # Calculate trends
-            trends = await self._calculate_trends(household_id, start_date, end_date, period)
+    async def get_last_modified(self, household_id: UUID) -> Optional[datetime]:
+        """
+        Get when any record feeding a household's analytics last changed.
 
-            summary = {
-                "period": {
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat(),
-                    "period_type": period
-                },
-                "totals": {
-                    "total_amount": float(total_amount),
-                    "expense_count": expense_count,
-                    "average_expense": float(average_expense),
-                    "daily_average": float(total_amount / max(1, (end_date - start_date).days + 1))
-                },
-                "category_breakdown": category_breakdown,
-                "user_breakdown": user_breakdown,
-                "time_series": time_series,
-                "top_expenses": [
-                    {
-                        "id": str(expense.id),
-                        "title": expense.title,
-                        "amount": float(expense.amount),
-                        "date": expense.expense_date.isoformat(),
-                        "category": expense.category.name if expense.category else "Uncategorized",
-                        "creator": expense.creator.username if expense.creator else "Unknown"
-                    }
-                    for expense in top_expenses
-                ],
-                "trends": trends
-            }
+        Covers the household itself, its members, categories, expenses,
+        expense shares and payments, in a single statement.
 
-            return True, "Spending summary generated successfully", summary
+        Args:
+            household_id: Household ID
 
-        except Exception as e:
-            logger.error(f"Error generating spending summary: {e}")
-            return False, f"Failed to generate summary: {str(e)}", {}
+        Returns:
+            Latest update timestamp, or None if nothing was found
+        """
+        latest = [
+            select(func.max(Household.updated_at))
+            .where(Household.id == household_id),
+            select(func.max(UserHousehold.updated_at))
+            .where(UserHousehold.household_id == household_id),
+            select(func.max(Category.updated_at))
+            .where(Category.household_id == household_id),
+            select(func.max(Expense.updated_at))
+            .where(Expense.household_id == household_id),
+            select(func.max(ExpenseShare.updated_at))
+            .join(Expense, ExpenseShare.expense_id == Expense.id)
+            .where(Expense.household_id == household_id),
+            select(func.max(Payment.updated_at))
+            .where(Payment.household_id == household_id),
+        ]
+        stmt = select(*(query.scalar_subquery() for query in latest))
+        row = await self._run(lambda db: db.execute(stmt).one())
+        return max((value for value in row if value is not None), default=None)
 
     async def get_category_analysis(
         self,
         household_id: UUID,
         user_id: UUID,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None
+        end_date: Optional[date] = None,
+        limit: Optional[int] = None
     ) -> Tuple[bool, str, Dict[str, Any]]:
         """
         Get detailed category analysis for a household.
@@ -151,6 +263,7 @@ class AnalyticsService(BaseService[Expense, dict, dict]):
             user_id: User ID (for permission check)
             start_date: Optional start date filter
             end_date: Optional end date filter
+            limit: Optional maximum number of categories to return
 
         Returns:
             Tuple of (success, message, analysis_dict)
@@ -167,24 +280,21 @@ class AnalyticsService(BaseService[Expense, dict, dict]):
             if not start_date:
                 start_date = end_date - timedelta(days=90)  # Last 3 months
 
-            # Get category spending data
-            category_data = (
-                self.db.query(
+            spending = self._category_spending(household_id, start_date, end_date)
+
+            # Get category spending data; the window total covers every
+            # category, not just the ones kept by the limit
+            category_data = await self._run(lambda db: (
+                db.query(
                     Category.id,
                     Category.name,
                     Category.color,
                     Category.icon,
-                    func.sum(Expense.amount).label('total_amount'),
-                    func.count(Expense.id).label('expense_count'),
-                    func.avg(Expense.amount).label('average_amount')
+                    func.sum(spending.c.amount).label('total_amount'),
+                    func.sum(spending.c.expense_count).label('expense_count'),
+                    func.sum(func.sum(spending.c.amount)).over().label('total_spending')
                 )
-                .outerjoin(Expense, and_(
-                    Expense.category_id == Category.id,
-                    Expense.household_id == household_id,
-                    Expense.is_active == True,
-                    Expense.expense_date >= start_date,
-                    Expense.expense_date <= end_date
-                ))
+                .join(spending, spending.c.category_id == Category.id)
                 .filter(
                     or_(
                         Category.household_id == household_id,
@@ -192,19 +302,20 @@ class AnalyticsService(BaseService[Expense, dict, dict]):
                     )
                 )
                 .group_by(Category.id, Category.name, Category.color, Category.icon)
-                .having(func.sum(Expense.amount) > 0)
+                .having(func.sum(spending.c.amount) > 0)
                 .order_by(desc('total_amount'))
+                .limit(limit)
                 .all()
-            )
+            ))
 
             # Calculate total for percentages
-            total_spending = sum(row.total_amount or 0 for row in category_data)
+            total_spending = category_data[0].total_spending if category_data else 0
 
             categories = []
             for row in category_data:
                 amount = row.total_amount or 0
                 count = row.expense_count or 0
-                avg = row.average_amount or 0
+                avg = amount / count if count else 0
                 percentage = (amount / total_spending * 100) if total_spending > 0 else 0
 
                 categories.append({
@@ -218,37 +329,32 @@ class AnalyticsService(BaseService[Expense, dict, dict]):
                     "percentage": round(percentage, 2)
                 })
 
-            # Get uncategorized expenses
-            uncategorized = (
-                self.db.query(
-                    func.sum(Expense.amount).label('total_amount'),
-                    func.count(Expense.id).label('expense_count')
-                )
-                .filter(
-                    Expense.household_id == household_id,
-                    Expense.category_id.is_(None),
-                    Expense.is_active == True,
-                    Expense.expense_date >= start_date,
-                    Expense.expense_date <= end_date
-                )
-                .first()
-            )
-
-            if uncategorized.total_amount:
-                uncategorized_amount = uncategorized.total_amount
-                uncategorized_count = uncategorized.expense_count
-                uncategorized_percentage = (uncategorized_amount / total_spending * 100) if total_spending > 0 else 0
+            # Get uncategorized expenses, listed after the categories
+            if limit is None or len(categories) < limit:
+                uncategorized = await self._run(lambda db: (
+                    db.query(
+                        func.sum(spending.c.amount).label('total_amount'),
+                        func.sum(spending.c.expense_count).label('expense_count')
+                    )
+                    .filter(or_(spending.c.category_id.is_(None), spending.c.category_id == NO_CATEGORY))
+                    .first()
+                ))
 
-                categories.append({
-                    "id": None,
-                    "name": "Uncategorized",
-                    "color": "#6B7280",
-                    "icon": "question-mark",
-                    "total_amount": float(uncategorized_amount),
-                    "expense_count": uncategorized_count,
-                    "average_amount": float(uncategorized_amount / uncategorized_count) if uncategorized_count > 0 else 0,
-                    "percentage": round(uncategorized_percentage, 2)
-                })
+                if uncategorized.total_amount:
+                    uncategorized_amount = uncategorized.total_amount
+                    uncategorized_count = uncategorized.expense_count
+                    uncategorized_percentage = (uncategorized_amount / total_spending * 100) if total_spending > 0 else 0
+
+                    categories.append({
+                        "id": None,
+                        "name": "Uncategorized",
+                        "color": "#6B7280",
+                        "icon": "question-mark",
+                        "total_amount": float(uncategorized_amount),
+                        "expense_count": uncategorized_count,
+                        "average_amount": float(uncategorized_amount / uncategorized_count) if uncategorized_count > 0 else 0,
+                        "percentage": round(uncategorized_percentage, 2)
+                    })
 
             # Get category trends (month-over-month)
             category_trends = await self._get_category_trends(household_id, start_date, end_date)
@@ -337,89 +443,81 @@ class AnalyticsService(BaseService[Expense, dict, dict]):
             if not membership:
                 return False, "You are not a member of this household", {}
 
-            # Get all household members
-            members = (
-                self.db.query(UserHousehold)
-                .options(joinedload(UserHousehold.user))
-                .filter(
-                    UserHousehold.household_id == household_id,
-                    UserHousehold.is_active == True
-                )
-                .all()
-            )
+            balance_summary = await self._build_balance_summary(household_id)
 
-            balances = []
-            total_owed = Decimal("0")
-            total_owing = Decimal("0")
-
-            for member in members:
-                # Calculate what this member owes
-                owes = (
-                    self.db.query(func.sum(ExpenseShare.share_amount))
-                    .join(Expense)
-                    .filter(
-                        ExpenseShare.user_household_id == member.id,
-                        ExpenseShare.is_paid == False,
-                        ExpenseShare.is_active == True,
-                        Expense.household_id == household_id,
-                        Expense.is_active == True
-                    )
-                    .scalar() or Decimal("0")
-                )
+            return True, "Balance calculations completed successfully", balance_summary
 
-                # Calculate what this member is owed
-                owed = (
-                    self.db.query(func.sum(ExpenseShare.share_amount))
-                    .join(Expense)
-                    .join(UserHousehold, ExpenseShare.user_household_id == UserHousehold.id)
-                    .filter(
-                        Expense.created_by == member.user_id,
-                        ExpenseShare.is_paid == False,
-                        ExpenseShare.is_active == True,
-                        Expense.household_id == household_id,
-                        Expense.is_active == True,
-                        UserHousehold.user_id != member.user_id  # Exclude their own share
-                    )
-                    .scalar() or Decimal("0")
-                )
+        except Exception as e:
+            logger.error(f"Error calculating balances: {e}")
+            return False, f"Failed to calculate balances: {str(e)}", {}
 
-                net_balance = owed - owes
-                
-                if net_balance > 0:
-                    total_owed += net_balance
-                else:
-                    total_owing += abs(net_balance)
-
-                balances.append({
-                    "user_id": str(member.user_id),
-                    "username": member.user.username if member.user else "Unknown",
-                    "nickname": member.nickname,
-                    "owes_amount": float(owes),
-                    "owed_amount": float(owed),
-                    "net_balance": float(net_balance),
-                    "status": "owed" if net_balance > 0 else "owes" if net_balance < 0 else "settled"
-                })
+    async def get_dashboard_bundle(
+        self,
+        household_id: UUID,
+        user_id: UUID,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category_limit: Optional[int] = None
+    ) -> Tuple[bool, str, Optional[DashboardBundle]]:
+        """
+        Get every result set the analytics dashboard needs in one pass.
 
-            # Calculate settlement suggestions
-            settlements = await self._calculate_settlement_suggestions(balances)
+        The spending summary, category analysis and user patterns share one
+        grouped expenses query, and a single grouped query over unpaid
+        shares feeds the balances.
 
-            balance_summary = {
-                "household_id": str(household_id),
-                "total_outstanding": float(total_owed),
-                "member_balances": balances,
-                "settlement_suggestions": settlements,
-                "summary": {
-                    "members_owed": len([b for b in balances if b["net_balance"] > 0]),
-                    "members_owing": len([b for b in balances if b["net_balance"] < 0]),
-                    "members_settled": len([b for b in balances if b["net_balance"] == 0])
-                }
+        Args:
+            household_id: Household ID
+            user_id: User ID (for permission check)
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+            category_limit: Optional maximum number of categories to return
+
+        Returns:
+            Tuple of (success, message, dashboard_bundle)
+        """
+        try:
+            # Verify household membership
+            membership = await self._verify_membership(household_id, user_id)
+            if not membership:
+                return False, "You are not a member of this household", None
+
+            # Same default range as the monthly spending summary
+            if not end_date:
+                end_date = date.today()
+            if not start_date:
+                start_date = end_date.replace(day=1)
+
+            summary, categories, user_patterns = await self._build_spending_summary(
+                household_id, start_date, end_date, "month"
+            )
+            # The grouped rows also feed the totals, so the limit applies here
+            categories = categories[:category_limit]
+
+            category_analysis = {
+                "period": {
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat()
+                },
+                "total_spending": summary["totals"]["total_amount"],
+                "categories": categories,
+                "trends": await self._get_category_trends(household_id, start_date, end_date),
+                "insights": await self._generate_category_insights(categories)
             }
 
-            return True, "Balance calculations completed successfully", balance_summary
+            balances = await self._build_balance_summary(household_id)
+
+            bundle = DashboardBundle(
+                summary=summary,
+                categories=category_analysis,
+                user_patterns=user_patterns,
+                balances=balances
+            )
+            return True, "Dashboard data generated successfully", bundle
 
         except Exception as e:
-            logger.error(f"Error calculating balances: {e}")
-            return False, f"Failed to calculate balances: {str(e)}", {}
+            logger.error(f"Error generating dashboard data: {e}")
+            return False, f"Failed to generate dashboard data: {str(e)}", None
 
     async def export_data(
         self,
@@ -457,12 +555,12 @@ class AnalyticsService(BaseService[Expense, dict, dict]):
                 start_date = end_date - timedelta(days=365)  # Last year
 
             # Get expenses with related data
-            expenses = (
-                self.db.query(Expense)
+            expenses = await self._run(lambda db: (
+                db.query(Expense)
                 .options(
                     joinedload(Expense.category),
                     joinedload(Expense.creator),
-                    joinedload(Expense.shares).joinedload(ExpenseShare.user_household)
+                    selectinload(Expense.shares).joinedload(ExpenseShare.user_household).joinedload(UserHousehold.user)
                 )
                 .filter(
                     Expense.household_id == household_id,
@@ -472,7 +570,7 @@ class AnalyticsService(BaseService[Expense, dict, dict]):
                 )
                 .order_by(desc(Expense.expense_date))
                 .all()
-            )
+            ))
 
             # Format data for export
             export_data = {
@@ -526,158 +624,547 @@ class AnalyticsService(BaseService[Expense, dict, dict]):
             logger.error(f"Error exporting data: {e}")
             return False, f"Failed to export data: {str(e)}", {}
 
-    async def _verify_membership(self, household_id: UUID, user_id: UUID) -> Optional[UserHousehold]:
-        """Verify user is a member of the household."""
-        return (
-            self.db.query(UserHousehold)
-            .filter(
-                UserHousehold.user_id == user_id,
-                UserHousehold.household_id == household_id,
-                UserHousehold.is_active == True
+    async def export_data_stream(
+        self,
+        household_id: UUID,
+        export_type: str = "csv",
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream household expenses as CSV or JSON text chunks.
+
+        Rows are read from a server-side cursor in batches of
+        EXPORT_BATCH_SIZE and each batch is written out before the next is
+        fetched, so memory use does not grow with the size of the export.
+        Household access must be checked by the caller before streaming.
+
+        Args:
+            household_id: Household ID
+            export_type: Export format (csv, json)
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+
+        Yields:
+            Encoded chunks of the export
+        """
+        if not end_date:
+            end_date = date.today()
+        if not start_date:
+            start_date = end_date - timedelta(days=365)  # Last year
+
+        stmt = (
+            select(
+                Expense.id,
+                Expense.title,
+                Expense.description,
+                Expense.amount,
+                Expense.currency,
+                Expense.expense_date,
+                Expense.created_at,
+                Category.name.label('category'),
+                User.username.label('creator'),
+                Expense.tags,
+                Expense.receipt_url
+            )
+            .outerjoin(Category, Expense.category_id == Category.id)
+            .outerjoin(User, Expense.created_by == User.id)
+            .where(
+                Expense.household_id == household_id,
+                Expense.is_active == True,
+                Expense.expense_date >= start_date,
+                Expense.expense_date <= end_date
             )
-            .first()
+            .order_by(desc(Expense.expense_date))
         )
 
-    async def _get_category_breakdown(self, expenses: List[Expense]) -> Dict[str, Any]:
-        """Get category breakdown from expenses list."""
-        category_totals = {}
-        total_amount = sum(expense.amount for expense in expenses)
-
-        for expense in expenses:
-            category_name = expense.category.name if expense.category else "Uncategorized"
-            if category_name not in category_totals:
-                category_totals[category_name] = {
-                    "amount": Decimal("0"),
-                    "count": 0,
-                    "color": expense.category.color if expense.category else "#6B7280"
-                }
-            category_totals[category_name]["amount"] += expense.amount
-            category_totals[category_name]["count"] += 1
-
-        # Convert to list with percentages
-        breakdown = []
-        for name, data in category_totals.items():
-            percentage = (data["amount"] / total_amount * 100) if total_amount > 0 else 0
-            breakdown.append({
-                "name": name,
-                "amount": float(data["amount"]),
-                "count": data["count"],
-                "percentage": round(percentage, 2),
-                "color": data["color"]
-            })
+        if export_type == "json":
+            metadata = {
+                "household_id": str(household_id),
+                "export_date": datetime.now().isoformat(),
+                "date_range": {
+                    "start": start_date.isoformat(),
+                    "end": end_date.isoformat()
+                },
+                "export_type": export_type
+            }
+            yield f'{{"metadata": {json.dumps(metadata)}, "expenses": ['
+            separator = ""
+            async for rows in self._iter_batches(stmt):
+                chunk = ", ".join(json.dumps(self._export_row(row)) for row in rows)
+                yield separator + chunk
+                separator = ", "
+            yield "]}"
+            return
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        yield buffer.getvalue()
+
+        async for rows in self._iter_batches(stmt):
+            buffer.seek(0)
+            buffer.truncate(0)
+            for row in rows:
+                data = self._export_row(row)
+                data["tags"] = ";".join(data["tags"])
+                writer.writerow(data[field] for field in EXPORT_FIELDS)
+            yield buffer.getvalue()
+
+    async def _iter_batches(self, stmt: Select) -> AsyncIterator[List[Any]]:
+        """Yield the rows of a statement in EXPORT_BATCH_SIZE batches from a server-side cursor."""
+        stmt = stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        if isinstance(self.db, AsyncSession):
+            result = await self.db.stream(stmt)
+            async for rows in result.partitions():
+                yield rows
+        else:
+            for rows in self.db.execute(stmt).partitions():
+                yield rows
 
-        return sorted(breakdown, key=lambda x: x["amount"], reverse=True)
+    @staticmethod
+    def _export_row(row: Any) -> Dict[str, Any]:
+        """Convert an export row to JSON-compatible values."""
+        return {
+            "id": str(row.id),
+            "title": row.title,
+            "description": row.description,
+            "amount": float(row.amount),
+            "currency": row.currency,
+            "expense_date": row.expense_date.isoformat(),
+            "created_at": row.created_at.isoformat(),
+            "category": row.category or "Uncategorized",
+            "creator": row.creator or "Unknown",
+            "tags": row.tags or [],
+            "receipt_url": row.receipt_url
+        }
 
-    async def _get_user_breakdown(self, expenses: List[Expense], household_id: UUID) -> List[Dict[str, Any]]:
-        """Get user breakdown from expenses list."""
-        user_totals = {}
-        total_amount = sum(expense.amount for expense in expenses)
+    async def _verify_membership(self, household_id: UUID, user_id: UUID) -> bool:
+        """
+        Verify user is a member of the household.
 
-        for expense in expenses:
-            creator_name = expense.creator.username if expense.creator else "Unknown"
-            if creator_name not in user_totals:
-                user_totals[creator_name] = {
-                    "amount": Decimal("0"),
-                    "count": 0,
-                    "user_id": str(expense.created_by) if expense.created_by else None
-                }
-            user_totals[creator_name]["amount"] += expense.amount
-            user_totals[creator_name]["count"] += 1
-
-        # Convert to list with percentages
-        breakdown = []
-        for name, data in user_totals.items():
-            percentage = (data["amount"] / total_amount * 100) if total_amount > 0 else 0
-            breakdown.append({
-                "username": name,
-                "user_id": data["user_id"],
-                "amount": float(data["amount"]),
-                "count": data["count"],
-                "percentage": round(percentage, 2)
+        Routes check access before calling the service, so the result is
+        usually already in the permission cache.
+        """
+        cached = await permission_cache.get(user_id, household_id)
+        if cached is not None:
+            return cached
+
+        stmt = select(exists().where(
+            UserHousehold.user_id == user_id,
+            UserHousehold.household_id == household_id,
+            UserHousehold.is_active == True
+        ))
+        is_member = await self._run(lambda db: db.execute(stmt).scalar())
+        await permission_cache.set(user_id, household_id, None, is_member)
+        return is_member
+
+    async def _build_balance_summary(self, household_id: UUID) -> Dict[str, Any]:
+        """Build member balances from a single grouped query over unpaid shares."""
+        members = await self._run(lambda db: (
+            db.query(UserHousehold)
+            .options(joinedload(UserHousehold.user))
+            .filter(
+                UserHousehold.household_id == household_id,
+                UserHousehold.is_active == True
+            )
+            .all()
+        ))
+
+        # Unpaid share totals per (share holder, expense creator) pair
+        share_totals = await self._run(lambda db: (
+            db.query(
+                ExpenseShare.user_household_id,
+                UserHousehold.user_id.label('share_user_id'),
+                Expense.created_by,
+                func.sum(ExpenseShare.share_amount).label('total_amount')
+            )
+            .join(Expense, ExpenseShare.expense_id == Expense.id)
+            .join(UserHousehold, ExpenseShare.user_household_id == UserHousehold.id)
+            .filter(
+                ExpenseShare.is_paid == False,
+                ExpenseShare.is_active == True,
+                Expense.household_id == household_id,
+                Expense.is_active == True
+            )
+            .group_by(ExpenseShare.user_household_id, UserHousehold.user_id, Expense.created_by)
+            .all()
+        ))
+
+        owes_by_member = {}
+        owed_by_user = {}
+        for row in share_totals:
+            amount = to_decimal(row.total_amount or 0)
+            owes_by_member[row.user_household_id] = owes_by_member.get(row.user_household_id, Decimal("0")) + amount
+            # Creators are not owed their own share
+            if row.created_by != row.share_user_id:
+                owed_by_user[row.created_by] = owed_by_user.get(row.created_by, Decimal("0")) + amount
+
+        balances = []
+        total_owed = Decimal("0")
+        total_owing = Decimal("0")
+
+        for member in members:
+            owes = owes_by_member.get(member.id, Decimal("0"))
+            owed = owed_by_user.get(member.user_id, Decimal("0"))
+            net_balance = owed - owes
+
+            if net_balance > 0:
+                total_owed += net_balance
+            else:
+                total_owing += abs(net_balance)
+
+            balances.append({
+                "user_id": str(member.user_id),
+                "username": member.user.username if member.user else "Unknown",
+                "nickname": member.nickname,
+                "owes_amount": float(owes),
+                "owed_amount": float(owed),
+                "net_balance": float(net_balance),
+                "status": "owed" if net_balance > 0 else "owes" if net_balance < 0 else "settled"
             })
 
-        return sorted(breakdown, key=lambda x: x["amount"], reverse=True)
+        # Calculate settlement suggestions
+        settlements = await self._calculate_settlement_suggestions(balances)
 
-    async def _get_time_series_data(self, expenses: List[Expense], period: str) -> List[Dict[str, Any]]:
-        """Get time series data grouped by period."""
-        time_groups = {}
+        return {
+            "household_id": str(household_id),
+            "total_outstanding": float(total_owed),
+            "member_balances": balances,
+            "settlement_suggestions": settlements,
+            "summary": {
+                "members_owed": sum(1 for b in balances if b["net_balance"] > 0),
+                "members_owing": sum(1 for b in balances if b["net_balance"] < 0),
+                "members_settled": sum(1 for b in balances if b["net_balance"] == 0)
+            }
+        }
 
-        for expense in expenses:
-            if period == "day":
-                key = expense.expense_date.isoformat()
-            elif period == "week":
-                # Get Monday of the week
-                monday = expense.expense_date - timedelta(days=expense.expense_date.weekday())
-                key = monday.isoformat()
-            elif period == "month":
-                key = expense.expense_date.strftime("%Y-%m")
-            elif period == "year":
-                key = expense.expense_date.strftime("%Y")
-            else:
-                key = expense.expense_date.isoformat()
-
-            if key not in time_groups:
-                time_groups[key] = {"amount": Decimal("0"), "count": 0}
-            time_groups[key]["amount"] += expense.amount
-            time_groups[key]["count"] += 1
-
-        # Convert to sorted list
-        time_series = []
-        for key in sorted(time_groups.keys()):
-            data = time_groups[key]
-            time_series.append({
-                "period": key,
-                "amount": float(data["amount"]),
-                "count": data["count"]
-            })
+    async def _build_spending_summary(
+        self,
+        household_id: UUID,
+        start_date: date,
+        end_date: date,
+        period: str,
+        category_ids: Optional[List[UUID]] = None,
+        user_ids: Optional[List[UUID]] = None
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Build the spending summary from grouped spending rows.
 
-        return time_series
+        The database sums amounts per (day, category, creator) for the
+        requested range plus the preceding period of equal length; totals,
+        breakdowns, the time series and the trend roll up from those rows.
+        For monthly and yearly periods, whole calendar months are read from
+        the monthly rollup and only the partial months at either end are
+        grouped from the expenses table.
 
-    async def _calculate_trends(self, household_id: UUID, start_date: date, end_date: date, period: str) -> Dict[str, Any]:
-        """Calculate spending trends."""
-        # Get previous period for comparison
+        Returns:
+            Tuple of (summary, category_totals, user_totals)
+        """
         period_length = (end_date - start_date).days
         prev_start = start_date - timedelta(days=period_length)
         prev_end = start_date - timedelta(days=1)
 
-        # Current period total
-        current_total = (
-            self.db.query(func.sum(Expense.amount))
+        # Rollup rows are dated to the first of their month, so they can
+        # only stand in for days when buckets are at least a month wide
+        full_months = []
+        if period in ("month", "year"):
+            full_months = [
+                months for months in (
+                    self._full_months(prev_start, prev_end),
+                    self._full_months(start_date, end_date)
+                )
+                if months
+            ]
+
+        # IN () filters compile to a single expanding parameter, so the cached
+        # statement is reused whatever the number of ids
+        expense_filters = []
+        rollup_filters = []
+        if category_ids:
+            expense_filters.append(Expense.category_id.in_(category_ids))
+            rollup_filters.append(ExpenseMonthlyRollup.category_id.in_(category_ids))
+        if user_ids:
+            expense_filters.append(Expense.created_by.in_(user_ids))
+            rollup_filters.append(ExpenseMonthlyRollup.user_id.in_(user_ids))
+
+        groups = await self._run(lambda db: (
+            db.query(
+                Expense.expense_date,
+                Expense.category_id,
+                Category.name.label('category_name'),
+                Category.color.label('category_color'),
+                Category.icon.label('category_icon'),
+                Expense.created_by,
+                User.username,
+                func.sum(Expense.amount).label('total_amount'),
+                func.count(Expense.id).label('expense_count')
+            )
+            .outerjoin(Category, Expense.category_id == Category.id)
+            .outerjoin(User, Expense.created_by == User.id)
             .filter(
                 Expense.household_id == household_id,
                 Expense.is_active == True,
-                Expense.expense_date >= start_date,
-                Expense.expense_date <= end_date
+                Expense.expense_date >= prev_start,
+                Expense.expense_date <= end_date,
+                *expense_filters,
+                *(not_(Expense.expense_date.between(first, last)) for first, last in full_months)
+            )
+            .group_by(
+                Expense.expense_date,
+                Expense.category_id,
+                Category.name,
+                Category.color,
+                Category.icon,
+                Expense.created_by,
+                User.username
             )
-            .scalar() or Decimal("0")
+            .all()
+        ))
+
+        if full_months:
+            groups += await self._run(lambda db: (
+                db.query(
+                    ExpenseMonthlyRollup.month.label('expense_date'),
+                    ExpenseMonthlyRollup.category_id,
+                    Category.name.label('category_name'),
+                    Category.color.label('category_color'),
+                    Category.icon.label('category_icon'),
+                    ExpenseMonthlyRollup.user_id.label('created_by'),
+                    User.username,
+                    ExpenseMonthlyRollup.total_amount,
+                    ExpenseMonthlyRollup.expense_count
+                )
+                .outerjoin(Category, ExpenseMonthlyRollup.category_id == Category.id)
+                .outerjoin(User, ExpenseMonthlyRollup.user_id == User.id)
+                .filter(
+                    ExpenseMonthlyRollup.household_id == household_id,
+                    ExpenseMonthlyRollup.expense_count > 0,
+                    *rollup_filters,
+                    or_(*(ExpenseMonthlyRollup.month.between(first, last) for first, last in full_months))
+                )
+                .all()
+            ))
+
+        previous_total = sum(
+            (to_decimal(row.total_amount) for row in groups if row.expense_date <= prev_end),
+            Decimal("0")
         )
 
-        # Previous period total
-        previous_total = (
-            self.db.query(func.sum(Expense.amount))
+        total_amount = Decimal("0")
+        expense_count = 0
+        categories_by_id = {}
+        users_by_id = {}
+        time_groups = {}
+
+        for row in groups:
+            if row.expense_date < start_date:
+                continue
+
+            amount = to_decimal(row.total_amount)
+            total_amount += amount
+            expense_count += row.expense_count
+            category_id = None if row.category_id == NO_CATEGORY else row.category_id
+            created_by = None if row.created_by == NO_USER else row.created_by
+
+            category = categories_by_id.setdefault(category_id, {
+                "id": str(category_id) if category_id else None,
+                "name": row.category_name or "Uncategorized",
+                "color": row.category_color or "#6B7280",
+                "icon": row.category_icon or "question-mark",
+                "amount": Decimal("0"),
+                "count": 0
+            })
+            category["amount"] += amount
+            category["count"] += row.expense_count
+
+            creator = users_by_id.setdefault(created_by, {
+                "user_id": str(created_by) if created_by else None,
+                "username": row.username or "Unknown",
+                "amount": Decimal("0"),
+                "count": 0
+            })
+            creator["amount"] += amount
+            creator["count"] += row.expense_count
+
+            bucket = time_groups.setdefault(
+                self._period_key(row.expense_date, period),
+                {"amount": Decimal("0"), "count": 0}
+            )
+            bucket["amount"] += amount
+            bucket["count"] += row.expense_count
+
+        def share_of_total(amount: Decimal) -> float:
+            return round(float(amount / total_amount * 100), 2) if total_amount > 0 else 0
+
+        category_totals = [
+            {
+                "id": data["id"],
+                "name": data["name"],
+                "color": data["color"],
+                "icon": data["icon"],
+                "total_amount": float(data["amount"]),
+                "expense_count": data["count"],
+                "average_amount": float(data["amount"] / data["count"]) if data["count"] else 0,
+                "percentage": share_of_total(data["amount"])
+            }
+            for data in sorted(categories_by_id.values(), key=lambda x: x["amount"], reverse=True)
+        ]
+
+        user_totals = [
+            {
+                "user_id": data["user_id"],
+                "username": data["username"],
+                "total_amount": float(data["amount"]),
+                "expense_count": data["count"],
+                "average_amount": float(data["amount"] / data["count"]) if data["count"] else 0,
+                "percentage": share_of_total(data["amount"])
+            }
+            for data in sorted(users_by_id.values(), key=lambda x: x["amount"], reverse=True)
+        ]
+
+        top_expenses = await self._run(lambda db: (
+            db.query(Expense)
+            .options(joinedload(Expense.category), joinedload(Expense.creator))
             .filter(
                 Expense.household_id == household_id,
                 Expense.is_active == True,
-                Expense.expense_date >= prev_start,
-                Expense.expense_date <= prev_end
+                Expense.expense_date >= start_date,
+                Expense.expense_date <= end_date,
+                *expense_filters
             )
-            .scalar() or Decimal("0")
-        )
+            .order_by(desc(Expense.amount))
+            .limit(10)
+            .all()
+        ))
 
-        # Calculate change
         if previous_total > 0:
-            change_percentage = ((current_total - previous_total) / previous_total * 100)
+            change_percentage = (total_amount - previous_total) / previous_total * 100
         else:
-            change_percentage = 100 if current_total > 0 else 0
-
-        return {
-            "current_period": float(current_total),
-            "previous_period": float(previous_total),
-            "change_amount": float(current_total - previous_total),
-            "change_percentage": round(float(change_percentage), 2),
-            "trend": "up" if change_percentage > 0 else "down" if change_percentage < 0 else "stable"
+            change_percentage = 100 if total_amount > 0 else 0
+
+        summary = {
+            "period": {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "period_type": period
+            },
+            "totals": {
+                "total_amount": float(total_amount),
+                "expense_count": expense_count,
+                "average_expense": float(total_amount / expense_count) if expense_count > 0 else 0.0,
+                "daily_average": float(total_amount / max(1, period_length + 1))
+            },
+            "category_breakdown": [
+                {
+                    "name": data["name"],
+                    "amount": data["total_amount"],
+                    "count": data["expense_count"],
+                    "percentage": data["percentage"],
+                    "color": data["color"]
+                }
+                for data in category_totals
+            ],
+            "user_breakdown": [
+                {
+                    "username": data["username"],
+                    "user_id": data["user_id"],
+                    "amount": data["total_amount"],
+                    "count": data["expense_count"],
+                    "percentage": data["percentage"]
+                }
+                for data in user_totals
+            ],
+            "time_series": [
+                {
+                    "period": key,
+                    "amount": float(time_groups[key]["amount"]),
+                    "count": time_groups[key]["count"]
+                }
+                for key in sorted(time_groups)
+            ],
+            "top_expenses": [
+                {
+                    "id": str(expense.id),
+                    "title": expense.title,
+                    "amount": float(expense.amount),
+                    "date": expense.expense_date.isoformat(),
+                    "category": expense.category.name if expense.category else "Uncategorized",
+                    "creator": expense.creator.username if expense.creator else "Unknown"
+                }
+                for expense in top_expenses
+            ],
+            "trends": {
+                "current_period": float(total_amount),
+                "previous_period": float(previous_total),
+                "change_amount": float(total_amount - previous_total),
+                "change_percentage": round(float(change_percentage), 2),
+                "trend": "up" if change_percentage > 0 else "down" if change_percentage < 0 else "stable"
+            }
         }
 
+        return summary, category_totals, user_totals
+
+    @staticmethod
+    def _full_months(start_date: date, end_date: date) -> Optional[Tuple[date, date]]:
+        """Get the first and last day of the whole calendar months inside a date range."""
+        if start_date.day == 1:
+            first = start_date
+        else:
+            first = (start_date.replace(day=28) + timedelta(days=4)).replace(day=1)
+        last = (end_date + timedelta(days=1)).replace(day=1) - timedelta(days=1)
+        return (first, last) if first < last else None
+
+    @staticmethod
+    def _category_spending(household_id: UUID, start_date: date, end_date: date) -> Subquery:
+        """
+        Get per-category spending rows for a date range.
+
+        Whole calendar months come from the monthly rollup; the partial
+        months at either end come from the expenses table.
+        """
+        full_months = AnalyticsService._full_months(start_date, end_date)
+
+        expenses = select(
+            Expense.category_id.label('category_id'),
+            Expense.amount.label('amount'),
+            literal(1).label('expense_count')
+        ).where(
+            Expense.household_id == household_id,
+            Expense.is_active == True,
+            Expense.expense_date >= start_date,
+            Expense.expense_date <= end_date
+        )
+        if not full_months:
+            return expenses.subquery()
+
+        first, last = full_months
+        rollup = select(
+            ExpenseMonthlyRollup.category_id,
+            ExpenseMonthlyRollup.total_amount,
+            ExpenseMonthlyRollup.expense_count
+        ).where(
+            ExpenseMonthlyRollup.household_id == household_id,
+            ExpenseMonthlyRollup.month.between(first, last)
+        )
+        return union_all(
+            expenses.where(not_(Expense.expense_date.between(first, last))),
+            rollup
+        ).subquery()
+
+    @staticmethod
+    def _period_key(expense_date: date, period: str) -> str:
+        """Get the time series bucket key for a date."""
+        if period == "week":
+            # Get Monday of the week
+            monday = expense_date - timedelta(days=expense_date.weekday())
+            return monday.isoformat()
+        if period == "month":
+            return expense_date.strftime("%Y-%m")
+        if period == "year":
+            return expense_date.strftime("%Y")
+        return expense_date.isoformat()
+
     async def _get_category_trends(self, household_id: UUID, start_date: date, end_date: date) -> List[Dict[str, Any]]:
         """Get category spending trends."""
         # This is a simplified version - could be expanded for more detailed trend analysis
@@ -8,17 +8,19 @@ from decimal import Decimal
 from typing import List, Optional, Tuple, Dict, Any
 from uuid import UUID
 
-from sqlalchemy import and_, or_, desc, asc, func, String
+from sqlalchemy import and_, or_, desc, asc, func, select, String
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app.core.services.base_service import BaseService
-from app.core.utils.helpers import split_amount_equally, format_currency
+from app.core.utils.helpers import format_currency
 from app.modules.expenses.models.expense import Expense
 from app.modules.expenses.models.expense_share import ExpenseShare
+from app.modules.expenses.models.expense_share_payment import ExpenseSharePayment
 from app.modules.expenses.models.household import Household
 from app.modules.expenses.models.user_household import UserHousehold
 from app.modules.expenses.models.category import Category
+from app.modules.expenses.utils.analytics_cache import analytics_cache
 
 logger = logging.getLogger(__name__)
 
@@ -124,6 +126,7 @@ class ExpenseService(BaseService[Expense, dict, dict]):
                 return False, message, None
 
             self.db.commit()
+            await analytics_cache.invalidate(household_id)
             logger.info(f"Created expense {expense.id} in household {household_id}")
 
             # Reload expense with all relationships for proper response serialization
@@ -196,7 +199,7 @@ class ExpenseService(BaseService[Expense, dict, dict]):
                 .options(
                     joinedload(Expense.category),
                     joinedload(Expense.creator),
-                    joinedload(Expense.shares).joinedload(ExpenseShare.user_household).joinedload(UserHousehold.user)
+                    selectinload(Expense.shares).joinedload(ExpenseShare.user_household).joinedload(UserHousehold.user)
                 )
                 .filter(
                     Expense.household_id == household_id,
@@ -308,7 +311,7 @@ class ExpenseService(BaseService[Expense, dict, dict]):
                 .options(
                     joinedload(Expense.category),
                     joinedload(Expense.creator),
-                    joinedload(Expense.shares).joinedload(ExpenseShare.user_household).joinedload(UserHousehold.user),
+                    selectinload(Expense.shares).joinedload(ExpenseShare.user_household).joinedload(UserHousehold.user),
                     joinedload(Expense.household)
                 )
                 .filter(
@@ -395,11 +398,16 @@ class ExpenseService(BaseService[Expense, dict, dict]):
                 if hasattr(expense, field) and field not in ["id", "created_at", "household_id"]:
                     setattr(expense, field, value)
 
+            # Shares and their allocations keep a copy of the currency
+            if "currency" in updates:
+                await self._sync_share_currency(expense)
+
             # Recalculate splits if amount changed and requested
             if amount_changed and recalculate_splits:
                 await self._recalculate_expense_shares(expense)
 
             self.db.commit()
+            await analytics_cache.invalidate(expense.household_id)
             logger.info(f"Updated expense {expense_id}")
 
             return True, "Expense updated successfully", expense
@@ -455,6 +463,7 @@ class ExpenseService(BaseService[Expense, dict, dict]):
                 share.is_active = False
 
             self.db.commit()
+            await analytics_cache.invalidate(expense.household_id)
             logger.info(f"Deleted expense {expense_id}")
 
             return True, "Expense deleted successfully"
@@ -757,18 +766,10 @@ class ExpenseService(BaseService[Expense, dict, dict]):
                 return False, "No active members found in household"
 
             if split_method == "equal":
-                # Equal split among all members
-                share_amounts = split_amount_equally(expense.amount, len(members))
-                
-                for i, member in enumerate(members):
-                    share = ExpenseShare(
-                        expense_id=expense.id,
-                        user_household_id=member.id,
-                        share_amount=share_amounts[i],
-                        share_percentage=Decimal("100") / len(members),
-                        is_paid=False
-                    )
-                    self.db.add(share)
+                # Equal split among all members, flushed as one batched insert
+                self.db.add_all(ExpenseShare.create_equal_shares(
+                    expense.id, [member.id for member in members], expense.amount, expense.currency
+                ))
 
             elif split_method == "custom" and custom_splits:
                 # Custom split amounts
@@ -787,6 +788,7 @@ class ExpenseService(BaseService[Expense, dict, dict]):
                             user_household_id=member.id,
                             share_amount=share_amount,
                             share_percentage=share_percentage,
+                            currency=expense.currency,
                             is_paid=False
                         )
                         self.db.add(share)
@@ -800,6 +802,16 @@ class ExpenseService(BaseService[Expense, dict, dict]):
             logger.error(f"Error creating expense shares: {e}")
             return False, f"Failed to create expense shares: {str(e)}"
 
+    async def _sync_share_currency(self, expense: Expense) -> None:
+        """Copy the expense currency onto its shares and their payment allocations."""
+        share_ids = select(ExpenseShare.id).where(ExpenseShare.expense_id == expense.id)
+        self.db.query(ExpenseShare).filter(
+            ExpenseShare.expense_id == expense.id
+        ).update({ExpenseShare.currency: expense.currency}, synchronize_session="fetch")
+        self.db.query(ExpenseSharePayment).filter(
+            ExpenseSharePayment.expense_share_id.in_(share_ids)
+        ).update({ExpenseSharePayment.currency: expense.currency}, synchronize_session="fetch")
+
     async def _recalculate_expense_shares(self, expense: Expense) -> None:
         """Recalculate and update shares for an expense."""
         try:
@@ -826,19 +838,10 @@ class ExpenseService(BaseService[Expense, dict, dict]):
             for share in existing_shares:
                 share.is_active = False
 
-            # Create new equal shares
-            share_amounts = split_amount_equally(expense.amount, len(household_members))
-
-            for i, member in enumerate(household_members):
-                share = ExpenseShare(
-                    expense_id=expense.id,
-                    user_household_id=member.id,
-                    share_amount=share_amounts[i],
-                    share_percentage=Decimal("100") / len(household_members),
-                    is_paid=False,
-                    is_active=True
-                )
-                self.db.add(share)
+            # Create new equal shares, flushed as one batched insert
+            self.db.add_all(ExpenseShare.create_equal_shares(
+                expense.id, [member.id for member in household_members], expense.amount, expense.currency
+            ))
 
         except Exception as e:
             logger.error(f"Error recalculating expense shares: {e}")
@@ -866,7 +869,7 @@ class ExpenseService(BaseService[Expense, dict, dict]):
                 .options(
                     joinedload(Expense.category),
                     joinedload(Expense.creator),
-                    joinedload(Expense.shares).joinedload(ExpenseShare.user_household).joinedload(UserHousehold.user)
+                    selectinload(Expense.shares).joinedload(ExpenseShare.user_household).joinedload(UserHousehold.user)
                 )
                 .join(ExpenseShare)
                 .join(UserHousehold, ExpenseShare.user_household_id == UserHousehold.id)
@@ -934,7 +937,7 @@ class ExpenseService(BaseService[Expense, dict, dict]):
                 .options(
                     joinedload(Expense.category),
                     joinedload(Expense.creator),
-                    joinedload(Expense.shares).joinedload(ExpenseShare.user_household).joinedload(UserHousehold.user)
+                    selectinload(Expense.shares).joinedload(ExpenseShare.user_household).joinedload(UserHousehold.user)
                 )
                 .join(ExpenseShare)
                 .filter(
@@ -15,6 +15,8 @@ from app.core.utils.security import generate_invite_code
 from app.modules.expenses.models.household import Household, UserHouseholdRole
 from app.modules.expenses.models.user_household import UserHousehold
 from app.modules.expenses.models.category import Category
+from app.modules.expenses.utils.analytics_cache import analytics_cache
+from app.modules.expenses.utils.permission_cache import permission_cache
 
 logger = logging.getLogger(__name__)
 
@@ -142,6 +144,26 @@ class HouseholdService(BaseService[Household, dict, dict]):
             logger.error(f"Error getting household {household_id}: {e}")
             return None
 
+    async def get_household_name(self, household_id: UUID) -> Optional[str]:
+        """
+        Get an active household's name without loading the household.
+
+        Args:
+            household_id: Household ID
+
+        Returns:
+            Household name or None
+        """
+        try:
+            return (
+                self.db.query(Household.name)
+                .filter(Household.id == household_id, Household.is_active == True)
+                .scalar()
+            )
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting household {household_id}: {e}")
+            return None
+
     async def join_household_by_invite(
         self,
         user_id: UUID,
@@ -192,6 +214,8 @@ class HouseholdService(BaseService[Household, dict, dict]):
                     if nickname:
                         existing_membership.set_nickname(nickname)
                     self.db.commit()
+                    await permission_cache.invalidate(user_id, household.id)
+                    await analytics_cache.invalidate(household.id)
                     return True, "Rejoined household successfully", household
 
             # Create new membership
@@ -204,6 +228,8 @@ class HouseholdService(BaseService[Household, dict, dict]):
             )
             self.db.add(user_household)
             self.db.commit()
+            await permission_cache.invalidate(user_id, household.id)
+            await analytics_cache.invalidate(household.id)
 
             logger.info(f"User {user_id} joined household {household.id}")
             return True, "Joined household successfully", household
@@ -260,6 +286,8 @@ class HouseholdService(BaseService[Household, dict, dict]):
             # Leave household
             membership.leave_household()
             self.db.commit()
+            await permission_cache.invalidate(user_id, household_id)
+            await analytics_cache.invalidate(household_id)
 
             logger.info(f"User {user_id} left household {household_id}")
             return True, "Left household successfully"
@@ -336,6 +364,8 @@ class HouseholdService(BaseService[Household, dict, dict]):
             # Update role
             target_membership.role = new_role
             self.db.commit()
+            await permission_cache.invalidate(target_user_id, household_id)
+            await analytics_cache.invalidate(household_id)
 
             logger.info(f"Updated role for user {target_user_id} in household {household_id}")
             return True, "Member role updated successfully"
@@ -399,6 +429,8 @@ class HouseholdService(BaseService[Household, dict, dict]):
             # Remove member
             target_membership.leave_household()
             self.db.commit()
+            await permission_cache.invalidate(target_user_id, household_id)
+            await analytics_cache.invalidate(household_id)
 
             logger.info(f"Removed user {target_user_id} from household {household_id}")
             return True, "Member removed successfully"
@@ -452,6 +484,7 @@ class HouseholdService(BaseService[Household, dict, dict]):
             household.settings = current_settings
 
             self.db.commit()
+            await analytics_cache.invalidate(household_id)
             logger.info(f"Updated settings for household {household_id}")
 
             return True, "Household settings updated successfully", household
@@ -552,13 +585,19 @@ class HouseholdService(BaseService[Household, dict, dict]):
             Dictionary with household statistics
         """
         try:
-            household = self.get(self.db, household_id)
-            if not household:
+            # Count in SQL alongside the household instead of loading members
+            row = (
+                self.db.query(Household, Household.member_count, Household.admin_count)
+                .filter(Household.id == household_id)
+                .first()
+            )
+            if not row:
                 return {}
 
+            household, member_count, admin_count = row
             return {
-                "member_count": household.member_count,
-                "admin_count": household.admin_count,
+                "member_count": member_count,
+                "admin_count": admin_count,
                 "created_at": household.created_at,
                 "settings": household.settings or {},
                 "invite_code": household.invite_code
@@ -568,14 +607,39 @@ class HouseholdService(BaseService[Household, dict, dict]):
             logger.error(f"Error getting household stats: {e}")
             return {}
 
-    async def check_user_permission(
+    async def get_member_counts(self, household_ids: List[UUID]) -> dict:
+        """
+        Count active members of several households in one query.
+
+        Args:
+            household_ids: Household IDs
+
+        Returns:
+            Mapping of household ID to active member count
+        """
+        if not household_ids:
+            return {}
+
+        try:
+            rows = (
+                self.db.query(Household.id, Household.member_count)
+                .filter(Household.id.in_(household_ids))
+                .all()
+            )
+            return dict(rows)
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error counting household members: {e}")
+            return {}
+
+    async def get_membership_if_authorized(
         self,
         user_id: UUID,
         household_id: UUID,
         required_role: Optional[UserHouseholdRole] = None
-    ) -> bool:
+    ) -> Optional[UserHousehold]:
         """
-        Check if user has permission to access household.
+        Get the user's active membership if it grants access to the household.
 
         Args:
             user_id: User ID
@@ -583,7 +647,7 @@ class HouseholdService(BaseService[Household, dict, dict]):
             required_role: Required role (None for any member)
 
         Returns:
-            True if user has permission
+            Membership object or None if the user lacks permission
         """
         try:
             query = (
@@ -598,8 +662,34 @@ class HouseholdService(BaseService[Household, dict, dict]):
             if required_role:
                 query = query.filter(UserHousehold.role == required_role)
 
-            return query.first() is not None
+            return query.first()
 
         except Exception as e:
             logger.error(f"Error checking user permission: {e}")
-            return False 
\ No newline at end of file
+            return None
+
+    async def check_user_permission(
+        self,
+        user_id: UUID,
+        household_id: UUID,
+        required_role: Optional[UserHouseholdRole] = None
+    ) -> bool:
+        """
+        Check if user has permission to access household.
+
+        Args:
+            user_id: User ID
+            household_id: Household ID
+            required_role: Required role (None for any member)
+
+        Returns:
+            True if user has permission
+        """
+        cached = await permission_cache.get(user_id, household_id, required_role)
+        if cached is not None:
+            return cached
+
+        membership = await self.get_membership_if_authorized(user_id, household_id, required_role)
+        allowed = membership is not None
+        await permission_cache.set(user_id, household_id, required_role, allowed)
+        return allowed 
\ No newline at end of file
@@ -8,7 +8,7 @@ from decimal import Decimal
 from typing import List, Tuple, Optional, Dict, Any
 from uuid import UUID
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import and_, or_, desc, asc, func
 from sqlalchemy.exc import IntegrityError
 
@@ -19,6 +19,7 @@ from app.modules.expenses.models.expense_share import ExpenseShare
 from app.modules.expenses.models.expense import Expense
 from app.modules.expenses.models.user_household import UserHousehold
 from app.modules.expenses.models.household import Household
+from app.modules.expenses.utils.analytics_cache import analytics_cache
 
 logger = logging.getLogger(__name__)
 
@@ -127,6 +128,7 @@ class PaymentService(BaseService[Payment, dict, dict]):
 
             self.db.add(payment)
             self.db.commit()
+            await analytics_cache.invalidate(household_id)
             self.db.refresh(payment)
 
             logger.info(f"Created payment {payment.id} for household {household_id}")
@@ -176,13 +178,17 @@ class PaymentService(BaseService[Payment, dict, dict]):
             if not membership:
                 return False, "You are not a member of this household", {}
 
-            # Build base query
+            # Build base query; allocations are summed for every listed
+            # payment, so batch the active ones into one query
             query = (
                 self.db.query(Payment)
                 .options(
                     joinedload(Payment.payer),
                     joinedload(Payment.payee),
-                    joinedload(Payment.household)
+                    joinedload(Payment.household),
+                    selectinload(
+                        Payment.expense_share_payments.and_(ExpenseSharePayment.is_active == True)
+                    )
                 )
                 .filter(
                     Payment.household_id == household_id,
@@ -249,6 +255,49 @@ class PaymentService(BaseService[Payment, dict, dict]):
             logger.error(f"Error getting payments: {e}")
             return False, f"Failed to retrieve payments: {str(e)}", {}
 
+    async def get_allocation_summaries(
+        self,
+        payment_ids: List[UUID]
+    ) -> Dict[UUID, List[Any]]:
+        """
+        Get the active expense share allocations of several payments.
+
+        Only the columns needed for a summary are selected, instead of
+        loading the allocation, share and expense rows in full.
+
+        Args:
+            payment_ids: Payment IDs
+
+        Returns:
+            Dictionary mapping payment ID to its allocation rows
+        """
+        allocations = {payment_id: [] for payment_id in payment_ids}
+        if not payment_ids:
+            return allocations
+
+        rows = (
+            self.db.query(
+                ExpenseSharePayment.payment_id,
+                ExpenseShare.id.label('expense_share_id'),
+                ExpenseShare.expense_id,
+                Expense.title.label('expense_title'),
+                ExpenseShare.share_amount,
+                ExpenseSharePayment.amount.label('allocated_amount')
+            )
+            .join(ExpenseShare, ExpenseSharePayment.expense_share_id == ExpenseShare.id)
+            .join(Expense, ExpenseShare.expense_id == Expense.id)
+            .filter(
+                ExpenseSharePayment.payment_id.in_(payment_ids),
+                ExpenseSharePayment.is_active == True
+            )
+            .all()
+        )
+
+        for row in rows:
+            allocations[row.payment_id].append(row)
+
+        return allocations
+
     async def get_payment_by_id(
         self,
         payment_id: UUID,
@@ -339,6 +388,7 @@ class PaymentService(BaseService[Payment, dict, dict]):
 
             payment.updated_at = datetime.utcnow()
             self.db.commit()
+            await analytics_cache.invalidate(payment.household_id)
             self.db.refresh(payment)
 
             logger.info(f"Updated payment {payment_id}")
@@ -414,6 +464,7 @@ class PaymentService(BaseService[Payment, dict, dict]):
                 esp.updated_at = datetime.utcnow()
 
             self.db.commit()
+            await analytics_cache.invalidate(payment.household_id)
 
             affected_count = len(affected_shares)
             logger.info(f"Deleted payment {payment_id} and reverted {affected_count} expense shares to unpaid status")
@@ -486,11 +537,13 @@ class PaymentService(BaseService[Payment, dict, dict]):
             esp = ExpenseSharePayment.create_allocation(
                 payment_id=payment_id,
                 expense_share_id=expense_share_id,
-                amount=amount
+                amount=amount,
+                currency=expense_share.currency
             )
 
             self.db.add(esp)
             self.db.commit()
+            await analytics_cache.invalidate(payment.household_id)
             self.db.refresh(esp)
 
             logger.info(f"Linked payment {payment_id} to expense share {expense_share_id}")
@@ -550,6 +603,7 @@ class PaymentService(BaseService[Payment, dict, dict]):
             esp.is_active = False
             esp.updated_at = datetime.utcnow()
             self.db.commit()
+            await analytics_cache.invalidate(payment.household_id)
 
             logger.info(f"Unlinked payment {payment_id} from expense share {expense_share_id}")
             return True, "Payment unlinked successfully"
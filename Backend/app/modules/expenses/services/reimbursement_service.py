@@ -8,10 +8,11 @@ from decimal import Decimal
 from typing import List, Tuple, Optional, Dict, Any
 from uuid import UUID
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, defer, joinedload
 from sqlalchemy import and_
 
 from app.core.services.base_service import BaseService
+from app.core.utils.helpers import to_decimal
 from app.modules.expenses.models.payment import Payment, PaymentType, PaymentMethod
 from app.modules.expenses.models.expense_share_payment import ExpenseSharePayment
 from app.modules.expenses.models.expense_share import ExpenseShare
@@ -19,6 +20,7 @@ from app.modules.expenses.models.expense import Expense
 from app.modules.expenses.models.user_household import UserHousehold
 from app.modules.expenses.models.household import Household
 from app.modules.expenses.services.payment_service import PaymentService
+from app.modules.expenses.utils.analytics_cache import analytics_cache
 
 logger = logging.getLogger(__name__)
 
@@ -136,6 +138,7 @@ class ReimbursementService:
                 )
 
             self.db.commit()
+            await analytics_cache.invalidate(expense.household_id)
 
             logger.info(f"Successfully reimbursed expense {expense_id} with payment {payment.id}")
             return True, "Expense reimbursed successfully", payment
@@ -204,7 +207,9 @@ class ReimbursementService:
                 self.db.query(ExpenseShare)
                 .join(Expense)
                 .options(
-                    joinedload(ExpenseShare.expense),
+                    # Only amounts are read here, skip the free-text columns
+                    defer(ExpenseShare.payment_notes),
+                    joinedload(ExpenseShare.expense).defer(Expense.description),
                     joinedload(ExpenseShare.user_household)
                 )
                 .filter(
@@ -260,6 +265,7 @@ class ReimbursementService:
                 )
 
             self.db.commit()
+            await analytics_cache.invalidate(household_id)
 
             logger.info(f"Successfully paid all expenses for user {target_user_id} with payment {payment.id}")
             return True, f"All expenses paid successfully. Total: {payment.formatted_amount}", payment
@@ -340,7 +346,7 @@ class ReimbursementService:
                 
                 for allocation in expense_allocations:
                     expense_share_id = allocation.get("expense_share_id")
-                    allocation_amount = Decimal(str(allocation.get("amount", 0)))
+                    allocation_amount = to_decimal(allocation.get("amount", 0))
                     
                     if allocation_amount <= 0:
                         continue
@@ -371,7 +377,8 @@ class ReimbursementService:
                     esp = ExpenseSharePayment.create_allocation(
                         payment_id=payment.id,
                         expense_share_id=expense_share_id,
-                        amount=allocation_amount
+                        amount=allocation_amount,
+                        currency=expense_share.currency
                     )
                     self.db.add(esp)
                     
@@ -385,6 +392,7 @@ class ReimbursementService:
                     total_allocated += allocation_amount
 
             self.db.commit()
+            await analytics_cache.invalidate(household_id)
 
             unallocated_amount = amount - (total_allocated if expense_allocations else Decimal('0'))
             allocation_message = ""
@@ -450,6 +458,7 @@ class ReimbursementService:
                 self.db.query(ExpenseShare)
                 .join(Expense)
                 .options(
+                    defer(ExpenseShare.payment_notes),
                     joinedload(ExpenseShare.expense).joinedload(Expense.category),
                     joinedload(ExpenseShare.user_household)
                 )
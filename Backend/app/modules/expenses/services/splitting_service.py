@@ -3,18 +3,19 @@ Splitting service for managing expense splits and calculations.
 """
 
 import logging
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from typing import List, Optional, Tuple, Dict, Any
 from uuid import UUID
 
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer, load_only
 
 from app.core.services.base_service import BaseService
-from app.core.utils.helpers import split_amount_equally
+from app.core.utils.helpers import percentage_of, split_amount_equally
 from app.modules.expenses.models.expense import Expense
 from app.modules.expenses.models.expense_share import ExpenseShare
 from app.modules.expenses.models.user_household import UserHousehold
+from app.modules.expenses.utils.analytics_cache import analytics_cache
 
 logger = logging.getLogger(__name__)
 
@@ -86,9 +87,7 @@ class SplittingService(BaseService[ExpenseShare, dict, dict]):
             # Calculate all but the last amount
             percentage_items = list(percentages.items())
             for i, (user_id, percentage) in enumerate(percentage_items[:-1]):
-                split_amount = (amount * percentage / 100).quantize(
-                    Decimal("0.01"), rounding=ROUND_HALF_UP
-                )
+                split_amount = percentage_of(amount, percentage)
                 split_amounts[user_id] = split_amount
                 remaining_amount -= split_amount
 
@@ -253,6 +252,7 @@ class SplittingService(BaseService[ExpenseShare, dict, dict]):
             updated_shares = await self._update_shares(expense, members, new_splits)
 
             self.db.commit()
+            await analytics_cache.invalidate(expense.household_id)
             logger.info(f"Updated splits for expense {expense_id}")
 
             return True, "Expense splits updated successfully", updated_shares
@@ -342,6 +342,7 @@ class SplittingService(BaseService[ExpenseShare, dict, dict]):
             # Mark as paid
             share.mark_as_paid(payment_method, payment_notes)
             self.db.commit()
+            await analytics_cache.invalidate(expense.household_id)
 
             logger.info(f"Marked share as paid for user {user_id} in expense {expense_id}")
             return True, "Share marked as paid successfully", share
@@ -428,6 +429,7 @@ class SplittingService(BaseService[ExpenseShare, dict, dict]):
             # Mark as unpaid
             share.mark_as_unpaid()
             self.db.commit()
+            await analytics_cache.invalidate(expense.household_id)
 
             logger.info(f"Marked share as unpaid for user {user_id} in expense {expense_id}")
             return True, "Share marked as unpaid successfully", share
@@ -471,6 +473,7 @@ class SplittingService(BaseService[ExpenseShare, dict, dict]):
             shares = (
                 self.db.query(ExpenseShare)
                 .join(Expense)
+                .options(defer(ExpenseShare.payment_notes))
                 .filter(
                     ExpenseShare.user_household_id == membership.id,
                     Expense.household_id == household_id,
@@ -488,6 +491,7 @@ class SplittingService(BaseService[ExpenseShare, dict, dict]):
             # Get expenses created by this user
             created_expenses = (
                 self.db.query(Expense)
+                .options(load_only(Expense.id))
                 .filter(
                     Expense.created_by == user_id,
                     Expense.household_id == household_id,
@@ -502,6 +506,7 @@ class SplittingService(BaseService[ExpenseShare, dict, dict]):
                 unpaid_shares = (
                     self.db.query(ExpenseShare)
                     .join(UserHousehold)
+                    .options(defer(ExpenseShare.payment_notes))
                     .filter(
                         ExpenseShare.expense_id == expense.id,
                         ExpenseShare.is_paid == False,
@@ -631,6 +636,7 @@ class SplittingService(BaseService[ExpenseShare, dict, dict]):
                             user_household_id=member.id,
                             share_amount=split_data["amount"],
                             share_percentage=split_data["percentage"],
+                            currency=expense.currency,
                             is_paid=False
                         )
                         self.db.add(share)
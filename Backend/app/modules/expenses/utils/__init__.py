@@ -0,0 +1,11 @@
+"""
+Expenses module utilities.
+"""
+
+from .analytics_cache import analytics_cache
+from .permission_cache import permission_cache
+
+__all__ = [
+    "analytics_cache",
+    "permission_cache",
+]
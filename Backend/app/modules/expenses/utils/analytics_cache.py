@@ -0,0 +1,145 @@
+"""
+Redis cache for household analytics responses.
+
+Entries are stored under ``analytics:{household_id}:{generation}:{name}:{digest}``
+where the digest covers the request parameters. Writes that change a
+household's details, categories, expenses, shares, payments or members
+bump the household's generation counter (``analytics:gen:{household_id}``), so every cached
+response for that household is bypassed at once and left to expire.
+Without Redis every lookup misses and nothing is stored.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+
+from app.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_KEY_PREFIX = "analytics:"
+GENERATION_KEY_PREFIX = "analytics:gen:"
+
+
+class AnalyticsCache:
+    """Household-scoped response cache with generation-based invalidation."""
+
+    async def generation(self, household_id: UUID) -> int:
+        """
+        Get a household's cache generation.
+
+        Args:
+            household_id: Household UUID
+
+        Returns:
+            Generation counter, or 0 without Redis
+        """
+        redis = get_redis()
+        if redis is None:
+            return 0
+
+        try:
+            return int(await redis.get(f"{GENERATION_KEY_PREFIX}{household_id}") or 0)
+        except Exception as e:
+            logger.warning(f"Analytics cache generation lookup failed: {e}")
+            return 0
+
+    async def entry_key(self, household_id: UUID, name: str, params: dict[str, Any]) -> str | None:
+        """
+        Get the cache key for an analytics response.
+
+        The key embeds the household's current generation, so a request
+        should compute it once and use it for both the lookup and the store:
+        a response computed before an invalidation then lands under the old
+        generation and is never served.
+
+        Args:
+            household_id: Household UUID
+            name: Endpoint name
+            params: Request parameters the response depends on
+
+        Returns:
+            Cache key, or None when caching is unavailable
+        """
+        redis = get_redis()
+        if redis is None:
+            return None
+
+        try:
+            generation = await redis.get(f"{GENERATION_KEY_PREFIX}{household_id}") or 0
+        except Exception as e:
+            logger.warning(f"Analytics cache generation lookup failed: {e}")
+            return None
+
+        encoded = json.dumps(jsonable_encoder(params), sort_keys=True)
+        digest = hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+        return f"{ANALYTICS_KEY_PREFIX}{household_id}:{generation}:{name}:{digest}"
+
+    async def get(self, key: str | None) -> Any | None:
+        """
+        Get a cached analytics response.
+
+        Args:
+            key: Key from ``entry_key``
+
+        Returns:
+            Cached JSON-compatible response or None on a miss
+        """
+        redis = get_redis()
+        if redis is None or key is None:
+            return None
+
+        try:
+            cached = await redis.get(key)
+        except Exception as e:
+            logger.warning(f"Analytics cache lookup failed: {e}")
+            return None
+
+        return json.loads(cached) if cached is not None else None
+
+    async def set(self, key: str | None, value: Any) -> None:
+        """
+        Cache an analytics response.
+
+        Args:
+            key: Key from ``entry_key``, computed before the response was built
+            value: Response to cache
+        """
+        redis = get_redis()
+        if redis is None or key is None:
+            return
+
+        try:
+            await redis.set(
+                key,
+                json.dumps(jsonable_encoder(value)),
+                ex=settings.analytics_cache_ttl_seconds
+            )
+        except Exception as e:
+            logger.warning(f"Analytics cache store failed: {e}")
+
+    async def invalidate(self, household_id: UUID) -> None:
+        """
+        Drop every cached analytics response for a household.
+
+        Args:
+            household_id: Household UUID
+        """
+        redis = get_redis()
+        if redis is None:
+            return
+
+        try:
+            # The counter never expires: resetting it could revive old entries
+            await redis.incr(f"{GENERATION_KEY_PREFIX}{household_id}")
+        except Exception as e:
+            logger.warning(f"Analytics cache invalidation failed: {e}")
+
+
+# Global analytics cache instance
+analytics_cache = AnalyticsCache()
@@ -0,0 +1,98 @@
+"""
+Redis cache for household permission checks.
+
+Each (user, household) pair is stored as a hash under
+``household_perm:{user_id}:{household_id}`` with one field per required
+role (``any`` when only membership is checked) holding ``1`` or ``0``.
+Membership changes delete the whole hash, so a join, leave, removal or
+role change is seen on the next check instead of after the TTL.
+Without Redis every lookup misses and nothing is stored.
+"""
+
+import logging
+from uuid import UUID
+
+from app.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+PERMISSION_KEY_PREFIX = "household_perm:"
+
+
+class PermissionCache:
+    """Short-lived cache of household permission check results."""
+
+    @staticmethod
+    def _key(user_id: UUID, household_id: UUID) -> str:
+        return f"{PERMISSION_KEY_PREFIX}{user_id}:{household_id}"
+
+    @staticmethod
+    def _field(required_role) -> str:
+        return required_role.value if required_role else "any"
+
+    async def get(self, user_id: UUID, household_id: UUID, required_role=None) -> bool | None:
+        """
+        Get a cached permission check result.
+
+        Args:
+            user_id: User UUID
+            household_id: Household UUID
+            required_role: Required role (None for any member)
+
+        Returns:
+            Cached result or None on a miss
+        """
+        redis = get_redis()
+        if redis is None:
+            return None
+
+        try:
+            cached = await redis.hget(self._key(user_id, household_id), self._field(required_role))
+        except Exception as e:
+            logger.warning(f"Permission cache lookup failed: {e}")
+            return None
+
+        return cached == "1" if cached is not None else None
+
+    async def set(self, user_id: UUID, household_id: UUID, required_role, allowed: bool) -> None:
+        """
+        Cache a permission check result.
+
+        Args:
+            user_id: User UUID
+            household_id: Household UUID
+            required_role: Required role (None for any member)
+            allowed: Whether the check granted access
+        """
+        redis = get_redis()
+        if redis is None:
+            return
+
+        key = self._key(user_id, household_id)
+        try:
+            await redis.hset(key, self._field(required_role), "1" if allowed else "0")
+            await redis.expire(key, settings.household_permission_cache_ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Permission cache store failed: {e}")
+
+    async def invalidate(self, user_id: UUID, household_id: UUID) -> None:
+        """
+        Drop the cached permission results of a user in a household.
+
+        Args:
+            user_id: User UUID
+            household_id: Household UUID
+        """
+        redis = get_redis()
+        if redis is None:
+            return
+
+        try:
+            await redis.delete(self._key(user_id, household_id))
+        except Exception as e:
+            logger.warning(f"Permission cache invalidation failed: {e}")
+
+
+# Global permission cache instance
+permission_cache = PermissionCache()
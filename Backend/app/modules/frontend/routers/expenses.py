@@ -238,13 +238,14 @@ async def expense_add_form(
             return RedirectResponse(url="/onboarding", status_code=status.HTTP_302_FOUND)
         
         # Prepare household data for the form
+        member_counts = await household_service.get_member_counts([h.id for h in user_households])
         households_data = []
         for household in user_households:
             households_data.append({
                 "id": str(household.id),
                 "name": household.name,
                 "description": household.description or "",
-                "member_count": len(household.members) if hasattr(household, 'members') else 0
+                "member_count": member_counts.get(household.id, 0)
             })
         
         logger.info(f"User has {len(user_households)} households available")
@@ -556,13 +557,14 @@ async def expense_edit_form(
         )
         
         # Prepare household data
+        member_counts = await household_service.get_member_counts([h.id for h in user_households])
         households_data = []
         for household in user_households:
             households_data.append({
                 "id": str(household.id),
                 "name": household.name,
                 "description": household.description or "",
-                "member_count": len(household.members) if hasattr(household, 'members') else 0
+                "member_count": member_counts.get(household.id, 0)
             })
         
         # Create expense data for JavaScript serialization
@@ -15,6 +15,7 @@ from app.database import get_db
 from app.modules.auth.dependencies import get_current_user_from_cookie_or_header
 from app.modules.expenses.models.payment import Payment
 from app.modules.expenses.services.payment_service import PaymentService
+from app.core.utils.helpers import to_decimal
 
 router = APIRouter()
 
@@ -66,8 +67,8 @@ async def payment_history_page(
         ) or Decimal("0.00")
         
         summary = {
-            "total_paid": Decimal(str(total_paid)),
-            "total_received": Decimal(str(total_received))
+            "total_paid": to_decimal(total_paid),
+            "total_received": to_decimal(total_received)
         }
     
     return templates.TemplateResponse(
@@ -9,7 +9,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from uuid import UUID
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import desc, and_, or_, func
 
 from app.core.services.base_service import BaseService
@@ -140,7 +140,7 @@ class LiveService:
             query = self.db.query(Expense).options(
                 joinedload(Expense.creator),
                 joinedload(Expense.category),
-                joinedload(Expense.shares)
+                selectinload(Expense.shares)
             ).filter(Expense.is_active == True)
             
             # Filter by household if provided
@@ -225,8 +225,9 @@ class LiveService:
                 # Determine payment status
                 payment_status = 'unpaid'
                 if expense.shares:
-                    paid_shares = sum(1 for share in expense.shares if share.is_active and share.is_paid)
-                    total_shares = sum(1 for share in expense.shares if share.is_active)
+                    share_stats = expense.share_stats()
+                    paid_shares = share_stats.paid
+                    total_shares = share_stats.paid + share_stats.unpaid
                     
                     if paid_shares == total_shares and total_shares > 0:
                         payment_status = 'paid'
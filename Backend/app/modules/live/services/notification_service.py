@@ -189,7 +189,7 @@ class NotificationService:
         Returns:
             Count of cleared notifications
         """
-        count = len([n for n in self.pending_notifications if not n["dismissed"]])
+        count = sum(1 for n in self.pending_notifications if not n["dismissed"])
         for notification in self.pending_notifications:
             notification["dismissed"] = True
         return count
@@ -4,11 +4,14 @@ Pytest configuration and fixtures.
 
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
-from app.database import Base, get_db
+from app.database import Base, get_async_db, get_async_session_factory, get_db
 from app.main import app
+from app.modules.expenses.routers.analytics import get_analytics_service
+from app.modules.expenses.services import AnalyticsService
 
 # Test database URL (in-memory SQLite for testing)
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -62,6 +65,9 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    # The analytics routes use an AsyncSession in production; the service
+    # accepts the sync test session as well
+    app.dependency_overrides[get_analytics_service] = lambda: AnalyticsService(db_session)
 
     from fastapi.testclient import TestClient
     with TestClient(app) as test_client:
@@ -70,6 +76,49 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def async_client(tmp_path):
+    """
+    Create a test client whose analytics routes run on a real AsyncSession.
+
+    The sync and async engines share one SQLite file, so rows committed
+    through the returned sync session are visible to both.
+
+    Yields:
+        Tuple of (test_client, sync_session)
+    """
+    database_path = tmp_path / "async.db"
+    sync_engine = create_engine(
+        f"sqlite:///{database_path}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=sync_engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)()
+
+    # NullPool keeps no connection bound to the test client's event loop
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool)
+    AsyncTestingSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        yield session
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_session_factory] = lambda: AsyncTestingSessionLocal
+
+    from fastapi.testclient import TestClient
+    with TestClient(app) as test_client:
+        yield test_client, session
+
+    app.dependency_overrides.clear()
+    session.close()
+    sync_engine.dispose()
+
+
 @pytest.fixture
 def sample_user_data():
     """Sample user data for testing."""
@@ -383,7 +383,9 @@ class TestAdminRouter:
             email="updated@example.com",
             username="updated"
         )
-        mock_user_service_instance.update = AsyncMock(return_value=updated_user)
+        mock_user_service_instance.update_user_profile = AsyncMock(
+            return_value=(True, "Profile updated successfully", updated_user)
+        )
         
         # Override dependencies
         def override_get_current_admin_user():
@@ -417,7 +419,9 @@ class TestAdminRouter:
         mock_db = Mock(spec=Session)
         
         mock_user_service_instance = Mock()
-        mock_user_service_instance.update = AsyncMock(return_value=None)
+        mock_user_service_instance.update_user_profile = AsyncMock(
+            return_value=(False, "User not found", None)
+        )
         
         # Override dependencies
         def override_get_current_admin_user():
@@ -529,7 +533,9 @@ class TestAdminRouter:
         mock_db = Mock(spec=Session)
         
         mock_user_service_instance = Mock()
-        mock_user_service_instance.delete = AsyncMock(return_value=True)
+        mock_user_service_instance.delete_user = AsyncMock(
+            return_value=(True, "User deleted successfully")
+        )
         
         # Override dependencies
         def override_get_current_admin_user():
@@ -197,7 +197,7 @@ class TestAuthRouters:
         with patch('app.modules.auth.routers.auth.get_db') as mock_get_db:
             with patch('app.modules.auth.services.auth_service.AuthService.request_password_reset') as mock_reset:
                 mock_get_db.return_value = mock_db
-                mock_reset.return_value = (True, "Password reset link has been sent", "t***@example.com")
+                mock_reset.return_value = (True, "Password reset link has been sent", "t***@example.com", "reset_token")
                 
                 response = client.post("/api/auth/forgot-password", json={
                     "email": "test@example.com"
@@ -220,6 +220,7 @@ class TestAuthRouters:
                 mock_service.request_password_reset = AsyncMock(return_value=(
                     False,
                     "User not found",
+                    None,
                     None
                 ))
                 
@@ -188,7 +188,7 @@ class TestAuthRouterIntegration:
     @patch('app.modules.auth.services.auth_service.AuthService.request_password_reset')
     def test_forgot_password_success(self, mock_reset, client):
         """Test successful password reset request."""
-        mock_reset.return_value = (True, "Reset email sent", "t***@example.com")
+        mock_reset.return_value = (True, "Reset email sent", "t***@example.com", "reset_token")
         
         response = client.post(
             "/api/auth/forgot-password",
@@ -203,7 +203,7 @@ class TestAuthRouterIntegration:
     @patch('app.modules.auth.services.auth_service.AuthService.request_password_reset')
     def test_forgot_password_failure(self, mock_reset, client):
         """Test password reset request for non-existent email."""
-        mock_reset.return_value = (False, "Email not found", None)
+        mock_reset.return_value = (False, "Email not found", None, None)
         
         response = client.post(
             "/api/auth/forgot-password",
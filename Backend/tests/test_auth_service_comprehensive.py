@@ -8,14 +8,24 @@ from uuid import uuid4
 from datetime import datetime, timedelta
 
 from app.modules.auth.services.auth_service import AuthService
+from app.modules.auth.utils.login_guard import LOGIN_RATE_LIMITED_MESSAGE
 from app.modules.auth.models.user import User, UserRole
-from app.modules.auth.models.password_reset import PasswordResetToken
-from app.modules.auth.models.email_verification import EmailVerificationToken
 from app.modules.auth.models.user_session import UserSession
 from app.modules.auth.models.password_history import PasswordHistory
 from app.modules.auth.schemas.user import UserCreate, UserResponse
 
 
+def mock_result(value=None, values=None):
+    """Build a mock ``execute()`` result returning the given row(s)."""
+    result = Mock()
+    result.scalar_one_or_none.return_value = value
+    result.first.return_value = value
+    result.scalars.return_value.first.return_value = value
+    result.scalars.return_value.all.return_value = values if values is not None else []
+    result.all.return_value = values if values is not None else []
+    return result
+
+
 class TestAuthServiceComprehensive:
     """Comprehensive test cases for AuthService."""
     
@@ -24,12 +34,13 @@ class TestAuthServiceComprehensive:
         """Create a mock database session."""
         db = Mock()
         db.add = Mock()
-        db.commit = Mock()
-        db.refresh = Mock()
-        db.query = Mock()
-        db.get = Mock()
-        db.rollback = Mock()
-        db.flush = Mock()
+        db.add_all = Mock()
+        db.execute = AsyncMock(return_value=mock_result())
+        db.commit = AsyncMock()
+        db.refresh = AsyncMock()
+        db.get = AsyncMock()
+        db.rollback = AsyncMock()
+        db.flush = AsyncMock()
         return db
     
     @pytest.fixture
@@ -56,12 +67,9 @@ class TestAuthServiceComprehensive:
     @pytest.mark.asyncio
     async def test_register_user_success_basic(self, auth_service, mock_db):
         """Test successful basic user registration."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None  # No existing user
+        mock_db.execute.return_value = mock_result(None)  # No existing user
         
-        with patch('app.modules.auth.services.auth_service.validate_email') as mock_validate_email:
+        with patch('app.modules.auth.services.auth_service.validate_email_address') as mock_validate_email:
             with patch('app.modules.auth.services.auth_service.validate_password_strength_detailed') as mock_validate_password:
                 with patch('app.modules.auth.services.auth_service.hash_password') as mock_hash:
                     with patch('app.modules.auth.services.auth_service.generate_verification_token') as mock_token:
@@ -81,19 +89,18 @@ class TestAuthServiceComprehensive:
         assert success is True
         assert "successfully" in message
         assert user is not None
-        mock_db.add.assert_called()
-        mock_db.flush.assert_called_once()
+        added = mock_db.add_all.call_args[0][0]
+        assert added[0] is user
+        assert all(row.user_id == user.id for row in added[1:])
+        mock_db.flush.assert_not_called()
         mock_db.commit.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_register_user_admin_creation(self, auth_service, mock_db):
         """Test user registration by admin."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_db.execute.return_value = mock_result(None)
         
-        with patch('app.modules.auth.services.auth_service.validate_email') as mock_validate_email:
+        with patch('app.modules.auth.services.auth_service.validate_email_address') as mock_validate_email:
             with patch('app.modules.auth.services.auth_service.validate_password_strength_detailed') as mock_validate_password:
                 with patch('app.modules.auth.services.auth_service.hash_password') as mock_hash:
                     with patch('app.modules.auth.services.auth_service.generate_verification_token') as mock_token:
@@ -113,10 +120,31 @@ class TestAuthServiceComprehensive:
         assert success is True
         assert "successfully" in message
 
+    @pytest.mark.asyncio
+    async def test_register_users_bulk(self, auth_service, mock_db):
+        """Test bulk user registration with set-based inserts."""
+        users = [
+            UserCreate(email=f"user{i}@example.com", username=f"user{i}", password="StrongPass123!")
+            for i in range(3)
+        ]
+        
+        with patch('app.modules.auth.services.auth_service.hash_password') as mock_hash:
+            mock_hash.return_value = "hashed_password"
+            
+            success, message, count = await auth_service.register_users_bulk(users)
+        
+        assert success is True
+        assert count == 3
+        # One executemany per table
+        assert mock_db.execute.call_count == 3
+        user_rows = mock_db.execute.call_args_list[0][0][1]
+        assert [row["username"] for row in user_rows] == ["user0", "user1", "user2"]
+        mock_db.commit.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_register_user_invalid_email(self, auth_service):
         """Test registration with invalid email."""
-        with patch('app.modules.auth.services.auth_service.validate_email') as mock_validate_email:
+        with patch('app.modules.auth.services.auth_service.validate_email_address') as mock_validate_email:
             mock_validate_email.return_value = False
             
             success, message, user = await auth_service.register_user(
@@ -132,7 +160,7 @@ class TestAuthServiceComprehensive:
     @pytest.mark.asyncio
     async def test_register_user_weak_password(self, auth_service):
         """Test registration with weak password."""
-        with patch('app.modules.auth.services.auth_service.validate_email') as mock_validate_email:
+        with patch('app.modules.auth.services.auth_service.validate_email_address') as mock_validate_email:
             with patch('app.modules.auth.services.auth_service.validate_password_strength_detailed') as mock_validate_password:
                 mock_validate_email.return_value = True
                 mock_validate_password.return_value = {
@@ -154,12 +182,9 @@ class TestAuthServiceComprehensive:
     @pytest.mark.asyncio
     async def test_register_user_email_exists(self, auth_service, mock_db, sample_user):
         """Test registration with existing email."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_user  # Existing user
+        mock_db.execute.return_value = mock_result(values=[sample_user])  # Existing user
         
-        with patch('app.modules.auth.services.auth_service.validate_email') as mock_validate_email:
+        with patch('app.modules.auth.services.auth_service.validate_email_address') as mock_validate_email:
             mock_validate_email.return_value = True
             
             success, message, user = await auth_service.register_user(
@@ -175,13 +200,10 @@ class TestAuthServiceComprehensive:
     @pytest.mark.asyncio
     async def test_register_user_username_exists(self, auth_service, mock_db, sample_user):
         """Test registration with existing username."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        # First call returns None (email check), second returns existing user (username check)
-        mock_query.first.side_effect = [None, sample_user]
+        # Single availability query returns a user matching only the username
+        mock_db.execute.return_value = mock_result(values=[sample_user])
         
-        with patch('app.modules.auth.services.auth_service.validate_email') as mock_validate_email:
+        with patch('app.modules.auth.services.auth_service.validate_email_address') as mock_validate_email:
             with patch('app.modules.auth.services.auth_service.validate_password_strength_detailed') as mock_validate_password:
                 mock_validate_email.return_value = True
                 mock_validate_password.return_value = {"is_valid": True, "errors": []}
@@ -201,13 +223,10 @@ class TestAuthServiceComprehensive:
         """Test registration with database integrity error."""
         from sqlalchemy.exc import IntegrityError
         
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_db.execute.return_value = mock_result(None)
         mock_db.commit.side_effect = IntegrityError("", "", "")
         
-        with patch('app.modules.auth.services.auth_service.validate_email') as mock_validate_email:
+        with patch('app.modules.auth.services.auth_service.validate_email_address') as mock_validate_email:
             with patch('app.modules.auth.services.auth_service.validate_password_strength_detailed') as mock_validate_password:
                 with patch('app.modules.auth.services.auth_service.hash_password') as mock_hash:
                     mock_validate_email.return_value = True
@@ -228,13 +247,10 @@ class TestAuthServiceComprehensive:
     @pytest.mark.asyncio
     async def test_register_user_general_exception(self, auth_service, mock_db):
         """Test registration with general exception."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_db.execute.return_value = mock_result(None)
         mock_db.commit.side_effect = Exception("Database error")
         
-        with patch('app.modules.auth.services.auth_service.validate_email') as mock_validate_email:
+        with patch('app.modules.auth.services.auth_service.validate_email_address') as mock_validate_email:
             with patch('app.modules.auth.services.auth_service.validate_password_strength_detailed') as mock_validate_password:
                 with patch('app.modules.auth.services.auth_service.hash_password') as mock_hash:
                     mock_validate_email.return_value = True
@@ -256,10 +272,7 @@ class TestAuthServiceComprehensive:
     async def test_authenticate_user_success(self, auth_service, mock_db, sample_user):
         """Test successful user authentication."""
         # Mock database query chain
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_user
+        mock_db.execute.return_value = mock_result(sample_user)
         
         with patch('app.modules.auth.services.auth_service.verify_password_secure') as mock_verify:
             with patch('app.modules.auth.services.auth_service.create_user_tokens') as mock_tokens:
@@ -270,6 +283,7 @@ class TestAuthServiceComprehensive:
                         mock_tokens.return_value = {
                             "access_token": "access_token",
                             "refresh_token": "refresh_token",
+                            "refresh_jti": "refresh_jti",
                             "expires_in": 3600
                         }
                         mock_session.return_value = "session_token"
@@ -300,10 +314,7 @@ class TestAuthServiceComprehensive:
     @pytest.mark.asyncio
     async def test_authenticate_user_not_found(self, auth_service, mock_db):
         """Test authentication with non-existent user."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_db.execute.return_value = mock_result(None)
         
         success, message, token_data = await auth_service.authenticate_user(
             email_or_username="nonexistent@example.com",
@@ -314,14 +325,48 @@ class TestAuthServiceComprehensive:
         assert "Invalid credentials" in message
         assert token_data is None
 
+    @pytest.mark.asyncio
+    async def test_authenticate_user_rate_limited(self, auth_service, mock_db):
+        """Test authentication is rejected before any lookup when rate limited."""
+        with patch('app.modules.auth.services.auth_service.login_guard') as mock_guard:
+            mock_guard.is_rate_limited = AsyncMock(return_value=True)
+            
+            success, message, token_data = await auth_service.authenticate_user(
+                email_or_username="test@example.com",
+                password="password",
+                ip_address="203.0.113.7"
+            )
+        
+        assert success is False
+        assert message == LOGIN_RATE_LIMITED_MESSAGE
+        assert token_data is None
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_authenticate_user_cached_unknown_login(self, auth_service, mock_db):
+        """Test a cached unknown login skips the database but still burns a hash."""
+        with patch('app.modules.auth.services.auth_service.login_guard') as mock_guard:
+            mock_guard.is_rate_limited = AsyncMock(return_value=False)
+            mock_guard.is_unknown_login = AsyncMock(return_value=True)
+            mock_guard.remember_unknown_login = AsyncMock()
+            mock_guard.verify_dummy_password = AsyncMock()
+            
+            success, message, token_data = await auth_service.authenticate_user(
+                email_or_username="Ghost@Example.com",
+                password="password"
+            )
+        
+        assert success is False
+        assert "Invalid credentials" in message
+        mock_db.execute.assert_not_called()
+        mock_guard.is_unknown_login.assert_awaited_once_with("ghost@example.com")
+        mock_guard.verify_dummy_password.assert_awaited_once_with("password")
+
     @pytest.mark.asyncio
     async def test_authenticate_user_inactive(self, auth_service, mock_db, sample_user):
         """Test authentication with inactive user."""
         sample_user.is_active = False
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_user
+        mock_db.execute.return_value = mock_result(sample_user)
         
         success, message, token_data = await auth_service.authenticate_user(
             email_or_username="test@example.com",
@@ -335,10 +380,7 @@ class TestAuthServiceComprehensive:
     @pytest.mark.asyncio
     async def test_authenticate_user_wrong_password(self, auth_service, mock_db, sample_user):
         """Test authentication with wrong password."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_user
+        mock_db.execute.return_value = mock_result(sample_user)
         
         with patch('app.modules.auth.services.auth_service.verify_password_secure') as mock_verify:
             mock_verify.return_value = False
@@ -363,10 +405,7 @@ class TestAuthServiceComprehensive:
         mock_session = Mock()
         mock_session.is_active = True
         mock_session.deactivate = Mock()  # Add deactivate method
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = mock_session
+        mock_db.execute.return_value = mock_result(mock_session)
         
         with patch('app.modules.auth.services.auth_service.blacklist_token') as mock_blacklist:
             mock_blacklist.return_value = True  # Return True for success
@@ -388,10 +427,7 @@ class TestAuthServiceComprehensive:
         user_id = uuid4()
         access_token = "access_token"
         
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_db.execute.return_value = mock_result(None)
         
         with patch('app.modules.auth.services.auth_service.blacklist_token') as mock_blacklist:
             mock_blacklist.return_value = True  # Return True for success
@@ -407,18 +443,8 @@ class TestAuthServiceComprehensive:
     @pytest.mark.asyncio
     async def test_request_password_reset_success(self, auth_service, mock_db, sample_user):
         """Test successful password reset request."""
-        # Mock user query
-        mock_user_query = Mock()
-        mock_user_query.filter.return_value = mock_user_query
-        mock_user_query.first.return_value = sample_user
-        
-        # Mock existing tokens query
-        mock_tokens_query = Mock()
-        mock_tokens_query.filter.return_value = mock_tokens_query
-        mock_tokens_query.all.return_value = []  # No existing tokens
-        
-        # Setup query side effects for different calls
-        mock_db.query.side_effect = [mock_user_query, mock_tokens_query]
+        # User lookup, then bulk deactivation of existing tokens
+        mock_db.execute.side_effect = [mock_result(sample_user), Mock()]
         
         with patch('app.modules.auth.services.auth_service.generate_password_reset_token_secure') as mock_token:
             with patch('app.modules.auth.services.auth_service.mask_email') as mock_mask:
@@ -429,28 +455,29 @@ class TestAuthServiceComprehensive:
                     mock_reset_token_class.return_value = mock_reset_token_instance
                     
                     # Don't patch the class used in the query, just the constructor
-                    success, message, masked_email = await auth_service.request_password_reset(
+                    success, message, masked_email, reset_token = await auth_service.request_password_reset(
                         email="test@example.com"
                     )
         
         assert success is True
         assert "sent" in message
         assert masked_email == "t***@example.com"
+        assert reset_token == "reset_token"
         mock_db.add.assert_called()  # Just check that add was called
         mock_db.commit.assert_called_once()
+        deactivate_stmt = mock_db.execute.call_args_list[1][0][0]
+        assert deactivate_stmt.is_update
+        assert deactivate_stmt.table.name == "password_reset_tokens"
 
     @pytest.mark.asyncio
     async def test_request_password_reset_user_not_found(self, auth_service, mock_db):
         """Test password reset request for non-existent user."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_db.execute.return_value = mock_result(None)
         
         with patch('app.modules.auth.services.auth_service.mask_email') as mock_mask:
             mock_mask.return_value = "n***@example.com"
             
-            success, message, masked_email = await auth_service.request_password_reset(
+            success, message, masked_email, reset_token = await auth_service.request_password_reset(
                 email="nonexistent@example.com"
             )
         
@@ -458,23 +485,22 @@ class TestAuthServiceComprehensive:
         assert success is True
         assert "reset link has been sent" in message
         assert masked_email == "n***@example.com"
+        assert reset_token is None
 
     @pytest.mark.asyncio
     async def test_request_password_reset_inactive_user(self, auth_service, mock_db, sample_user):
         """Test password reset request for inactive user."""
         sample_user.is_active = False
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_user
+        mock_db.execute.return_value = mock_result(sample_user)
         
-        success, message, masked_email = await auth_service.request_password_reset(
+        success, message, masked_email, reset_token = await auth_service.request_password_reset(
             email="test@example.com"
         )
         
         assert success is False
         assert "deactivated" in message
         assert masked_email is None
+        assert reset_token is None
 
     @pytest.mark.asyncio
     async def test_reset_password_success(self, auth_service, mock_db, sample_user):
@@ -485,61 +511,41 @@ class TestAuthServiceComprehensive:
         reset_token.token = "reset_token"
         reset_token.expires_at = datetime.utcnow() + timedelta(hours=1)
         reset_token.is_used = False
-        reset_token.mark_as_used = Mock()
-        
-        # Mock password history query
-        mock_history_query = Mock()
-        mock_history_query.filter.return_value = mock_history_query
-        mock_history_query.order_by.return_value = mock_history_query
-        mock_history_query.limit.return_value = mock_history_query
-        mock_history_query.all.return_value = []  # No password history
-        
-        # Setup query side effects for different calls
-        def query_side_effect(model):
-            if model == PasswordResetToken:
-                mock_query = Mock()
-                mock_query.filter.return_value = mock_query
-                mock_query.first.return_value = reset_token
-                return mock_query
-            elif model == User:
-                mock_query = Mock()
-                mock_query.filter.return_value = mock_query
-                mock_query.first.return_value = sample_user
-                return mock_query
-            else:  # PasswordHistory
-                return mock_history_query
-        
-        mock_db.query.side_effect = query_side_effect
+        reset_token.use_token = Mock()
+        
+        # Token, user and password history (empty) come back in one query
+        mock_db.execute.return_value = mock_result(values=[(reset_token, sample_user, None)])
         
         with patch('app.modules.auth.services.auth_service.validate_password_strength_detailed') as mock_validate:
             with patch('app.modules.auth.services.auth_service.hash_password') as mock_hash:
                 with patch('app.modules.auth.services.auth_service.check_password_history') as mock_check_history:
-                    with patch('app.modules.auth.services.auth_service.PasswordHistory') as mock_password_history_class:
-                        mock_validate.return_value = {"is_valid": True, "errors": []}
-                        mock_hash.return_value = "new_hashed_password"
-                        mock_check_history.return_value = (True, None)  # Password allowed
-                        mock_password_history_instance = Mock()
-                        mock_password_history_class.return_value = mock_password_history_instance
-                        
-                        success, message = await auth_service.reset_password(
-                            token="reset_token",
-                            new_password="NewStrongPass123!"
-                        )
+                    mock_validate.return_value = {"is_valid": True, "errors": []}
+                    mock_hash.return_value = "new_hashed_password"
+                    mock_check_history.return_value = (True, None)  # Password allowed
+                    
+                    success, message = await auth_service.reset_password(
+                        token="reset_token",
+                        new_password="NewStrongPass123!"
+                    )
         
         assert success is True
         assert "successfully" in message
-        reset_token.mark_as_used.assert_called_once()
+        reset_token.use_token.assert_called_once()
         assert sample_user.hashed_password == "new_hashed_password"
-        mock_db.add.assert_called_with(mock_password_history_instance)
+        history_entry = mock_db.add.call_args[0][0]
+        assert isinstance(history_entry, PasswordHistory)
+        assert history_entry.password_hash == "new_hashed_password"
+        mock_db.execute.assert_called_once()
         mock_db.commit.assert_called_once()
 
+        from sqlalchemy.dialects import postgresql
+        lookup_sql = str(mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert lookup_sql.endswith("FOR UPDATE OF password_reset_tokens SKIP LOCKED")
+
     @pytest.mark.asyncio
     async def test_reset_password_invalid_token(self, auth_service, mock_db):
         """Test password reset with invalid token."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_db.execute.return_value = mock_result(None)
         
         success, message = await auth_service.reset_password(
             token="invalid_token",
@@ -553,10 +559,7 @@ class TestAuthServiceComprehensive:
     async def test_reset_password_expired_token(self, auth_service, mock_db):
         """Test password reset with expired token."""
         # The service filters out expired tokens in the query, so it returns None
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None  # Expired tokens are filtered out
+        mock_db.execute.return_value = mock_result(None)  # Expired tokens are filtered out
         
         success, message = await auth_service.reset_password(
             token="expired_token",
@@ -570,10 +573,7 @@ class TestAuthServiceComprehensive:
     async def test_reset_password_used_token(self, auth_service, mock_db):
         """Test password reset with already used token."""
         # The service filters out used tokens in the query, so it returns None
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None  # Used tokens are filtered out
+        mock_db.execute.return_value = mock_result(None)  # Used tokens are filtered out
         
         success, message = await auth_service.reset_password(
             token="used_token",
@@ -586,47 +586,26 @@ class TestAuthServiceComprehensive:
     @pytest.mark.asyncio
     async def test_verify_email_success(self, auth_service, mock_db, sample_user):
         """Test successful email verification."""
-        sample_user.email_verified = False
+        # Token claim returns the user ID, then the user is updated
+        mock_db.execute.side_effect = [mock_result(sample_user.id), Mock()]
         
-        # Mock verification token
-        verification_token = Mock()
-        verification_token.user_id = sample_user.id
-        verification_token.token = "verification_token"
-        verification_token.expires_at = datetime.utcnow() + timedelta(hours=1)
-        verification_token.is_used = False
-        verification_token.mark_as_used = Mock()
-        
-        # Setup query side effects for different calls
-        def query_side_effect(model):
-            if model == EmailVerificationToken:
-                mock_query = Mock()
-                mock_query.filter.return_value = mock_query
-                mock_query.first.return_value = verification_token
-                return mock_query
-            elif model == User:
-                mock_query = Mock()
-                mock_query.filter.return_value = mock_query
-                mock_query.first.return_value = sample_user
-                return mock_query
-            return Mock()
-        
-        mock_db.query.side_effect = query_side_effect
-        
-        success, message = await auth_service.verify_email(token="verification_token")
+        with patch('app.modules.auth.services.auth_service.profile_cache.invalidate', new_callable=AsyncMock) as mock_invalidate:
+            success, message = await auth_service.verify_email(token="verification_token")
         
         assert success is True
         assert "verified" in message
-        assert sample_user.email_verified is True
-        verification_token.mark_as_used.assert_called_once()
+        claim_stmt = mock_db.execute.call_args_list[0][0][0]
+        assert claim_stmt.is_update
+        assert claim_stmt.table.name == "email_verification_tokens"
+        verify_stmt = mock_db.execute.call_args_list[1][0][0]
+        assert verify_stmt.table.name == "users"
         mock_db.commit.assert_called_once()
+        mock_invalidate.assert_awaited_once_with(sample_user.id)
 
     @pytest.mark.asyncio
     async def test_verify_email_invalid_token(self, auth_service, mock_db):
         """Test email verification with invalid token."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_db.execute.return_value = mock_result(None)
         
         success, message = await auth_service.verify_email(token="invalid_token")
         
@@ -638,26 +617,7 @@ class TestAuthServiceComprehensive:
         """Test email verification when already verified."""
         sample_user.email_verified = True
         
-        verification_token = Mock()
-        verification_token.user_id = sample_user.id
-        verification_token.expires_at = datetime.utcnow() + timedelta(hours=1)
-        verification_token.is_used = False
-        
-        # Setup query side effects for different calls
-        def query_side_effect(model):
-            if model == EmailVerificationToken:
-                mock_query = Mock()
-                mock_query.filter.return_value = mock_query
-                mock_query.first.return_value = verification_token
-                return mock_query
-            elif model == User:
-                mock_query = Mock()
-                mock_query.filter.return_value = mock_query
-                mock_query.first.return_value = sample_user
-                return mock_query
-            return Mock()
-        
-        mock_db.query.side_effect = query_side_effect
+        mock_db.execute.side_effect = [mock_result(sample_user.id), Mock()]
         
         success, message = await auth_service.verify_email(token="verification_token")
         
@@ -669,23 +629,8 @@ class TestAuthServiceComprehensive:
         """Test successful verification email resend."""
         sample_user.email_verified = False
         
-        # Mock existing tokens query
-        mock_tokens_query = Mock()
-        mock_tokens_query.filter.return_value = mock_tokens_query
-        mock_tokens_query.all.return_value = []  # No existing tokens
-        
-        # Setup query side effects for different calls
-        def query_side_effect(model):
-            if model == User:
-                mock_query = Mock()
-                mock_query.filter.return_value = mock_query
-                mock_query.first.return_value = sample_user
-                return mock_query
-            elif model == EmailVerificationToken:
-                return mock_tokens_query
-            return Mock()
-        
-        mock_db.query.side_effect = query_side_effect
+        # User lookup, then bulk deactivation of existing tokens
+        mock_db.execute.side_effect = [mock_result(sample_user), Mock()]
         
         with patch('app.modules.auth.services.auth_service.generate_verification_token') as mock_token:
             with patch('app.modules.auth.models.email_verification.EmailVerificationToken') as mock_verification_token_class:
@@ -701,14 +646,14 @@ class TestAuthServiceComprehensive:
         assert "sent" in message
         mock_db.add.assert_called()  # Just check that add was called
         mock_db.commit.assert_called_once()
+        deactivate_stmt = mock_db.execute.call_args_list[1][0][0]
+        assert deactivate_stmt.is_update
+        assert deactivate_stmt.table.name == "email_verification_tokens"
 
     @pytest.mark.asyncio
     async def test_resend_verification_email_user_not_found(self, auth_service, mock_db):
         """Test verification email resend for non-existent user."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_db.execute.return_value = mock_result(None)
         
         success, message = await auth_service.resend_verification_email(
             email="nonexistent@example.com"
@@ -722,10 +667,7 @@ class TestAuthServiceComprehensive:
         """Test verification email resend when already verified."""
         sample_user.email_verified = True
         
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_user
+        mock_db.execute.return_value = mock_result(sample_user)
         
         success, message = await auth_service.resend_verification_email(
             email="test@example.com"
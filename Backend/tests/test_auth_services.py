@@ -21,11 +21,12 @@ class TestAuthService:
         """Create a mock database session."""
         db = Mock()
         db.add = Mock()
-        db.commit = Mock()
-        db.refresh = Mock()
-        db.query = Mock()
-        db.rollback = Mock()
-        db.flush = Mock()
+        db.add_all = Mock()
+        db.execute = AsyncMock()
+        db.commit = AsyncMock()
+        db.refresh = AsyncMock()
+        db.rollback = AsyncMock()
+        db.flush = AsyncMock()
         return db
     
     @pytest.fixture
@@ -53,12 +54,11 @@ class TestAuthService:
         username = "testuser"
         password = "StrongPass123!"
         
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None  # No existing user
+        mock_result = Mock()
+        mock_result.all.return_value = []  # No existing user
+        mock_db.execute.return_value = mock_result
         
-        with patch('app.modules.auth.services.auth_service.validate_email') as mock_validate_email:
+        with patch('app.modules.auth.services.auth_service.validate_email_address') as mock_validate_email:
             with patch('app.modules.auth.services.auth_service.validate_password_strength_detailed') as mock_validate_password:
                 with patch('app.modules.auth.services.auth_service.hash_password') as mock_hash:
                     with patch('app.modules.auth.services.auth_service.generate_verification_token') as mock_token:
@@ -76,7 +76,7 @@ class TestAuthService:
         # Assertions
         assert success is True
         assert "successfully" in message
-        mock_db.add.assert_called()
+        mock_db.add_all.assert_called_once()
         mock_db.commit.assert_called_once()
     
     @pytest.mark.asyncio
@@ -87,12 +87,11 @@ class TestAuthService:
         username = "testuser"
         password = "StrongPass123!"
         
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_user  # Existing user
+        mock_result = Mock()
+        mock_result.all.return_value = [sample_user]  # Existing user
+        mock_db.execute.return_value = mock_result
         
-        with patch('app.modules.auth.services.auth_service.validate_email') as mock_validate_email:
+        with patch('app.modules.auth.services.auth_service.validate_email_address') as mock_validate_email:
             mock_validate_email.return_value = True
             
             success, message, user = await auth_service.register_user(
@@ -113,10 +112,9 @@ class TestAuthService:
         email_or_username = "test@example.com"
         password = "wrong_password"
         
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None  # User not found
+        mock_result = Mock()
+        mock_result.scalar_one_or_none.return_value = None  # User not found
+        mock_db.execute.return_value = mock_result
         
         success, message, token_data = await auth_service.authenticate_user(
             email_or_username=email_or_username,
@@ -136,10 +134,9 @@ class TestAuthService:
         email_or_username = "test@example.com"
         password = "correct_password"
         
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_user
+        mock_result = Mock()
+        mock_result.scalar_one_or_none.return_value = sample_user
+        mock_db.execute.return_value = mock_result
         
         success, message, token_data = await auth_service.authenticate_user(
             email_or_username=email_or_username,
@@ -160,11 +157,11 @@ class TestUserService:
         """Create a mock database session."""
         db = Mock()
         db.add = Mock()
-        db.commit = Mock()
-        db.refresh = Mock()
-        db.query = Mock()
-        db.get = Mock()
-        db.rollback = Mock()
+        db.execute = AsyncMock()
+        db.commit = AsyncMock()
+        db.refresh = AsyncMock()
+        db.get = AsyncMock()
+        db.rollback = AsyncMock()
         return db
     
     @pytest.fixture
@@ -189,10 +186,9 @@ class TestUserService:
         """Test getting user by email when found."""
         # Setup
         email = "test@example.com"
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_user
+        mock_result = Mock()
+        mock_result.scalar_one_or_none.return_value = sample_user
+        mock_db.execute.return_value = mock_result
         
         # Test
         result = await user_service.get_user_by_email(email)
@@ -205,10 +201,9 @@ class TestUserService:
         """Test getting user by username when found."""
         # Setup
         username = "testuser"
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_user
+        mock_result = Mock()
+        mock_result.scalar_one_or_none.return_value = sample_user
+        mock_db.execute.return_value = mock_result
         
         # Test
         result = await user_service.get_user_by_username(username)
@@ -221,16 +216,14 @@ class TestUserService:
         """Test searching users by email."""
         # Setup
         search_term = "test"
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.offset.return_value = mock_query
-        mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = [sample_user]
+        mock_result = Mock()
+        mock_result.scalars.return_value.all.return_value = [sample_user]
+        mock_db.execute.return_value = mock_result
         
         # Test
-        result = await user_service.search_users(search_term)
+        result, next_cursor = await user_service.search_users(search_term)
         
         # Assertions
         assert len(result) == 1
-        assert result[0] == sample_user 
\ No newline at end of file
+        assert result[0] == sample_user
+        assert next_cursor is None 
\ No newline at end of file
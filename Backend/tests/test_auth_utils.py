@@ -9,6 +9,14 @@ from uuid import uuid4
 
 from app.modules.auth.utils.jwt import JWTManager, create_user_tokens
 from app.core.utils.security import get_password_hash, verify_password
+from app.modules.auth.utils.security import (
+    generate_device_fingerprint,
+    hash_password,
+    run_in_hash_pool,
+    secrets_equal,
+    shutdown_hash_pool,
+    verify_password_secure,
+)
 
 
 class TestJWTManager:
@@ -59,14 +67,15 @@ class TestJWTManager:
         assert "expires_in" in result
         assert result["token_type"] == "bearer"
     
-    def test_verify_token_valid(self, jwt_manager, mock_db):
+    @pytest.mark.asyncio
+    async def test_verify_token_valid(self, jwt_manager, mock_db):
         """Test token verification with valid token."""
         user_id = uuid4()
         
         # Mock TokenBlacklist.is_token_blacklisted to return False
         with patch('app.modules.auth.utils.jwt.TokenBlacklist.is_token_blacklisted', return_value=False):
             token, jti = jwt_manager.create_access_token(user_id)
-            payload = jwt_manager.verify_token(token, mock_db)
+            payload = await jwt_manager.verify_token(token, mock_db)
         
         assert payload is not None
         assert payload["sub"] == str(user_id)
@@ -74,44 +83,48 @@ class TestJWTManager:
         assert "exp" in payload
         assert "iat" in payload
     
-    def test_verify_token_invalid(self, jwt_manager, mock_db):
+    @pytest.mark.asyncio
+    async def test_verify_token_invalid(self, jwt_manager, mock_db):
         """Test token verification with invalid token."""
         invalid_token = "invalid.token.here"
         
-        payload = jwt_manager.verify_token(invalid_token, mock_db)
+        payload = await jwt_manager.verify_token(invalid_token, mock_db)
         
         assert payload is None
     
-    def test_verify_token_blacklisted(self, jwt_manager, mock_db):
+    @pytest.mark.asyncio
+    async def test_verify_token_blacklisted(self, jwt_manager, mock_db):
         """Test token verification with blacklisted token."""
         user_id = uuid4()
         
         # Mock TokenBlacklist.is_token_blacklisted to return True
         with patch('app.modules.auth.utils.jwt.TokenBlacklist.is_token_blacklisted', return_value=True):
             token, jti = jwt_manager.create_access_token(user_id)
-            payload = jwt_manager.verify_token(token, mock_db)
+            payload = await jwt_manager.verify_token(token, mock_db)
         
         assert payload is None
     
-    def test_refresh_access_token_success(self, jwt_manager, mock_db):
+    @pytest.mark.asyncio
+    async def test_refresh_access_token_success(self, jwt_manager, mock_db):
         """Test successful token refresh."""
         user_id = uuid4()
         
         # Mock TokenBlacklist.is_token_blacklisted to return False
         with patch('app.modules.auth.utils.jwt.TokenBlacklist.is_token_blacklisted', return_value=False):
             refresh_token, _ = jwt_manager.create_refresh_token(user_id)
-            result = jwt_manager.refresh_access_token(refresh_token, mock_db)
+            result = await jwt_manager.refresh_access_token(refresh_token, mock_db)
         
         assert result is not None
         assert "access_token" in result
         assert "token_type" in result
         assert result["token_type"] == "bearer"
     
-    def test_refresh_access_token_invalid(self, jwt_manager, mock_db):
+    @pytest.mark.asyncio
+    async def test_refresh_access_token_invalid(self, jwt_manager, mock_db):
         """Test token refresh with invalid token."""
         invalid_token = "invalid.refresh.token"
         
-        result = jwt_manager.refresh_access_token(invalid_token, mock_db)
+        result = await jwt_manager.refresh_access_token(invalid_token, mock_db)
         
         assert result is None
 
@@ -160,10 +173,101 @@ class TestSecurityUtils:
         assert verify_password(password, hash1) is True
         assert verify_password(password, hash2) is True
 
+    def test_calibrate_bcrypt_rounds(self, monkeypatch):
+        """Test bcrypt cost calibration against a target hashing time."""
+        from app.core.utils import security as core_security
+        
+        monkeypatch.setattr(core_security, "_bcrypt_rounds", core_security.DEFAULT_BCRYPT_ROUNDS)
+        # One hash at the minimum cost takes 50 ms; 400 ms allows 3 more doublings
+        with patch.object(core_security.time, "perf_counter", side_effect=[0.0, 0.05]):
+            rounds = core_security.calibrate_bcrypt_rounds(target_ms=400, min_rounds=10)
+        
+        assert rounds == 13
+        assert core_security.get_bcrypt_rounds() == 13
+        
+        hashed = get_password_hash("test_password_123")
+        assert hashed.startswith("$2b$13$")
+        assert verify_password("test_password_123", hashed) is True
+    
+    def test_calibrate_bcrypt_rounds_clamped(self, monkeypatch):
+        """Test calibration never goes below the minimum cost."""
+        from app.core.utils import security as core_security
+        
+        monkeypatch.setattr(core_security, "_bcrypt_rounds", core_security.DEFAULT_BCRYPT_ROUNDS)
+        with patch.object(core_security.time, "perf_counter", side_effect=[0.0, 1.0]):
+            rounds = core_security.calibrate_bcrypt_rounds(target_ms=100, min_rounds=10)
+        
+        assert rounds == 10
+    
+    def test_calibrate_bcrypt_rounds_keeps_default_cost(self, monkeypatch):
+        """Test a slow calibration sample never lowers the default cost."""
+        from app.core.utils import security as core_security
+        
+        monkeypatch.setattr(core_security, "_bcrypt_rounds", core_security.DEFAULT_BCRYPT_ROUNDS)
+        with patch.object(core_security.time, "perf_counter", side_effect=[0.0, 5.0]):
+            rounds = core_security.calibrate_bcrypt_rounds(target_ms=250)
+        
+        assert rounds == core_security.DEFAULT_BCRYPT_ROUNDS
+    
+    @pytest.mark.asyncio
+    async def test_run_in_hash_pool(self):
+        """Test hashing and verification through the bounded hash pool."""
+        password = "test_password_123"
+        hashed = await run_in_hash_pool(hash_password, password)
+        
+        assert await run_in_hash_pool(verify_password_secure, password, hashed) is True
+        assert await run_in_hash_pool(
+            verify_password_secure,
+            plain_password="wrong_password",
+            hashed_password=hashed
+        ) is False
+    
+    @pytest.mark.asyncio
+    async def test_run_in_hash_pool_after_shutdown(self):
+        """Test the hash pool restarts after an application shutdown."""
+        shutdown_hash_pool()
+        
+        hashed = await run_in_hash_pool(hash_password, "test_password_123")
+        
+        assert await run_in_hash_pool(verify_password_secure, "test_password_123", hashed) is True
+
 
 class TestUtilityFunctions:
     """Test cases for utility functions."""
     
+    def test_generate_secure_random_password(self):
+        """Test random passwords use one batched draw and stay in the alphabet."""
+        import string
+
+        from app.modules.auth.utils import security as auth_security
+
+        alphabet = set(string.ascii_letters + string.digits + "!@#$%^&*(),.?\":{}|<>")
+        with patch.object(
+            auth_security.secrets, "token_bytes", wraps=auth_security.secrets.token_bytes
+        ) as mock_token_bytes:
+            password = auth_security.generate_secure_random_password(length=20)
+        
+        assert len(password) == 20
+        assert set(password) <= alphabet
+        assert mock_token_bytes.call_count <= 2
+    
+    def test_secrets_equal(self):
+        """Test constant-time secret comparison, including non-ASCII input."""
+        assert secrets_equal("s3cret-token", "s3cret-token") is True
+        assert secrets_equal("s3cret-token", "s3cret-tokem") is False
+        assert secrets_equal("short", "longer-value") is False
+        assert secrets_equal("pässwörd", "pässwörd") is True
+    
+    def test_generate_device_fingerprint(self):
+        """Test device fingerprints are short, stable and input dependent."""
+        fingerprint = generate_device_fingerprint("Mozilla/5.0", "127.0.0.1")
+        
+        assert len(fingerprint) == 16
+        int(fingerprint, 16)
+        assert fingerprint == generate_device_fingerprint("Mozilla/5.0", "127.0.0.1")
+        assert fingerprint != generate_device_fingerprint("Mozilla/5.0", "10.0.0.1")
+        assert generate_device_fingerprint(None, None) == generate_device_fingerprint("unknown", "unknown")
+    
     def test_create_user_tokens(self):
         """Test user token creation utility function."""
         user_id = uuid4()
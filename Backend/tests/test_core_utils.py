@@ -8,9 +8,10 @@ from decimal import Decimal
 from unittest.mock import patch, mock_open
 
 from app.core.utils.helpers import (
-    slugify, format_currency, split_amount_equally, 
+    slugify, format_currency, format_amount, split_amount_equally, divide_amount, percentage_of,
     utc_now, parse_name, truncate_text,
-    generate_uuid, mask_email, calculate_percentage
+    generate_uuid, uuid7, mask_email, calculate_percentage, to_decimal, to_cents, to_uuid,
+    request_now, set_request_now, reset_request_now
 )
 from app.core.utils.validators import (
     validate_email_address, validate_password_strength, validate_username,
@@ -36,6 +37,18 @@ class TestHelpers:
         assert format_currency(Decimal("1000.00"), "USD") == "$1,000.00"
         assert format_currency(Decimal("0.99"), "USD") == "$0.99"
         assert format_currency(Decimal("123.45"), "EUR") == "€123.45"
+        assert format_currency(Decimal("5"), "CAD") == "C$5.00"
+        assert format_currency(Decimal("5"), "CHF") == "CHF5.00"
+    
+    def test_format_amount(self):
+        """Test plain amount formatting without thousands separators."""
+        assert format_amount(Decimal("1000.5"), "USD") == "$1000.50"
+        assert format_amount(Decimal("12.34"), "EUR") == "€12.34"
+        assert format_amount(Decimal("7"), "CHF") == "CHF7.00"
+        assert format_amount(Decimal("7")) == "$7.00"
+        # Equal amounts of different types share a cache entry
+        assert format_amount(7) == "$7.00"
+        assert format_amount(Decimal("7.000")) == "$7.00"
     
     def test_split_amount_equally(self):
         """Test amount splitting."""
@@ -49,6 +62,23 @@ class TestHelpers:
         result = split_amount_equally(Decimal("10.00"), 3)
         assert len(result) == 3
         assert sum(result) == Decimal("10.00")
+        assert result == [Decimal("3.34"), Decimal("3.33"), Decimal("3.33")]
+        assert split_amount_equally(Decimal("20.00"), 3) == [Decimal("6.67"), Decimal("6.67"), Decimal("6.66")]
+    
+    def test_divide_amount(self):
+        """Test dividing an amount into equal rounded parts."""
+        assert divide_amount(Decimal("100.00"), 4) == Decimal("25.00")
+        assert divide_amount(Decimal("100"), 3) == Decimal("33.33")
+        assert divide_amount(Decimal("100"), 6) == Decimal("16.67")
+    
+    def test_percentage_of(self):
+        """Test percentage of an amount rounded to the cent."""
+        assert percentage_of(Decimal("100.00"), Decimal("30.00")) == Decimal("30.00")
+        assert percentage_of(Decimal("33.33"), Decimal("33.33")) == Decimal("11.11")
+        assert percentage_of(Decimal("0.05"), Decimal("50")) == Decimal("0.03")
+        # Percentages are not rounded before they are applied
+        assert percentage_of(Decimal("1000.00"), Decimal("33.333")) == Decimal("333.33")
+        assert percentage_of(Decimal("1000.00"), 12.345) == Decimal("123.45")
     
     def test_utc_now(self):
         """Test UTC datetime generation."""
@@ -89,12 +119,63 @@ class TestHelpers:
         uuid2 = generate_uuid()
         assert uuid1 != uuid2
     
+    def test_uuid7(self):
+        """Test time-ordered UUID generation."""
+        with patch("app.core.utils.helpers.time.time_ns", return_value=1_700_000_000_000_000_000):
+            first = uuid7()
+        with patch("app.core.utils.helpers.time.time_ns", return_value=1_700_000_000_001_000_000):
+            second = uuid7()
+        
+        assert first.version == 7
+        assert first.variant == "specified in RFC 4122"
+        assert first.int >> 80 == 1_700_000_000_000
+        assert first < second
+    
+    def test_to_decimal(self):
+        """Test Decimal conversion."""
+        amount = Decimal("12.30")
+        assert to_decimal(amount) is amount
+        assert to_decimal(12.3) == Decimal("12.3")
+        assert to_decimal(5) == Decimal("5")
+        assert to_decimal("7.05") == Decimal("7.05")
+    
+    def test_to_cents(self):
+        """Test conversion of amounts to whole cents."""
+        assert to_cents(Decimal("12.34")) == 1234
+        assert to_cents(12.5) == 1250
+        assert to_cents("0.005") == 1
+        assert to_cents(Decimal("-3.10")) == -310
+    
+    def test_to_uuid(self):
+        """Test UUID conversion."""
+        value = uuid7()
+        assert to_uuid(value) is value
+        assert to_uuid(str(value)) == value
+        with pytest.raises(ValueError):
+            to_uuid("not-a-uuid")
+    
+    def test_request_now(self):
+        """Test request-scoped timestamp pinning."""
+        pinned = datetime(2024, 1, 15, 12, 0, 0)
+        token = set_request_now(pinned)
+        try:
+            assert request_now() is pinned
+            assert request_now() is pinned
+        finally:
+            reset_request_now(token)
+        
+        # Outside a request the current time is returned
+        assert request_now() != pinned
+        assert request_now().tzinfo is None
+    
     def test_mask_email(self):
         """Test email masking."""
         assert mask_email("test@example.com") == "t**t@example.com"
         assert mask_email("a@b.com") == "a*@b.com"
         assert mask_email("longname@domain.org") == "l******e@domain.org"
         assert mask_email("invalid-email") == "invalid-email"
+        # Longer than any valid local part, so the mask is built on demand
+        assert mask_email("a" * 70 + "@example.com") == "a" + "*" * 68 + "a@example.com"
     
     def test_calculate_percentage(self):
         """Test percentage calculation."""
@@ -115,6 +196,7 @@ class TestValidators:
         # Testing with a simple validation approach
         from unittest.mock import patch
         
+        validate_email_address.cache_clear()
         with patch('app.core.utils.validators.validate_email') as mock_validate:
             # Test successful validation
             mock_validate.return_value = True
@@ -124,6 +206,10 @@ class TestValidators:
             from email_validator import EmailNotValidError
             mock_validate.side_effect = EmailNotValidError("Invalid email")
             assert validate_email_address("invalid-email") is False
+            
+            # Repeated checks are served from the cache
+            assert validate_email_address("test@example.com") is True
+            assert mock_validate.call_count == 2
     
     def test_validate_password(self):
         """Test password validation."""
@@ -7,7 +7,10 @@ from datetime import date, datetime
 from decimal import Decimal
 from uuid import uuid4
 
+from unittest.mock import patch
+
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.main import app
@@ -362,6 +365,29 @@ class TestAnalyticsEndpoints:
         assert "average_expense" in data["totals"]
         assert "daily_average" in data["totals"]
 
+    def test_get_spending_summary_rejects_invalid_ids(self, authenticated_client: TestClient, test_household: Household):
+        """Test malformed ID filters are rejected before reaching the service."""
+        response = authenticated_client.get(
+            f"/api/households/{test_household.id}/analytics/summary",
+            params={"category_ids": "not-a-uuid"}
+        )
+
+        assert response.status_code == 422
+    
+    def test_get_spending_summary_not_modified(self, authenticated_client: TestClient, test_household: Household):
+        """Test a matching If-None-Match is answered with 304."""
+        url = f"/api/households/{test_household.id}/analytics/summary"
+        response = authenticated_client.get(url)
+        
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert response.headers["cache-control"] == "private, max-age=60"
+        
+        response = authenticated_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+    
     def test_get_category_analysis(self, authenticated_client: TestClient, test_household: Household):
         """Test getting category analysis."""
         response = authenticated_client.get(f"/api/households/{test_household.id}/analytics/categories")
@@ -415,6 +441,112 @@ class TestAnalyticsEndpoints:
         assert "recommendations" in data
 
 
+class TestAnalyticsAsyncSession:
+    """Test analytics endpoints against a real AsyncSession."""
+
+    @pytest.fixture
+    def seeded_household(self, async_client) -> Household:
+        """Create a household with one expense through the sync session."""
+        _, db = async_client
+        user = User(
+            email="async@example.com",
+            username="asyncuser",
+            hashed_password="hashed_password",
+            is_active=True,
+            email_verified=True
+        )
+        db.add(user)
+        db.commit()
+
+        household = Household(
+            name="Async Household",
+            invite_code="ASYNC123",
+            created_by=user.id,
+            settings={"currency": "USD"}
+        )
+        db.add(household)
+        db.commit()
+
+        db.add(UserHousehold(
+            user_id=user.id,
+            household_id=household.id,
+            role=UserHouseholdRole.ADMIN
+        ))
+        db.add(Expense(
+            household_id=household.id,
+            created_by=user.id,
+            title="Groceries",
+            amount=Decimal("42.50"),
+            currency="USD",
+            expense_date=date.today()
+        ))
+        db.commit()
+
+        app.dependency_overrides[get_current_user] = lambda: user
+        return household
+
+    def test_get_spending_summary(self, async_client, seeded_household: Household):
+        """Test the summary is computed through AsyncSession.run_sync."""
+        client, _ = async_client
+        run_sync = AsyncSession.run_sync
+
+        with patch.object(AsyncSession, "run_sync", autospec=True, side_effect=run_sync) as run_sync_spy:
+            response = client.get(f"/api/households/{seeded_household.id}/analytics/summary")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["totals"]["expense_count"] == 1
+        assert Decimal(str(data["totals"]["total_amount"])) == Decimal("42.50")
+        assert run_sync_spy.await_count > 0
+
+    def test_get_analytics_dashboard(self, async_client, seeded_household: Household):
+        """Test the dashboard reads the household through the async session."""
+        client, _ = async_client
+
+        response = client.get(f"/api/households/{seeded_household.id}/analytics/dashboard")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["household_name"] == "Async Household"
+        assert data["spending_summary"]["totals"]["expense_count"] == 1
+
+    def test_export_household_data_csv(self, async_client, seeded_household: Household):
+        """Test the CSV export streams a header and the household's expenses."""
+        client, _ = async_client
+
+        response = client.get(f"/api/households/{seeded_household.id}/analytics/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.headers["content-disposition"] == (
+            f'attachment; filename="household-{seeded_household.id}-export.csv"'
+        )
+        lines = response.text.splitlines()
+        assert lines[0].startswith("id,title,")
+        assert len(lines) == 2
+        assert "Groceries" in lines[1]
+        assert "42.5" in lines[1]
+
+    def test_export_household_data_json(self, async_client, seeded_household: Household):
+        """Test the JSON export streams a valid document."""
+        client, _ = async_client
+
+        response = client.get(
+            f"/api/households/{seeded_household.id}/analytics/export",
+            params={"format": "json"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/json")
+        assert response.headers["content-disposition"] == (
+            f'attachment; filename="household-{seeded_household.id}-export.json"'
+        )
+        export = response.json()
+        assert export["metadata"]["household_id"] == str(seeded_household.id)
+        assert [expense["title"] for expense in export["expenses"]] == ["Groceries"]
+        assert export["expenses"][0]["amount"] == 42.5
+
+
 class TestErrorHandling:
     """Test error handling in API endpoints."""
     
@@ -2,25 +2,29 @@
 Tests for expenses module models.
 """
 
-import pytest
 from datetime import date, datetime, timedelta
 from decimal import Decimal
+
+import pytest
 from sqlalchemy.exc import IntegrityError
 
+from app.core.utils.helpers import request_now, reset_request_now, set_request_now
+from app.modules.auth.models import User
+from app.modules.auth.models.user import UserRole
 from app.modules.expenses.models import (
-    Household, 
-    UserHousehold, 
-    UserHouseholdRole,
-    Category, 
-    Expense, 
+    Category,
+    Expense,
+    ExpenseMonthlyRollup,
     ExpenseShare,
+    ExpenseSharePayment,
+    Household,
     Payment,
-    PaymentType,
     PaymentMethod,
-    ExpenseSharePayment
+    PaymentType,
+    UserHousehold,
+    UserHouseholdRole,
 )
-from app.modules.auth.models import User
-from app.modules.auth.models.user import UserRole
+from app.modules.expenses.models.expense_monthly_rollup import NO_CATEGORY
 
 
 class TestHouseholdModel:
@@ -59,6 +63,21 @@ class TestHouseholdModel:
         assert household.get_setting("allow_member_invites") is True
         assert household.get_setting("default_split_method") == "equal"
     
+    def test_household_settings_track_in_place_changes(self, db_session):
+        """Test in-place settings changes are persisted without shared defaults."""
+        first = Household(name="First Household", invite_code="FIRST123")
+        second = Household(name="Second Household", invite_code="SECOND12")
+        db_session.add_all([first, second])
+        db_session.commit()
+        
+        first.settings["timezone"] = "Europe/Paris"
+        db_session.commit()
+        db_session.refresh(first)
+        db_session.refresh(second)
+        
+        assert first.get_setting("timezone") == "Europe/Paris"
+        assert second.get_setting("timezone") == "UTC"
+    
     def test_household_settings_management(self, db_session):
         """Test household settings management."""
         household = Household(
@@ -72,6 +91,11 @@ class TestHouseholdModel:
         household.update_setting("default_currency", "EUR")
         assert household.get_setting("default_currency") == "EUR"
         
+        # In-place updates are persisted
+        db_session.commit()
+        db_session.refresh(household)
+        assert household.get_setting("default_currency") == "EUR"
+        
         # Get non-existent setting with default
         assert household.get_setting("non_existent", "default_value") == "default_value"
     
@@ -104,6 +128,10 @@ class TestHouseholdModel:
         member = household.get_member(str(test_user.id))
         assert member is not None
         assert member.role == UserHouseholdRole.ADMIN
+        assert household.get_member(test_user.id) is member
+        assert household.get_member("not-a-uuid") is None
+        assert household.is_member("not-a-uuid") is False
+        assert household.members_by_user() == {test_user.id: member}
     
     def test_household_repr(self, db_session):
         """Test household string representation."""
@@ -114,9 +142,13 @@ class TestHouseholdModel:
         db_session.add(household)
         db_session.commit()
         
-        repr_str = repr(household)
-        assert "Test Household" in repr_str
-        assert "TEST123" in repr_str
+        # repr never loads expired attributes, so refresh before comparing
+        db_session.refresh(household)
+        assert repr(household) == f"<Household(id={household.id})>"
+        
+        description = household.describe()
+        assert "Test Household" in description
+        assert "TEST123" in description
 
 
 class TestUserHouseholdModel:
@@ -444,6 +476,91 @@ class TestExpenseModel:
         assert expense.paid_shares_count == 1
         assert expense.unpaid_shares_count == 0
         assert expense.is_fully_paid is True
+        assert expense.share_stats() == (Decimal("50.00"), 1, 0)
+        
+        # Share lookup by user accepts UUIDs and their string form
+        assert expense.shares_by_user() == {test_user.id: share}
+        assert expense.get_share_for_user(test_user.id) is share
+        assert expense.get_share_for_user(str(test_user.id)) is share
+
+
+class TestExpenseMonthlyRollupModel:
+    """Test cases for ExpenseMonthlyRollup maintenance."""
+
+    def _bucket(self, db_session, household_id, month, category_id):
+        db_session.expire_all()
+        return db_session.query(ExpenseMonthlyRollup).filter(
+            ExpenseMonthlyRollup.household_id == household_id,
+            ExpenseMonthlyRollup.month == month,
+            ExpenseMonthlyRollup.category_id == category_id
+        ).one_or_none()
+
+    def test_rollup_follows_expense_changes(self, db_session, test_household, test_user, test_category):
+        """Test the monthly bucket tracks inserts, updates and soft deletes."""
+        expense_date = date(2026, 3, 14)
+        expense = Expense(
+            household_id=test_household.id,
+            created_by=test_user.id,
+            title="Groceries",
+            amount=Decimal("40.00"),
+            category_id=test_category.id,
+            expense_date=expense_date
+        )
+        db_session.add(expense)
+        db_session.commit()
+
+        bucket = self._bucket(db_session, test_household.id, date(2026, 3, 1), test_category.id)
+        assert bucket.total_amount == Decimal("40.00")
+        assert bucket.expense_count == 1
+
+        expense.amount = Decimal("55.00")
+        db_session.commit()
+        bucket = self._bucket(db_session, test_household.id, date(2026, 3, 1), test_category.id)
+        assert bucket.total_amount == Decimal("55.00")
+        assert bucket.expense_count == 1
+
+        # Moving the expense to another category and month moves its total
+        expense.category_id = None
+        expense.expense_date = date(2026, 4, 2)
+        db_session.commit()
+        bucket = self._bucket(db_session, test_household.id, date(2026, 3, 1), test_category.id)
+        assert bucket.total_amount == Decimal("0.00")
+        assert bucket.expense_count == 0
+        bucket = self._bucket(db_session, test_household.id, date(2026, 4, 1), NO_CATEGORY)
+        assert bucket.total_amount == Decimal("55.00")
+
+        expense.is_active = False
+        db_session.commit()
+        bucket = self._bucket(db_session, test_household.id, date(2026, 4, 1), NO_CATEGORY)
+        assert bucket.expense_count == 0
+
+    def test_rollup_follows_update_of_expired_expense(self, db_session, test_household, test_user, test_category):
+        """Test updating an expired expense moves the previous amount out of its bucket."""
+        expense = Expense(
+            household_id=test_household.id,
+            created_by=test_user.id,
+            title="Utilities",
+            amount=Decimal("10.00"),
+            category_id=test_category.id,
+            expense_date=date(2026, 5, 10)
+        )
+        db_session.add(expense)
+        db_session.commit()
+
+        db_session.expire(expense)
+        expense.amount = Decimal("25.00")
+        db_session.commit()
+
+        bucket = self._bucket(db_session, test_household.id, date(2026, 5, 1), test_category.id)
+        assert bucket.total_amount == Decimal("25.00")
+        assert bucket.expense_count == 1
+
+        db_session.expire(expense)
+        expense.amount = Decimal("30.00")
+        db_session.commit()
+
+        bucket = self._bucket(db_session, test_household.id, date(2026, 5, 1), test_category.id)
+        assert bucket.total_amount == Decimal("30.00")
 
 
 class TestExpenseShareModel:
@@ -485,6 +602,22 @@ class TestExpenseShareModel:
         assert share.formatted_amount == "$30.00"  # Assuming USD
         assert share.user_display_name == test_user_household.display_name
     
+    def test_expense_share_currency_defaults_to_expense(self, db_session, test_expense, test_user_household):
+        """Test shares copy the expense currency when none is given."""
+        test_expense.currency = "EUR"
+        db_session.commit()
+        
+        share = ExpenseShare(
+            expense_id=test_expense.id,
+            user_household_id=test_user_household.id,
+            share_amount=Decimal("12.50")
+        )
+        db_session.add(share)
+        db_session.commit()
+        
+        assert share.currency == "EUR"
+        assert share.formatted_amount == "€12.50"
+    
     def test_expense_share_payment_management(self, db_session, test_expense, test_user_household):
         """Test expense share payment management."""
         share = ExpenseShare(
@@ -562,6 +695,17 @@ class TestExpenseShareModel:
         )
         assert percent_share.share_amount == Decimal("30.00")
         assert percent_share.share_percentage == Decimal("30.00")
+        
+        # Test create_equal_shares keeps the total exact
+        equal_shares = ExpenseShare.create_equal_shares(
+            expense_id=test_expense.id,
+            user_household_ids=[test_user_household.id] * 3,
+            total_amount=Decimal("100.00")
+        )
+        assert len(equal_shares) == 3
+        assert sum(s.share_amount for s in equal_shares) == Decimal("100.00")
+        assert all(s.is_active and not s.is_paid for s in equal_shares)
+        assert ExpenseShare.create_equal_shares(test_expense.id, [], Decimal("100.00")) == []
     
     def test_expense_share_time_properties(self, db_session, test_expense, test_user_household):
         """Test expense share time-related properties."""
@@ -580,6 +724,26 @@ class TestExpenseShareModel:
         
         assert share.days_since_expense == 5
         assert share.days_since_paid == 2
+    
+    def test_expense_share_paid_during_request(self, test_expense, test_user_household):
+        """Test a share paid within the current request reports zero days."""
+        share = ExpenseShare(
+            expense_id=test_expense.id,
+            user_household_id=test_user_household.id,
+            share_amount=Decimal("25.00")
+        )
+        
+        token = set_request_now(datetime.utcnow() - timedelta(seconds=1))
+        try:
+            share.mark_as_paid()
+            assert share.paid_at == request_now()
+            assert share.days_since_paid == 0
+            
+            # Shares stamped with the wall clock are not reported as paid in the future
+            share.paid_at = datetime.utcnow()
+            assert share.days_since_paid == 0
+        finally:
+            reset_request_now(token)
 
 
 class TestPaymentModel:
@@ -699,6 +863,11 @@ class TestPaymentModel:
         assert payment.total_allocated_amount == Decimal("30.00")
         assert payment.unallocated_amount == Decimal("70.00")
         assert payment.is_fully_allocated is False
+        
+        # The same total computed in SQL
+        assert db_session.query(Payment.total_allocated_amount).filter(
+            Payment.id == payment.id
+        ).scalar() == Decimal("30.00")
     
     def test_payment_class_methods(self, test_household, test_user, test_user_2):
         """Test payment class methods."""
@@ -747,6 +916,36 @@ class TestPaymentModel:
         payment.add_description("Updated description")
         assert payment.description == "Updated description"
     
+    def test_payment_enums_stored_as_strings(self, db_session, test_household, test_user, test_user_2):
+        """Test payment enums round-trip through VARCHAR columns and reject unknown labels."""
+        from sqlalchemy.exc import StatementError
+        from app.modules.expenses.models.payment import Payment, PaymentMethod, PaymentType
+        
+        payment = Payment(
+            household_id=test_household.id,
+            payer_id=test_user.id,
+            payee_id=test_user_2.id,
+            amount=Decimal("20.00"),
+            payment_type=PaymentType.ADJUSTMENT,
+            payment_method=PaymentMethod.DIGITAL_WALLET
+        )
+        db_session.add(payment)
+        db_session.commit()
+        
+        found = db_session.query(Payment).filter(
+            Payment.payment_type == PaymentType.ADJUSTMENT
+        ).one()
+        assert found.payment_method == PaymentMethod.DIGITAL_WALLET
+        
+        db_session.add(Payment(
+            household_id=test_household.id,
+            amount=Decimal("1.00"),
+            payment_type="refund"
+        ))
+        with pytest.raises(StatementError):
+            db_session.commit()
+        db_session.rollback()
+    
     def test_payment_repr(self, db_session, test_household, test_user, test_user_2):
         """Test payment string representation."""
         from app.modules.expenses.models.payment import Payment, PaymentType
@@ -761,10 +960,13 @@ class TestPaymentModel:
         db_session.add(payment)
         db_session.commit()
         
-        repr_str = repr(payment)
-        assert "50.00" in repr_str
-        assert "USD" in repr_str
-        assert "reimbursement" in repr_str
+        db_session.refresh(payment)
+        assert repr(payment) == f"<Payment(id={payment.id})>"
+        
+        description = payment.describe()
+        assert "50.00" in description
+        assert "USD" in description
+        assert "reimbursement" in description
 
 
 class TestExpenseSharePaymentModel:
@@ -878,10 +1080,10 @@ class TestExpenseSharePaymentModel:
         db_session.add(esp)
         db_session.commit()
         
-        repr_str = repr(esp)
-        assert str(test_payment.id) in repr_str
-        assert str(test_expense_share.id) in repr_str
-        assert "25.00" in repr_str
+        description = esp.describe()
+        assert str(test_payment.id) in description
+        assert str(test_expense_share.id) in description
+        assert "25.00" in description
 
 
 # Fixtures for testing
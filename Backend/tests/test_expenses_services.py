@@ -2,11 +2,15 @@
 Tests for expenses services.
 """
 
+import json
+
 import pytest
 from datetime import date, timedelta
 from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.modules.auth.models.user import User
@@ -18,7 +22,9 @@ from app.modules.expenses.models.expense_share import ExpenseShare
 from app.modules.expenses.services.household_service import HouseholdService
 from app.modules.expenses.services.expense_service import ExpenseService
 from app.modules.expenses.services.splitting_service import SplittingService
-from app.modules.expenses.services.analytics_service import AnalyticsService
+from app.modules.expenses.services.analytics_service import AnalyticsService, build_dashboard_insights
+from app.modules.expenses.utils.analytics_cache import analytics_cache
+from app.modules.expenses.utils.permission_cache import permission_cache
 
 
 class TestHouseholdService:
@@ -234,6 +240,84 @@ class TestHouseholdService:
         )
         assert membership.role == UserHouseholdRole.ADMIN
 
+    async def test_update_member_role_invalidates_analytics(self, household_service, test_user, test_user2):
+        """Test a role change drops the household's cached analytics."""
+        success, message, household = await household_service.create_household(
+            name="Test Household",
+            description="A test household",
+            created_by=test_user.id
+        )
+        success, message, _ = await household_service.join_household_by_invite(
+            user_id=test_user2.id,
+            invite_code=household.invite_code
+        )
+
+        with patch.object(analytics_cache, "invalidate", new_callable=AsyncMock) as invalidate:
+            success, message = await household_service.update_member_role(
+                admin_user_id=test_user.id,
+                household_id=household.id,
+                target_user_id=test_user2.id,
+                new_role=UserHouseholdRole.ADMIN
+            )
+
+        assert success is True
+        invalidate.assert_awaited_once_with(household.id)
+
+    async def test_get_household_name(self, household_service, test_user):
+        """Test the household name lookup."""
+        success, message, household = await household_service.create_household(
+            name="Named Household",
+            description=None,
+            created_by=test_user.id
+        )
+        assert success is True
+
+        assert await household_service.get_household_name(household.id) == "Named Household"
+        assert await household_service.get_household_name(uuid4()) is None
+
+    async def test_get_household_stats(self, household_service, test_user, test_user2):
+        """Test household stats count members and admins in SQL."""
+        success, message, household = await household_service.create_household(
+            name="Test Household",
+            description="A test household",
+            created_by=test_user.id
+        )
+        assert success is True
+        await household_service.join_household_by_invite(
+            user_id=test_user2.id,
+            invite_code=household.invite_code
+        )
+
+        stats = await household_service.get_household_stats(household.id)
+
+        assert stats["member_count"] == 2
+        assert stats["admin_count"] == 1
+        assert stats["invite_code"] == household.invite_code
+        assert await household_service.get_member_counts([household.id]) == {household.id: 2}
+        assert await household_service.get_member_counts([]) == {}
+
+    async def test_get_membership_if_authorized(self, household_service, test_user, test_user2):
+        """Test membership lookup honours the required role."""
+        success, message, household = await household_service.create_household(
+            name="Test Household",
+            description="A test household",
+            created_by=test_user.id
+        )
+        assert success is True
+
+        membership = await household_service.get_membership_if_authorized(
+            user_id=test_user.id,
+            household_id=household.id,
+            required_role="admin"
+        )
+        assert membership is not None
+        assert membership.user_id == test_user.id
+
+        assert await household_service.get_membership_if_authorized(
+            user_id=test_user2.id,
+            household_id=household.id
+        ) is None
+
     async def test_regenerate_invite_code(self, household_service, test_user, db_session):
         """Test regenerating invite code."""
         # Create household
@@ -257,6 +341,36 @@ class TestHouseholdService:
         assert len(new_invite_code) > 0
 
 
+class TestHouseholdDependencies:
+    """Test cases for the household access dependencies."""
+
+    async def test_membership_resolved_once_per_request(self):
+        """Test chained dependencies reuse the membership loaded first."""
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, Mock
+
+        from app.modules.expenses.dependencies import (
+            require_household_admin,
+            require_household_member,
+        )
+
+        request = Mock()
+        request.state = SimpleNamespace()
+        current_user = Mock(id=uuid4())
+        household_id = uuid4()
+        membership = Mock(role=UserHouseholdRole.ADMIN)
+        household_service = Mock()
+        household_service.get_membership_if_authorized = AsyncMock(return_value=membership)
+
+        assert await require_household_member(
+            household_id, request, current_user, household_service
+        ) is membership
+        assert await require_household_admin(
+            household_id, request, current_user, household_service
+        ) is membership
+        household_service.get_membership_if_authorized.assert_awaited_once()
+
+
 class TestExpenseService:
     """Test cases for ExpenseService."""
 
@@ -585,6 +699,93 @@ class TestAnalyticsService:
         assert summary["totals"]["expense_count"] == 1
         assert summary["totals"]["total_amount"] == 10.0  # First expense: 10.00
 
+    async def test_spending_summary_totals_and_trend(self, analytics_service, test_user, test_household, test_expenses):
+        """Test summary totals and the trend come from the grouped query."""
+        success, message, summary = await analytics_service.get_spending_summary(
+            household_id=test_household.id,
+            user_id=test_user.id,
+            start_date=date.today() - timedelta(days=1),
+            end_date=date.today(),
+            period="day"
+        )
+
+        assert success is True
+        # Expenses of 10.00 (today) and 20.00 (yesterday)
+        assert summary["totals"]["total_amount"] == 30.0
+        assert summary["totals"]["expense_count"] == 2
+        assert summary["totals"]["average_expense"] == 15.0
+        assert [point["count"] for point in summary["time_series"]] == [1, 1]
+        assert summary["category_breakdown"][0]["amount"] == 30.0
+        # The previous period ends the day before start_date and holds 30.00
+        assert summary["trends"]["previous_period"] == 30.0
+        assert summary["trends"]["trend"] == "stable"
+
+    async def test_spending_summary_filters(self, analytics_service, test_user, test_household, test_category, test_expenses):
+        """Test the category and user filters restrict the summary."""
+        success, message, summary = await analytics_service.get_spending_summary(
+            household_id=test_household.id,
+            user_id=test_user.id,
+            start_date=date.today() - timedelta(days=10),
+            end_date=date.today(),
+            period="day",
+            category_ids=[test_category.id],
+            user_ids=[test_user.id]
+        )
+        assert success is True
+        assert summary["totals"]["total_amount"] == 150.0
+
+        success, message, summary = await analytics_service.get_spending_summary(
+            household_id=test_household.id,
+            user_id=test_user.id,
+            start_date=date.today() - timedelta(days=10),
+            end_date=date.today(),
+            period="day",
+            category_ids=[uuid4()]
+        )
+        assert success is True
+        assert summary["totals"]["expense_count"] == 0
+        assert summary["top_expenses"] == []
+
+    async def test_monthly_summary_reads_rollup_and_edges(self, analytics_service, expense_service, test_user, test_household, test_category):
+        """Test whole months from the rollup and partial months from expenses add up."""
+        for expense_date, amount in (
+            (date(2026, 1, 5), "12.00"),
+            (date(2026, 1, 31), "8.00"),
+            (date(2026, 2, 3), "5.00"),
+            (date(2026, 2, 20), "100.00")
+        ):
+            success, message, expense = await expense_service.create_expense(
+                household_id=test_household.id,
+                created_by=test_user.id,
+                title="Monthly expense",
+                amount=Decimal(amount),
+                category_id=test_category.id,
+                expense_date=expense_date
+            )
+            assert success is True
+
+        success, message, summary = await analytics_service.get_spending_summary(
+            household_id=test_household.id,
+            user_id=test_user.id,
+            start_date=date(2026, 1, 1),
+            end_date=date(2026, 2, 10),
+            period="month"
+        )
+        assert success is True
+        assert summary["totals"]["total_amount"] == 25.0
+        assert summary["totals"]["expense_count"] == 3
+        assert [point["amount"] for point in summary["time_series"]] == [20.0, 5.0]
+
+        success, message, analysis = await analytics_service.get_category_analysis(
+            household_id=test_household.id,
+            user_id=test_user.id,
+            start_date=date(2026, 1, 1),
+            end_date=date(2026, 2, 10)
+        )
+        assert success is True
+        assert analysis["total_spending"] == 25.0
+        assert analysis["categories"][0]["expense_count"] == 3
+
     async def test_get_category_analysis(self, analytics_service, test_user, test_household, test_expenses):
         """Test getting category analysis."""
         success, message, analysis = await analytics_service.get_category_analysis(
@@ -598,6 +799,32 @@ class TestAnalyticsService:
         assert "total_spending" in analysis
         assert analysis["total_spending"] == 150.0  # This test gets all 5 expenses: 10+20+30+40+50
 
+    async def test_get_category_analysis_limit(self, analytics_service, expense_service, test_user, test_household, test_expenses):
+        """Test the category limit is applied in SQL without changing the total."""
+        success, message, expense = await expense_service.create_expense(
+            household_id=test_household.id,
+            created_by=test_user.id,
+            title="Uncategorized expense",
+            amount=Decimal("5.00"),
+            expense_date=date.today()
+        )
+        assert success is True
+
+        success, message, analysis = await analytics_service.get_category_analysis(
+            household_id=test_household.id,
+            user_id=test_user.id
+        )
+        assert [category["name"] for category in analysis["categories"]] == ["Food", "Uncategorized"]
+
+        success, message, analysis = await analytics_service.get_category_analysis(
+            household_id=test_household.id,
+            user_id=test_user.id,
+            limit=1
+        )
+        assert success is True
+        assert [category["name"] for category in analysis["categories"]] == ["Food"]
+        assert analysis["total_spending"] == 150.0
+
     async def test_get_balance_calculations(self, analytics_service, test_user, test_household, test_expenses):
         """Test getting balance calculations."""
         success, message, balances = await analytics_service.get_balance_calculations(
@@ -611,6 +838,55 @@ class TestAnalyticsService:
         assert "settlement_suggestions" in balances
         assert len(balances["member_balances"]) >= 1
 
+    async def test_get_dashboard_bundle(self, analytics_service, test_user, test_household, test_expenses):
+        """Test the dashboard bundle matches the individual analytics calls."""
+        start_date = date.today() - timedelta(days=10)
+        success, message, bundle = await analytics_service.get_dashboard_bundle(
+            household_id=test_household.id,
+            user_id=test_user.id,
+            start_date=start_date
+        )
+
+        assert success is True
+        assert "successfully" in message
+        assert bundle.summary["totals"]["expense_count"] == 5
+        assert bundle.summary["totals"]["total_amount"] == 150.0
+        assert len(bundle.summary["top_expenses"]) == 5
+        assert bundle.categories["total_spending"] == 150.0
+        assert bundle.categories["categories"][0]["name"] == "Food"
+        assert bundle.user_patterns[0]["user_id"] == str(test_user.id)
+        assert bundle.user_patterns[0]["expense_count"] == 5
+
+        success, message, balances = await analytics_service.get_balance_calculations(
+            household_id=test_household.id,
+            user_id=test_user.id
+        )
+        assert success is True
+        assert bundle.balances == balances
+
+    async def test_queries_run_through_async_session(self):
+        """Test queries use run_sync when the service has an AsyncSession."""
+        async_db = MagicMock(spec=AsyncSession)
+        async_db.run_sync = AsyncMock(return_value=False)
+        service = AnalyticsService(async_db)
+
+        with patch("app.modules.expenses.utils.permission_cache.get_redis", return_value=None):
+            membership = await service._verify_membership(uuid4(), uuid4())
+
+        assert membership is False
+        async_db.run_sync.assert_awaited_once()
+
+    async def test_verify_membership_uses_permission_cache(self):
+        """Test a cached permission check skips the membership query."""
+        async_db = MagicMock(spec=AsyncSession)
+        async_db.run_sync = AsyncMock()
+        service = AnalyticsService(async_db)
+
+        with patch.object(permission_cache, "get", AsyncMock(return_value=True)):
+            assert await service._verify_membership(uuid4(), uuid4()) is True
+
+        async_db.run_sync.assert_not_called()
+
     async def test_export_data(self, analytics_service, test_user, test_household, test_expenses):
         """Test exporting data."""
         success, message, export_data = await analytics_service.export_data(
@@ -626,6 +902,33 @@ class TestAnalyticsService:
         assert len(export_data["expenses"]) == 5  # This test gets all 5 expenses
         assert export_data["metadata"]["total_expenses"] == 5  # This test gets all 5 expenses
 
+    async def test_export_data_stream_csv(self, analytics_service, test_household, test_expenses):
+        """Test the CSV export streams a header and one line per expense."""
+        chunks = [
+            chunk async for chunk in analytics_service.export_data_stream(
+                household_id=test_household.id,
+                export_type="csv"
+            )
+        ]
+
+        lines = "".join(chunks).splitlines()
+        assert lines[0].startswith("id,title,description,amount")
+        assert len(lines) == 6  # header + 5 expenses
+
+    async def test_export_data_stream_json(self, analytics_service, test_household, test_expenses):
+        """Test the JSON export streams a valid document."""
+        chunks = [
+            chunk async for chunk in analytics_service.export_data_stream(
+                household_id=test_household.id,
+                export_type="json"
+            )
+        ]
+
+        export = json.loads("".join(chunks))
+        assert export["metadata"]["household_id"] == str(test_household.id)
+        assert len(export["expenses"]) == 5
+        assert export["expenses"][0]["category"] == "Food"
+
     async def test_analytics_not_member(self, analytics_service, test_household, db_session):
         """Test analytics when not a household member."""
         # Create a user not in the household
@@ -644,4 +947,176 @@ class TestAnalyticsService:
         )
 
         assert success is False
-        assert "not a member" in message 
\ No newline at end of file
+        assert "not a member" in message 
+
+    async def test_get_last_modified_tracks_categories(self, analytics_service, db_session, test_household, test_category, test_expenses):
+        """Test category changes move the household's last modified time."""
+        before = await analytics_service.get_last_modified(test_household.id)
+        assert before is not None
+
+        test_category.name = "Groceries"
+        db_session.commit()
+
+        assert await analytics_service.get_last_modified(test_household.id) > before
+
+    async def test_has_any_expense(self, analytics_service, expense_service, test_user, test_household):
+        """Test the active expense existence check."""
+        assert await analytics_service.has_any_expense(test_household.id) is False
+
+        success, message, expense = await expense_service.create_expense(
+            household_id=test_household.id,
+            created_by=test_user.id,
+            title="First expense",
+            amount=Decimal("9.99"),
+            expense_date=date.today()
+        )
+        assert success is True
+        assert await analytics_service.has_any_expense(test_household.id) is True
+
+    def test_build_dashboard_insights(self):
+        """Test dashboard insight lines are built from the bundle figures."""
+        key_insights, recommendations, alerts = build_dashboard_insights(
+            {"totals": {"expense_count": 3, "total_amount": 42.5}},
+            [{"name": "Food"}],
+            {"total_outstanding": 12.0}
+        )
+
+        assert key_insights == [
+            "Total of 3 expenses recorded",
+            "Total spending: $42.50",
+            "Top spending category: Food"
+        ]
+        assert recommendations == ["Consider settling outstanding balances"]
+        assert alerts == ["Outstanding balances: $12.00"]
+
+        key_insights, recommendations, alerts = build_dashboard_insights({}, [], {})
+        assert (key_insights, recommendations, alerts) == ([], [], [])
+
+class TestAnalyticsCache:
+    """Test cases for the analytics response cache."""
+
+    @pytest.fixture
+    def fake_redis(self):
+        store = {}
+        redis = MagicMock()
+
+        async def get(key):
+            return store.get(key)
+
+        async def set(key, value, ex=None):
+            store[key] = value
+
+        async def incr(key):
+            store[key] = int(store.get(key, 0)) + 1
+            return store[key]
+
+        redis.get = AsyncMock(side_effect=get)
+        redis.set = AsyncMock(side_effect=set)
+        redis.incr = AsyncMock(side_effect=incr)
+        return redis
+
+    async def test_cache_disabled_without_redis(self):
+        """Test lookups miss when Redis is not configured."""
+        with patch("app.modules.expenses.utils.analytics_cache.get_redis", return_value=None):
+            key = await analytics_cache.entry_key(uuid4(), "summary", {})
+            await analytics_cache.set(key, {"total": 1})
+            assert key is None
+            assert await analytics_cache.get(key) is None
+
+    async def test_cache_hit_and_invalidate(self, fake_redis):
+        """Test cached responses are keyed by parameters and dropped per household."""
+        household_id = uuid4()
+        other_household_id = uuid4()
+        params = {"user_id": uuid4(), "date_from": date(2024, 1, 1)}
+
+        async def lookup(household, name, request_params):
+            return await analytics_cache.get(await analytics_cache.entry_key(household, name, request_params))
+
+        with patch("app.modules.expenses.utils.analytics_cache.get_redis", return_value=fake_redis):
+            await analytics_cache.set(
+                await analytics_cache.entry_key(household_id, "summary", params), {"total": Decimal("12.50")}
+            )
+            await analytics_cache.set(
+                await analytics_cache.entry_key(other_household_id, "summary", params), {"total": 3}
+            )
+
+            assert await lookup(household_id, "summary", params) == {"total": 12.5}
+            assert await lookup(household_id, "summary", {**params, "date_from": None}) is None
+            assert await lookup(household_id, "dashboard", params) is None
+
+            await analytics_cache.invalidate(household_id)
+
+            assert await lookup(household_id, "summary", params) is None
+            assert await lookup(other_household_id, "summary", params) == {"total": 3}
+
+    async def test_store_after_invalidation_is_not_served(self, fake_redis):
+        """Test a response built before an invalidation stays under the old generation."""
+        household_id = uuid4()
+
+        with patch("app.modules.expenses.utils.analytics_cache.get_redis", return_value=fake_redis):
+            key = await analytics_cache.entry_key(household_id, "summary", {})
+            assert await analytics_cache.get(key) is None
+
+            await analytics_cache.invalidate(household_id)
+            await analytics_cache.set(key, {"total": 1})
+
+            new_key = await analytics_cache.entry_key(household_id, "summary", {})
+            assert await analytics_cache.get(new_key) is None
+
+
+class TestPermissionCache:
+    """Test cases for the household permission cache."""
+
+    @pytest.fixture
+    def fake_redis(self):
+        store = {}
+        redis = MagicMock()
+
+        async def hget(key, field):
+            return store.get(key, {}).get(field)
+
+        async def hset(key, field, value):
+            store.setdefault(key, {})[field] = value
+
+        async def delete(key):
+            store.pop(key, None)
+
+        redis.hget = AsyncMock(side_effect=hget)
+        redis.hset = AsyncMock(side_effect=hset)
+        redis.expire = AsyncMock()
+        redis.delete = AsyncMock(side_effect=delete)
+        return redis
+
+    async def test_cache_disabled_without_redis(self):
+        """Test lookups miss when Redis is not configured."""
+        with patch("app.modules.expenses.utils.permission_cache.get_redis", return_value=None):
+            await permission_cache.set(uuid4(), uuid4(), None, True)
+            assert await permission_cache.get(uuid4(), uuid4()) is None
+
+    async def test_cache_hit_per_role_and_invalidate(self, fake_redis):
+        """Test results are cached per required role and dropped together."""
+        user_id = uuid4()
+        household_id = uuid4()
+
+        with patch("app.modules.expenses.utils.permission_cache.get_redis", return_value=fake_redis):
+            await permission_cache.set(user_id, household_id, None, True)
+            await permission_cache.set(user_id, household_id, UserHouseholdRole.ADMIN, False)
+
+            assert await permission_cache.get(user_id, household_id) is True
+            assert await permission_cache.get(user_id, household_id, UserHouseholdRole.ADMIN) is False
+            assert await permission_cache.get(uuid4(), household_id) is None
+
+            await permission_cache.invalidate(user_id, household_id)
+
+            assert await permission_cache.get(user_id, household_id) is None
+            assert await permission_cache.get(user_id, household_id, UserHouseholdRole.ADMIN) is None
+
+    async def test_check_user_permission_uses_cache(self, db_session: Session):
+        """Test a cached result answers the permission check without a query."""
+        household_service = HouseholdService(db_session)
+
+        with patch("app.modules.expenses.services.household_service.permission_cache") as cache:
+            cache.get = AsyncMock(return_value=True)
+            with patch.object(household_service, "get_membership_if_authorized", new=AsyncMock()) as lookup:
+                assert await household_service.check_user_permission(uuid4(), uuid4()) is True
+                lookup.assert_not_awaited()
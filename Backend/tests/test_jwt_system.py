@@ -3,8 +3,11 @@ Tests for JWT token system.
 """
 
 from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
+import pytest
+
 from app.modules.auth.models.token_blacklist import TokenBlacklist
 from app.modules.auth.utils.jwt import (
     blacklist_token,
@@ -15,6 +18,7 @@ from app.modules.auth.utils.jwt import (
     verify_access_token,
     verify_refresh_token,
 )
+from app.modules.auth.utils.token_denylist import JTIBloomFilter
 
 
 class TestJWTManager:
@@ -86,56 +90,61 @@ class TestJWTManager:
 class TestTokenVerification:
     """Test token verification functionality."""
 
-    def test_verify_valid_access_token(self, db_session):
+    @pytest.mark.asyncio
+    async def test_verify_valid_access_token(self, db_session):
         """Test verifying a valid access token."""
         user_id = uuid4()
         token, jti = jwt_manager.create_access_token(user_id)
 
-        payload = jwt_manager.verify_token(token, db_session, expected_type="access")
+        payload = await jwt_manager.verify_token(token, db_session, expected_type="access")
 
         assert payload is not None
         assert payload["sub"] == str(user_id)
         assert payload["type"] == "access"
         assert payload["jti"] == jti
 
-    def test_verify_valid_refresh_token(self, db_session):
+    @pytest.mark.asyncio
+    async def test_verify_valid_refresh_token(self, db_session):
         """Test verifying a valid refresh token."""
         user_id = uuid4()
         token, jti = jwt_manager.create_refresh_token(user_id)
 
-        payload = jwt_manager.verify_token(token, db_session, expected_type="refresh")
+        payload = await jwt_manager.verify_token(token, db_session, expected_type="refresh")
 
         assert payload is not None
         assert payload["sub"] == str(user_id)
         assert payload["type"] == "refresh"
         assert payload["jti"] == jti
 
-    def test_verify_wrong_token_type(self, db_session):
+    @pytest.mark.asyncio
+    async def test_verify_wrong_token_type(self, db_session):
         """Test verifying token with wrong expected type."""
         user_id = uuid4()
         token, jti = jwt_manager.create_access_token(user_id)
 
         # Try to verify access token as refresh token
-        payload = jwt_manager.verify_token(token, db_session, expected_type="refresh")
+        payload = await jwt_manager.verify_token(token, db_session, expected_type="refresh")
 
         assert payload is None
 
-    def test_verify_invalid_token(self, db_session):
+    @pytest.mark.asyncio
+    async def test_verify_invalid_token(self, db_session):
         """Test verifying an invalid token."""
         invalid_token = "invalid.token.here"
 
-        payload = jwt_manager.verify_token(invalid_token, db_session)
+        payload = await jwt_manager.verify_token(invalid_token, db_session)
 
         assert payload is None
 
-    def test_verify_expired_token(self, db_session):
+    @pytest.mark.asyncio
+    async def test_verify_expired_token(self, db_session):
         """Test verifying an expired token."""
         user_id = uuid4()
         # Create token that expires immediately
         expired_delta = timedelta(seconds=-1)
         token, jti = jwt_manager.create_access_token(user_id, expires_delta=expired_delta)
 
-        payload = jwt_manager.verify_token(token, db_session)
+        payload = await jwt_manager.verify_token(token, db_session)
 
         assert payload is None
 
@@ -143,21 +152,22 @@ class TestTokenVerification:
 class TestTokenBlacklisting:
     """Test token blacklisting functionality."""
 
-    def test_blacklist_token(self, db_session):
+    @pytest.mark.asyncio
+    async def test_blacklist_token(self, db_session):
         """Test blacklisting a token."""
         user_id = uuid4()
         token, jti = jwt_manager.create_access_token(user_id)
 
         # Verify token works before blacklisting
-        payload = jwt_manager.verify_token(token, db_session)
+        payload = await jwt_manager.verify_token(token, db_session)
         assert payload is not None
 
         # Blacklist the token
-        success = jwt_manager.blacklist_token(token, db_session, reason="test")
+        success = await jwt_manager.blacklist_token(token, db_session, reason="test")
         assert success is True
 
         # Verify token no longer works
-        payload = jwt_manager.verify_token(token, db_session)
+        payload = await jwt_manager.verify_token(token, db_session)
         assert payload is None
 
         # Check blacklist entry was created
@@ -186,27 +196,67 @@ class TestTokenBlacklisting:
         assert len(blacklist_entries) == 1
         assert blacklist_entries[0].token_type == "all"
 
-    def test_blacklist_invalid_token(self, db_session):
+    @pytest.mark.asyncio
+    async def test_blacklist_token_uses_redis_when_configured(self, db_session):
+        """Test that a Redis revocation skips the database write."""
+        user_id = uuid4()
+        token, jti = jwt_manager.create_access_token(user_id)
+
+        with patch(
+            "app.modules.auth.utils.jwt.token_denylist.revoke",
+            new=AsyncMock(return_value=True)
+        ) as mock_revoke:
+            success = await jwt_manager.blacklist_token(token, db_session, reason="test")
+
+        assert success is True
+        assert mock_revoke.call_args[0][0] == jti
+        assert db_session.query(TokenBlacklist).filter(
+            TokenBlacklist.jti == jti
+        ).first() is None
+
+    @pytest.mark.asyncio
+    async def test_blacklist_invalid_token(self, db_session):
         """Test blacklisting an invalid token."""
         invalid_token = "invalid.token.here"
 
-        success = jwt_manager.blacklist_token(invalid_token, db_session)
+        success = await jwt_manager.blacklist_token(invalid_token, db_session)
         assert success is False
 
 
+class TestJTIBloomFilter:
+    """Test the revoked token bloom prefilter."""
+
+    def test_added_jti_is_found(self):
+        """Test that added token IDs are always reported as present."""
+        bloom = JTIBloomFilter()
+        jtis = [str(uuid4()) for _ in range(100)]
+        for jti in jtis:
+            bloom.add(jti)
+
+        assert all(jti in bloom for jti in jtis)
+
+    def test_empty_filter_has_no_members(self):
+        """Test that an empty filter reports nothing as revoked."""
+        bloom = JTIBloomFilter()
+
+        assert str(uuid4()) not in bloom
+
+
 class TestTokenRefresh:
     """Test token refresh functionality."""
 
-    def test_refresh_access_token(self, db_session):
+    @pytest.mark.asyncio
+    async def test_refresh_access_token(self, db_session):
         """Test refreshing an access token."""
         user_id = uuid4()
         refresh_token, refresh_jti = jwt_manager.create_refresh_token(user_id)
 
         # Refresh the access token
-        result = jwt_manager.refresh_access_token(refresh_token, db_session)
+        result = await jwt_manager.refresh_access_token(refresh_token, db_session)
 
         assert result is not None
         assert "access_token" in result
+        assert "refresh_token" in result
         assert "token_type" in result
         assert "expires_in" in result
         assert "access_jti" in result
@@ -215,24 +265,40 @@ class TestTokenRefresh:
 
         # Verify the new access token works
         new_access_token = result["access_token"]
-        payload = jwt_manager.verify_token(new_access_token, db_session, expected_type="access")
+        payload = await jwt_manager.verify_token(new_access_token, db_session, expected_type="access")
         assert payload is not None
         assert payload["sub"] == str(user_id)
 
-    def test_refresh_with_invalid_token(self, db_session):
+    @pytest.mark.asyncio
+    async def test_refresh_token_cannot_be_reused(self, db_session):
+        """Test that a refresh token is consumed by rotation."""
+        user_id = uuid4()
+        refresh_token, refresh_jti = jwt_manager.create_refresh_token(user_id)
+
+        result = await jwt_manager.refresh_access_token(refresh_token, db_session)
+        assert result is not None
+        assert result["refresh_token"] != refresh_token
+
+        # The old refresh token was rotated out
+        result = await jwt_manager.refresh_access_token(refresh_token, db_session)
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_refresh_with_invalid_token(self, db_session):
         """Test refreshing with an invalid refresh token."""
         invalid_token = "invalid.token.here"
 
-        result = jwt_manager.refresh_access_token(invalid_token, db_session)
+        result = await jwt_manager.refresh_access_token(invalid_token, db_session)
         assert result is None
 
-    def test_refresh_with_access_token(self, db_session):
+    @pytest.mark.asyncio
+    async def test_refresh_with_access_token(self, db_session):
         """Test refreshing with an access token (should fail)."""
         user_id = uuid4()
         access_token, access_jti = jwt_manager.create_access_token(user_id)
 
         # Try to refresh using access token (should fail)
-        result = jwt_manager.refresh_access_token(access_token, db_session)
+        result = await jwt_manager.refresh_access_token(access_token, db_session)
         assert result is None
 
 
@@ -250,38 +316,41 @@ class TestUtilityFunctions:
         assert "token_type" in tokens
         assert tokens["token_type"] == "bearer"
 
-    def test_verify_access_token_function(self, db_session):
+    @pytest.mark.asyncio
+    async def test_verify_access_token_function(self, db_session):
         """Test the verify_access_token utility function."""
         user_id = uuid4()
         token, jti = jwt_manager.create_access_token(user_id)
 
-        payload = verify_access_token(token, db_session)
+        payload = await verify_access_token(token, db_session)
 
         assert payload is not None
         assert payload["sub"] == str(user_id)
         assert payload["type"] == "access"
 
-    def test_verify_refresh_token_function(self, db_session):
+    @pytest.mark.asyncio
+    async def test_verify_refresh_token_function(self, db_session):
         """Test the verify_refresh_token utility function."""
         user_id = uuid4()
         token, jti = jwt_manager.create_refresh_token(user_id)
 
-        payload = verify_refresh_token(token, db_session)
+        payload = await verify_refresh_token(token, db_session)
 
         assert payload is not None
         assert payload["sub"] == str(user_id)
         assert payload["type"] == "refresh"
 
-    def test_blacklist_token_function(self, db_session):
+    @pytest.mark.asyncio
+    async def test_blacklist_token_function(self, db_session):
         """Test the blacklist_token utility function."""
         user_id = uuid4()
         token, jti = jwt_manager.create_access_token(user_id)
 
-        success = blacklist_token(token, db_session, "test")
+        success = await blacklist_token(token, db_session, "test")
         assert success is True
 
         # Verify token is blacklisted
-        payload = verify_access_token(token, db_session)
+        payload = await verify_access_token(token, db_session)
         assert payload is None
 
     def test_logout_user_all_devices_function(self, db_session):
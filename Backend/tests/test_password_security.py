@@ -2,6 +2,7 @@
 Tests for password security utilities.
 """
 
+from app.core.utils.helpers import mask_email
 from app.modules.auth.utils.password import (
     calculate_password_strength_score,
     generate_secure_password,
@@ -14,7 +15,6 @@ from app.modules.auth.utils.security import (
     generate_password_reset_token_secure,
     generate_verification_token,
     hash_password,
-    mask_email,
     verify_password_secure,
 )
 
@@ -36,6 +36,24 @@ class TestPasswordStrength:
         assert result["level"] in ["strong", "very_strong"]
         assert len(result["errors"]) == 0
 
+    def test_detailed_validation_is_cached(self):
+        """Test repeated validation reuses the result without sharing it."""
+        from unittest.mock import patch
+
+        from app.modules.auth.utils import password as password_utils
+
+        with patch.object(
+            password_utils, "validate_password_strength",
+            wraps=password_utils.validate_password_strength
+        ) as mock_validate:
+            first = validate_password_strength_detailed("Cach3d!Passw0rd-Check")
+            first["errors"].append("mutated")
+            second = validate_password_strength_detailed("Cach3d!Passw0rd-Check")
+
+        mock_validate.assert_called_once()
+        assert "mutated" not in second["errors"]
+        assert second["score"] == first["score"]
+
     def test_password_scoring(self):
         """Test password strength scoring."""
         weak_score = calculate_password_strength_score("123")
@@ -45,6 +63,20 @@ class TestPasswordStrength:
         assert weak_score < 30
         assert strong_score > 70
 
+    def test_password_scoring_character_classes(self):
+        """Test each character class adds to the score."""
+        base_score = calculate_password_strength_score("xyzw")
+
+        assert calculate_password_strength_score("xyz9") == base_score + 10
+        assert calculate_password_strength_score("xyz~") == base_score + 10
+        # Upper case also earns the mixed case bonus
+        assert calculate_password_strength_score("xyzW") == base_score + 15
+
+    def test_password_scoring_digit_before_letter(self):
+        """Test the digit-before-letter bonus only counts letters after a digit."""
+        assert calculate_password_strength_score("xy9z") == calculate_password_strength_score("xyz9") + 5
+        assert calculate_password_strength_score("9\nz") == calculate_password_strength_score("z\n9")
+
     def test_strength_levels(self):
         """Test strength level categorization."""
         assert get_strength_level(10) == "very_weak"
@@ -111,6 +143,8 @@ class TestPasswordSecurity:
         assert is_password_compromised("password")
         assert is_password_compromised("123456")
         assert not is_password_compromised("MyUniqueP@ssw0rd123!")
+        # Case and surrounding whitespace are normalized before the lookup
+        assert is_password_compromised(" Password ")
 
 
 class TestSecurityUtilities:
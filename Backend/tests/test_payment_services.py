@@ -113,6 +113,32 @@ class TestPaymentService:
         assert result["total"] == 3
         assert len(result["payments"]) == 3
 
+    async def test_get_payments_loads_active_allocations_only(self, payment_service, db_session, test_payment, test_expense_share, test_user):
+        """Test inactive allocations are filtered out when loading payments."""
+        active = ExpenseSharePayment.create_allocation(
+            payment_id=test_payment.id,
+            expense_share_id=test_expense_share.id,
+            amount=Decimal("20.00")
+        )
+        inactive = ExpenseSharePayment.create_allocation(
+            payment_id=test_payment.id,
+            expense_share_id=test_expense_share.id,
+            amount=Decimal("5.00")
+        )
+        inactive.is_active = False
+        db_session.add_all([active, inactive])
+        db_session.commit()
+
+        success, message, result = await payment_service.get_payments(
+            household_id=test_payment.household_id,
+            current_user_id=test_user.id
+        )
+
+        assert success is True
+        payment = result["payments"][0]
+        assert [esp.id for esp in payment.expense_share_payments] == [active.id]
+        assert payment.total_allocated_amount == Decimal("20.00")
+
     async def test_update_payment(self, payment_service, test_payment, test_user):
         """Test payment update."""
         updates = {
@@ -159,6 +185,24 @@ class TestPaymentService:
         assert esp.payment_id == test_payment.id
         assert esp.expense_share_id == test_expense_share.id
 
+    async def test_get_allocation_summaries(self, payment_service, test_payment, test_expense_share, test_expense, test_user):
+        """Test allocation summaries project the linked share and expense."""
+        await payment_service.link_expense_share(
+            payment_id=test_payment.id,
+            expense_share_id=test_expense_share.id,
+            amount=Decimal("20.00"),
+            current_user_id=test_user.id
+        )
+
+        allocations = await payment_service.get_allocation_summaries([test_payment.id])
+
+        assert len(allocations[test_payment.id]) == 1
+        row = allocations[test_payment.id][0]
+        assert row.expense_share_id == test_expense_share.id
+        assert row.expense_title == test_expense.title
+        assert row.share_amount == Decimal("25.00")
+        assert row.allocated_amount == Decimal("20.00")
+
     async def test_link_expense_share_exceeds_amount(self, payment_service, test_payment, test_expense_share, test_user):
         """Test linking amount that exceeds payment amount."""
         success, message, esp = await payment_service.link_expense_share(
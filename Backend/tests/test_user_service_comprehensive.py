@@ -3,14 +3,14 @@ Comprehensive tests for UserService to improve test coverage.
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from uuid import uuid4, UUID
 from datetime import datetime
 
 from app.modules.auth.services.user_service import UserService
 from app.modules.auth.models.user import User
 from app.modules.auth.models.password_history import PasswordHistory
-from app.modules.auth.schemas.user import UserCreate, UserUpdate
+from app.modules.auth.schemas.user import UserCreate, UserResponse, UserUpdate
 
 
 class TestUserServiceComprehensive:
@@ -21,19 +21,20 @@ class TestUserServiceComprehensive:
         """Create a mock database session."""
         db = Mock()
         db.add = Mock()
-        db.commit = Mock()
-        db.refresh = Mock()
-        db.query = Mock()
-        db.get = Mock()
-        db.rollback = Mock()
-        db.flush = Mock()
+        db.execute = AsyncMock()
+        db.commit = AsyncMock()
+        db.refresh = AsyncMock()
+        db.get = AsyncMock()
+        db.delete = AsyncMock()
+        db.rollback = AsyncMock()
+        db.flush = AsyncMock()
         return db
     
     @pytest.fixture
     def user_service(self, mock_db):
         """Create a UserService instance."""
         service = UserService(mock_db)
-        service.get_by_id = Mock()
+        service.get_by_id = AsyncMock()
         return service
     
     @pytest.fixture
@@ -50,6 +51,7 @@ class TestUserServiceComprehensive:
         user.email_verified = True
         user.avatar_url = None
         user.created_at = datetime.utcnow()
+        user.updated_at = datetime.utcnow()
         return user
 
     @pytest.mark.asyncio
@@ -59,9 +61,29 @@ class TestUserServiceComprehensive:
         
         result = await user_service.get_user_profile(sample_user.id)
         
-        assert result == sample_user
+        assert isinstance(result, UserResponse)
+        assert result.id == sample_user.id
+        assert result.email == sample_user.email
         user_service.get_by_id.assert_called_once_with(sample_user.id)
 
+    @pytest.mark.asyncio
+    async def test_get_user_profile_cached_until_invalidated(self, user_service, sample_user):
+        """Test profile reads are cached and dropped after a write."""
+        user_service.get_by_id.return_value = sample_user
+        
+        first = await user_service.get_user_profile(sample_user.id)
+        second = await user_service.get_user_profile(sample_user.id)
+        
+        assert second is first
+        user_service.get_by_id.assert_called_once_with(sample_user.id)
+        
+        success, _ = await user_service.update_avatar(sample_user.id, "https://example.com/a.png")
+        assert success is True
+        
+        refreshed = await user_service.get_user_profile(sample_user.id)
+        assert refreshed.avatar_url == "https://example.com/a.png"
+        assert user_service.get_by_id.call_count == 3
+
     @pytest.mark.asyncio
     async def test_get_user_profile_not_found(self, user_service):
         """Test user profile retrieval when user not found."""
@@ -77,12 +99,11 @@ class TestUserServiceComprehensive:
     async def test_update_user_profile_success(self, user_service, mock_db, sample_user):
         """Test successful user profile update."""
         user_service.get_by_id.return_value = sample_user
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None  # No existing user with same email/username
+        mock_result = Mock()
+        mock_result.all.return_value = []  # No existing user with same email/username
+        mock_db.execute.return_value = mock_result
         
-        with patch('app.modules.auth.services.user_service.validate_email') as mock_validate:
+        with patch('app.modules.auth.services.user_service.validate_email_address') as mock_validate:
             mock_validate.return_value = True
             
             success, message, user = await user_service.update_user_profile(
@@ -123,7 +144,7 @@ class TestUserServiceComprehensive:
         """Test user profile update with invalid email."""
         user_service.get_by_id.return_value = sample_user
         
-        with patch('app.modules.auth.services.user_service.validate_email') as mock_validate:
+        with patch('app.modules.auth.services.user_service.validate_email_address') as mock_validate:
             mock_validate.return_value = False
             
             success, message, user = await user_service.update_user_profile(
@@ -143,12 +164,11 @@ class TestUserServiceComprehensive:
         existing_user.id = uuid4()
         existing_user.email = "existing@example.com"
         
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = existing_user
+        mock_result = Mock()
+        mock_result.all.return_value = [existing_user]
+        mock_db.execute.return_value = mock_result
         
-        with patch('app.modules.auth.services.user_service.validate_email') as mock_validate:
+        with patch('app.modules.auth.services.user_service.validate_email_address') as mock_validate:
             mock_validate.return_value = True
             
             success, message, user = await user_service.update_user_profile(
@@ -168,10 +188,9 @@ class TestUserServiceComprehensive:
         existing_user.id = uuid4()
         existing_user.username = "existinguser"
         
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = existing_user
+        mock_result = Mock()
+        mock_result.all.return_value = [existing_user]
+        mock_db.execute.return_value = mock_result
         
         success, message, user = await user_service.update_user_profile(
             user_id=sample_user.id,
@@ -204,12 +223,9 @@ class TestUserServiceComprehensive:
         user_service.get_by_id.return_value = sample_user
         
         # Mock password history query
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = []
+        mock_result = Mock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = mock_result
         
         with patch('app.modules.auth.services.user_service.validate_password_change') as mock_validate:
             with patch('app.modules.auth.services.user_service.hash_password') as mock_hash:
@@ -249,12 +265,9 @@ class TestUserServiceComprehensive:
         user_service.get_by_id.return_value = sample_user
         
         # Mock password history query
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = []
+        mock_result = Mock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = mock_result
         
         with patch('app.modules.auth.services.user_service.validate_password_change') as mock_validate:
             mock_validate.return_value = {
@@ -279,12 +292,9 @@ class TestUserServiceComprehensive:
         mock_db.commit.side_effect = Exception("Database error")
         
         # Mock password history query
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = []
+        mock_result = Mock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = mock_result
         
         with patch('app.modules.auth.services.user_service.validate_password_change') as mock_validate:
             with patch('app.modules.auth.services.user_service.hash_password') as mock_hash:
@@ -397,33 +407,68 @@ class TestUserServiceComprehensive:
     @pytest.mark.asyncio
     async def test_search_users_with_query(self, user_service, mock_db, sample_user):
         """Test user search with query."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.offset.return_value = mock_query
-        mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = [sample_user]
-        
-        result = await user_service.search_users(
+        mock_result = Mock()
+        mock_result.scalars.return_value.all.return_value = [sample_user]
+        mock_db.execute.return_value = mock_result
+        
+        users, next_cursor = await user_service.search_users(
             query="test",
             email_verified=True,
             is_active=True,
-            limit=10,
-            offset=0
+            limit=10
         )
         
-        assert result == [sample_user]
-        mock_query.filter.assert_called()
-        mock_query.offset.assert_called_with(0)
-        mock_query.limit.assert_called_with(10)
+        assert users == [sample_user]
+        assert next_cursor is None
+        mock_db.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_search_users_returns_next_cursor(self, user_service, mock_db, sample_user):
+        """Test keyset search returns a cursor when more rows exist."""
+        other_user = Mock(spec=User)
+        mock_result = Mock()
+        mock_result.scalars.return_value.all.return_value = [sample_user, other_user]
+        mock_db.execute.return_value = mock_result
+        
+        users, next_cursor = await user_service.search_users(
+            query="test",
+            limit=1,
+            cursor=(datetime.utcnow(), uuid4())
+        )
+        
+        assert users == [sample_user]
+        assert next_cursor == (sample_user.created_at, sample_user.id)
+        sql = str(mock_db.execute.await_args.args[0])
+        assert "(users.created_at, users.id) <" in sql
+
+    @pytest.mark.asyncio
+    async def test_search_users_short_query(self, user_service, mock_db):
+        """Test queries too short for the trigram index are rejected."""
+        users, next_cursor = await user_service.search_users(query="te")
+        
+        assert users == []
+        assert next_cursor is None
+        mock_db.execute.assert_not_awaited()
+
+    def test_search_document_matches_trigram_index(self):
+        """Test the search expression compiles to the indexed expression."""
+        from sqlalchemy.dialects import postgresql
+
+        from app.modules.auth.services.user_service import USER_SEARCH_DOCUMENT
+
+        sql = str(USER_SEARCH_DOCUMENT.compile(dialect=postgresql.dialect()))
+
+        assert sql == (
+            "lower(users.username) || ' ' || lower(users.email) || ' ' || "
+            "coalesce(lower(users.first_name), '') || ' ' || coalesce(lower(users.last_name), '')"
+        )
 
     @pytest.mark.asyncio
     async def test_get_user_by_email_success(self, user_service, mock_db, sample_user):
         """Test getting user by email."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_user
+        mock_result = Mock()
+        mock_result.scalar_one_or_none.return_value = sample_user
+        mock_db.execute.return_value = mock_result
         
         result = await user_service.get_user_by_email("test@example.com")
         
@@ -432,10 +477,9 @@ class TestUserServiceComprehensive:
     @pytest.mark.asyncio
     async def test_get_user_by_username_success(self, user_service, mock_db, sample_user):
         """Test getting user by username."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_user
+        mock_result = Mock()
+        mock_result.scalar_one_or_none.return_value = sample_user
+        mock_db.execute.return_value = mock_result
         
         result = await user_service.get_user_by_username("testuser")
         
@@ -444,10 +488,9 @@ class TestUserServiceComprehensive:
     @pytest.mark.asyncio
     async def test_check_email_availability_available(self, user_service, mock_db):
         """Test email availability check when available."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_result = Mock()
+        mock_result.scalar.return_value = False
+        mock_db.execute.return_value = mock_result
         
         result = await user_service.check_email_availability("new@example.com")
         
@@ -456,10 +499,9 @@ class TestUserServiceComprehensive:
     @pytest.mark.asyncio
     async def test_check_email_availability_taken(self, user_service, mock_db, sample_user):
         """Test email availability check when taken."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_user
+        mock_result = Mock()
+        mock_result.scalar.return_value = True
+        mock_db.execute.return_value = mock_result
         
         result = await user_service.check_email_availability("test@example.com")
         
@@ -468,59 +510,69 @@ class TestUserServiceComprehensive:
     @pytest.mark.asyncio
     async def test_check_username_availability_available(self, user_service, mock_db):
         """Test username availability check when available."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+        mock_result = Mock()
+        mock_result.scalar.return_value = False
+        mock_db.execute.return_value = mock_result
         
         result = await user_service.check_username_availability("newuser")
         
         assert result is True
 
+    @pytest.mark.asyncio
+    async def test_check_username_availability_taken(self, user_service, mock_db):
+        """Test username availability check when taken, excluding the caller."""
+        mock_result = Mock()
+        mock_result.scalar.return_value = True
+        mock_db.execute.return_value = mock_result
+        
+        result = await user_service.check_username_availability("TestUser", exclude_user_id=uuid4())
+        
+        assert result is False
+        mock_db.execute.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_get_user_stats(self, user_service, mock_db):
         """Test getting user statistics."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.count.return_value = 100
-        mock_query.filter.return_value = mock_query
+        mock_result = Mock()
+        mock_result.one.return_value._mapping = {"total": 100, "active": 85, "verified": 90}
+        mock_db.execute.return_value = mock_result
         
         result = await user_service.get_user_stats()
         
-        assert isinstance(result, dict)
-        assert "total_users" in result
-        assert "active_users" in result
-        assert "verified_users" in result
+        assert result == {
+            "total_users": 100,
+            "active_users": 85,
+            "verified_users": 90,
+            "inactive_users": 15,
+            "unverified_users": 10
+        }
+        # One aggregate query instead of one COUNT per statistic
+        mock_db.execute.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_get_recent_users(self, user_service, mock_db, sample_user):
         """Test getting recent users."""
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = [sample_user]
+        mock_result = Mock()
+        mock_result.scalars.return_value.all.return_value = [sample_user]
+        mock_db.execute.return_value = mock_result
         
         result = await user_service.get_recent_users(limit=5)
         
         assert result == [sample_user]
-        mock_query.limit.assert_called_with(5)
+        mock_db.execute.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_delete_user_success(self, user_service, mock_db, sample_user):
         """Test successful user deletion."""
         user_service.get_by_id.return_value = sample_user
         
-        # Mock the base service delete method to avoid the database session issue
-        with patch.object(user_service, 'delete') as mock_delete:
-            mock_delete.return_value = sample_user
-            
-            success, message = await user_service.delete_user(sample_user.id)
-            
-            assert success is True
-            assert "deleted" in message
-            # The actual implementation calls self.delete(user_id) without db session
-            mock_delete.assert_called_with(sample_user.id)
+        success, message = await user_service.delete_user(sample_user.id)
+        
+        assert success is True
+        assert "deleted" in message
+        assert sample_user.is_active is False
+        mock_db.delete.assert_not_called()
+        mock_db.commit.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_delete_user_not_found(self, user_service):